@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesces work items from concurrent requests into batched model calls.
+
+    Requests ``await submit(item)``; a single worker task drains the queue
+    until it has ``max_batch_size`` items or ``max_wait_ms`` has passed since
+    the first item arrived, runs ``process_batch(items)`` once on a worker
+    thread and resolves every request's future with its own result.
+    ``process_batch`` must return one result per item, in order.
+    ``executor``, if given, is an InferenceExecutor: each batch is one
+    ``<name>_batch`` stage under its admission control, so a full queue fails
+    the batch's requests with InferenceQueueFull. Otherwise batches run on the
+    event loop's default executor.
+    ``on_batch(size, seconds)``, if given, is called after every batch.
+    """
+
+    def __init__(self, name: str, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0, executor=None,
+                 on_batch: Optional[Callable[[int, float], None]] = None):
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.executor = executor
+        self.on_batch = on_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Items queued on another (finished) event loop can never be served from this one
+            self._fail_queued(RuntimeError(f"{self.name} batcher moved to a new event loop"))
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            if self._worker is not None and not self._worker.cancelled() and self._worker.exception() is not None:
+                logger.error(f"{self.name} batcher worker died: {self._worker.exception()!r}; restarting")
+            # Restarted on the same queue, so items already waiting are still served
+            self._worker = loop.create_task(self._run(), name=f"{self.name}-batcher")
+
+    def _fail_queued(self, error: Exception):
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                try:
+                    future.set_exception(error)
+                except RuntimeError:
+                    # Its loop is closed; nobody is awaiting it any more
+                    pass
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def submit_many(self, items: List[Any]) -> List[Any]:
+        """Queue several items (they may share a batch with other requests) and wait for all results."""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    async def _collect(self) -> List[Any]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Requests that gave up while queued don't need a forward pass
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                await self._process(batch)
+            except Exception as e:
+                # A failed batch fails its own requests only; the worker keeps serving the queue
+                logger.warning(f"{self.name} batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _process(self, batch: List[Any]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        start = time.perf_counter()
+        try:
+            items = [item for item, _ in batch]
+            if self.executor is None:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.process_batch, items)
+            else:
+                results = await self.executor.run(f"{self.name}_batch", self.process_batch, items)
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(batch)} items")
+        finally:
+            if self.on_batch is not None:
+                try:
+                    self.on_batch(len(batch), time.perf_counter() - start)
+                except Exception as e:
+                    logger.warning(f"{self.name} batch observer failed: {e}")
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
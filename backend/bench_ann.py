@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+
+from index_store import l2_normalize
+from vector_index import HNSW_DEFAULTS, BruteForceIndex, HNSWIndex
+
+# Recall-vs-latency benchmark of the HNSW backend against exact search.
+# Run from the backend folder:  python bench_ann.py [--rows 10000 100000] [--ef 16 32 64 128 256]
+# Vectors are drawn around random cluster centres, which is closer to real
+# sentence embeddings than isotropic noise.
+
+
+def clustered_vectors(rng, rows: int, dim: int, clusters: int) -> np.ndarray:
+    centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+    assignment = rng.integers(0, clusters, rows)
+    return l2_normalize(centres[assignment] + 0.6 * rng.standard_normal((rows, dim), dtype=np.float32))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k and latency of HNSW vs. brute-force search.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--M", type=int, default=HNSW_DEFAULTS["M"])
+    parser.add_argument("--ef-construction", type=int, default=HNSW_DEFAULTS["ef_construction"])
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for rows in args.rows:
+        data = clustered_vectors(rng, rows, args.dim, clusters=max(8, rows // 500))
+        queries = clustered_vectors(rng, args.queries, args.dim, clusters=max(8, rows // 500))
+
+        exact = BruteForceIndex(data)
+        start = time.perf_counter()
+        truth = [set(exact.search(q, args.k)[0].tolist()) for q in queries]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        start = time.perf_counter()
+        ann = HNSWIndex.build(data, M=args.M, ef_construction=args.ef_construction)
+        build_s = time.perf_counter() - start
+
+        print(f"\n{rows} rows x {args.dim} dims, k={args.k}, M={args.M}, ef_construction={args.ef_construction} "
+              f"(build {build_s:.1f}s)")
+        print(f"{'backend':>12} {'recall@k':>9} {'ms/query':>9}")
+        print(f"{'brute':>12} {1.0:>9.3f} {exact_ms:>9.3f}")
+        for ef in args.ef:
+            ann.set_ef(max(ef, args.k))
+            start = time.perf_counter()
+            found = [set(ann.search(q, args.k)[0].tolist()) for q in queries]
+            ann_ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean([len(f & t) / args.k for f, t in zip(found, truth)])
+            print(f"{f'hnsw ef={ef}':>12} {recall:>9.3f} {ann_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from index_store import l2_normalize, read_manifest
+from search import DenseSearcher
+
+# Micro-benchmark of the vector search kernel (search.py).
+# Run from the backend folder:  python bench_search.py [--queries 200] [--scales 1 10 100]
+
+INDEX_DIR = Path(__file__).resolve().parent / "indexes"
+DEFAULT_DIM = 768
+TOP_K = 3
+THRESHOLD = 0.3
+
+
+def current_corpus_size(lang: str = "en") -> int:
+    """Rows in the current indexes of one language (all datasets), or a fallback estimate."""
+    total = 0
+    for folder in sorted((INDEX_DIR / lang).glob("*")):
+        manifest = read_manifest(folder)
+        if manifest is not None:
+            total += manifest["count"]
+        elif (folder / "embeddings.npy").exists():
+            total += np.load(folder / "embeddings.npy", mmap_mode="r").shape[0]
+    return total or 1500
+
+
+def legacy_search(query: np.ndarray, embeddings: np.ndarray, k: int):
+    """The previous /chat path: re-normalize the corpus per call, then sort a Python range."""
+    similarities = l2_normalize(embeddings) @ l2_normalize(query)
+    ranked = sorted(range(len(similarities)), key=lambda i: -similarities[i])[:k]
+    return [i for i in ranked if similarities[i] >= THRESHOLD]
+
+
+def time_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-query latency of the dense search kernel.")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=64, help="Queries per search_batch call")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base_rows = current_corpus_size()
+    print(f"Current corpus: {base_rows} rows x {args.dim} dims, top-{TOP_K}, {args.queries} queries")
+    print(f"{'scale':>6} {'rows':>9} {'legacy ms':>10} {'search ms':>10} {'batch ms/q':>11}")
+
+    for scale in args.scales:
+        rows = base_rows * scale
+        embeddings = rng.standard_normal((rows, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+        searcher = DenseSearcher(embeddings)
+
+        # The legacy path is O(n log n) in Python; sample fewer queries at large scales
+        legacy_queries = queries[: max(5, args.queries // scale)]
+        legacy_ms = time_per_query(lambda q: legacy_search(q, embeddings, TOP_K), legacy_queries)
+        search_ms = time_per_query(lambda q: searcher.search(q, TOP_K, threshold=THRESHOLD), queries)
+
+        start = time.perf_counter()
+        for i in range(0, len(queries), args.batch):
+            searcher.search_batch(queries[i:i + args.batch], TOP_K, threshold=THRESHOLD)
+        batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        print(f"{scale:>5}x {rows:>9} {legacy_ms:>10.3f} {search_ms:>10.3f} {batch_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,577 @@
+import heapq
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Two-tier response cache. L1 is a per-process TTLCache; L2 is shared by every
+# worker on the node and survives restarts:
+#   "sqlite"  a WAL-mode SQLite file with size-based LRU eviction
+#   "redis"   any Redis-protocol server (redis, valkey, a local stand-in) through redis-py
+#   "none"    L1 only
+# Entries are namespaced by an id of the loaded indexes and answer settings, so
+# rebuilding an index invalidates every cached answer computed from the old one.
+# SemanticCache additionally serves paraphrases of answered queries by
+# query-embedding similarity, and PrecomputedAnswers serves the answers to the
+# canonical questions that ingest_data.py --warm computed for the current indexes.
+CACHE_BACKENDS = ("sqlite", "redis", "none")
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by a cached value (embedding arrays, response dicts)."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 49
+    if isinstance(value, bytes):
+        return len(value) + 33
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """Thread-safe LRU bounded by bytes, with per-entry expiry.
+
+    Expiry times also go into a min-heap, so ``purge_expired`` (run by a
+    background task) removes every expired entry in O(expired * log n)
+    without scanning the cache. Heap records left behind by overwrites and
+    evictions are skipped when popped. All operations hold one short lock;
+    values are shared, not copied.
+    """
+
+    def __init__(self, name: str, max_bytes: int, ttl: float):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (value, expires, nbytes), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None):
+        nbytes = estimate_size(value)
+        if nbytes > self.max_bytes:
+            return
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires, nbytes)
+            self.bytes += nbytes
+            heapq.heappush(self._heap, (expires, key))
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [(entry[1], k) for k, entry in self._entries.items()]
+                heapq.heapify(self._heap)
+
+    def _remove(self, key: str):
+        _, _, nbytes = self._entries.pop(key)
+        self.bytes -= nbytes
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] == expires:
+                    self._remove(key)
+                    expired += 1
+            self.expirations += expired
+        return expired
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SQLiteTier:
+    """JSON values in a SQLite file shared by all workers; least recently used
+    rows are evicted once the stored values exceed ``max_bytes``.
+
+    Rows are keyed by (namespace, key), so workers still on the previous index
+    version keep their entries during a rolling deploy; stale namespaces are
+    never read again and leave by TTL or LRU eviction. Triggers maintain the
+    stored byte total, and access times are written back in batches.
+    """
+
+    name = "sqlite"
+    SCHEMA_VERSION = 2
+    TOUCH_BATCH = 64
+
+    def __init__(self, path: Path, namespace: str, max_bytes: int = 64 << 20, ttl: float = 86400):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> last access time not yet written to the table, flushed every TOUCH_BATCH hits
+        self._touched: Dict[str, float] = {}
+        self._touches = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            # One-time upgrade from the first schema (table "responses", keyed by key alone);
+            # the current table is never dropped, so reopening keeps other workers' entries
+            self._db.executescript(f"""
+                BEGIN IMMEDIATE;
+                DROP TABLE IF EXISTS responses;
+                PRAGMA user_version = {self.SCHEMA_VERSION};
+                COMMIT;
+            """)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL,
+                expires REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (namespace, key));
+            CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed);
+            CREATE INDEX IF NOT EXISTS response_cache_expires ON response_cache (expires);
+            CREATE TABLE IF NOT EXISTS response_cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+            INSERT OR IGNORE INTO response_cache_size (id, bytes)
+                SELECT 0, COALESCE(SUM(size), 0) FROM response_cache;
+            CREATE TRIGGER IF NOT EXISTS response_cache_insert AFTER INSERT ON response_cache
+                BEGIN UPDATE response_cache_size SET bytes = bytes + NEW.size; END;
+            CREATE TRIGGER IF NOT EXISTS response_cache_delete AFTER DELETE ON response_cache
+                BEGIN UPDATE response_cache_size SET bytes = bytes - OLD.size; END;
+            CREATE TRIGGER IF NOT EXISTS response_cache_resize AFTER UPDATE OF size ON response_cache
+                BEGIN UPDATE response_cache_size SET bytes = bytes + NEW.size - OLD.size; END;
+        """)
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM response_cache WHERE namespace = ? AND key = ? AND expires > ?",
+                (self.namespace, key, now),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            self._touches += 1
+            if self._touches >= self.TOUCH_BATCH:
+                self._flush_touched()
+                self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            self._db.execute(
+                "INSERT INTO response_cache (namespace, key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires = excluded.expires, accessed = excluded.accessed",
+                (self.namespace, key, data, len(data.encode("utf-8")), now + self.ttl, now),
+            )
+            self._flush_touched()
+            self._evict()
+            self._db.commit()
+
+    def set_namespace(self, namespace: str):
+        with self._lock:
+            self._flush_touched()
+            self._db.commit()
+            self.namespace = namespace
+
+    def _flush_touched(self):
+        if self._touched:
+            self._db.executemany(
+                "UPDATE response_cache SET accessed = ? WHERE namespace = ? AND key = ?",
+                [(accessed, self.namespace, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touches = 0
+
+    def _total_bytes(self) -> int:
+        return self._db.execute("SELECT bytes FROM response_cache_size").fetchone()[0]
+
+    def _evict(self):
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        # Drop the least recently used rows (of any namespace) down to 90% of the budget
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for rowid, size in self._db.execute("SELECT rowid, size FROM response_cache ORDER BY accessed"):
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM response_cache WHERE rowid = ?", victims)
+        self.evictions += len(victims)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows of every namespace; run by the periodic cache sweep."""
+        with self._lock:
+            self._flush_touched()
+            deleted = self._db.execute("DELETE FROM response_cache WHERE expires <= ?", (time.time(),)).rowcount
+            self._db.commit()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._db.execute("DELETE FROM response_cache")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute(
+                "SELECT COUNT(*) FROM response_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            size = self._total_bytes()
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses, "entries": entries,
+                "bytes": size, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+class RedisTier:
+    """JSON values in a Redis-protocol server; expiry by TTL, size bounded by the server's maxmemory policy."""
+
+    name = "redis"
+
+    def __init__(self, url: str, namespace: str, ttl: float = 86400):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("redis is not installed; use the sqlite response cache backend")
+        self._client = redis.Redis.from_url(url)
+        self.set_namespace(namespace)
+        self.ttl = int(ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def set_namespace(self, namespace: str):
+        self.prefix = f"lexibot:response:{namespace}:"
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self._client.get(self.prefix + key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(data)
+
+    def put(self, key: str, value: Any):
+        self._client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=self.ttl)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses}
+
+
+class TieredCache:
+    """L1 in front of an optional shared L2; L2 hits are promoted to L1.
+
+    L2 failures (a locked SQLite file, an unreachable Redis) are logged and
+    treated as misses: the cache must never fail a request.
+    """
+
+    def __init__(self, l1: TTLCache, l2=None):
+        self.l1 = l1
+        self.l2 = l2
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.l1.get(key)
+        if value is not None or self.l2 is None:
+            return value
+        try:
+            value = self.l2.get(key)
+        except Exception as e:
+            logger.warning(f"L2 cache read failed: {e}")
+            return None
+        if value is not None:
+            self.l1.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        self.l1.put(key, value)
+        if self.l2 is not None:
+            try:
+                self.l2.put(key, value)
+            except Exception as e:
+                logger.warning(f"L2 cache write failed: {e}")
+
+    def set_namespace(self, namespace: str):
+        """Switch to ``namespace``: L1 entries are dropped, the L2 keeps other namespaces' rows."""
+        self.l1.clear()
+        if self.l2 is not None:
+            self.l2.set_namespace(namespace)
+
+    def purge_expired(self) -> int:
+        expired = self.l1.purge_expired()
+        # Redis expires keys itself; the SQLite tier is swept here
+        purge = getattr(self.l2, "purge_expired", None)
+        if purge is not None:
+            try:
+                expired += purge()
+            except Exception as e:
+                logger.warning(f"L2 cache sweep failed: {e}")
+        return expired
+
+    def clear(self):
+        self.l1.clear()
+        if self.l2 is not None:
+            self.l2.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"l1": self.l1.stats(), "l2": self.l2.stats() if self.l2 is not None else None}
+
+
+class SemanticCache:
+    """Responses keyed by query-embedding neighbourhoods.
+
+    Each scope (language and dataset filter) keeps up to ``max_entries``
+    L2-normalized query embeddings in a preallocated matrix; a lookup is one
+    mat-vec, and the closest cached query is served when its cosine similarity
+    reaches ``threshold``. Lookups that land just below the threshold are
+    counted as near hits, to help tune it. Storing a query that a lookup would
+    already match replaces that entry. Entries are evicted least recently
+    used, and all at once when the index namespace changes.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 1000, threshold: float = 0.95,
+                 near_margin: float = 0.05):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.near_margin = near_margin
+        self._lock = threading.Lock()
+        self._scopes: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._hit_similarity = 0.0
+
+    def set_namespace(self, namespace: str):
+        with self._lock:
+            if namespace != self.namespace:
+                self.namespace = namespace
+                self._scopes.clear()
+
+    def _scope(self, scope: str, dim: int) -> Dict[str, Any]:
+        state = self._scopes.get(scope)
+        if state is None or state["matrix"].shape[1] != dim:
+            state = self._scopes[scope] = {
+                "matrix": np.zeros((self.max_entries, dim), dtype=np.float32),
+                "values": [None] * self.max_entries,
+                "used": np.zeros(self.max_entries, dtype=bool),
+                # slot -> None, least recently used first
+                "lru": OrderedDict(),
+            }
+        return state
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, scope: str, embedding: np.ndarray) -> Optional[Any]:
+        query = self._normalize(embedding)
+        with self._lock:
+            state = self._scopes.get(scope)
+            if state is None or not state["lru"] or state["matrix"].shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            similarities = np.where(state["used"], state["matrix"] @ query, -np.inf)
+            slot = int(np.argmax(similarities))
+            best = float(similarities[slot])
+            if best >= self.threshold:
+                state["lru"].move_to_end(slot)
+                self.hits += 1
+                self._hit_similarity += best
+                return state["values"][slot]
+            if best >= self.threshold - self.near_margin:
+                self.near_hits += 1
+            self.misses += 1
+            return None
+
+    def put(self, scope: str, embedding: np.ndarray, value: Any):
+        if self.max_entries <= 0:
+            return
+        query = self._normalize(embedding)
+        with self._lock:
+            state = self._scope(scope, query.shape[0])
+            similarities = np.where(state["used"], state["matrix"] @ query, -np.inf)
+            nearest = int(np.argmax(similarities))
+            if similarities[nearest] >= self.threshold:
+                # A lookup would already serve this slot: refresh it rather than add a duplicate
+                slot = nearest
+                state["lru"].move_to_end(slot)
+            elif len(state["lru"]) >= self.max_entries:
+                slot, _ = state["lru"].popitem(last=False)
+            else:
+                slot = int(np.argmin(state["used"]))
+            state["matrix"][slot] = query
+            state["values"][slot] = value
+            state["used"][slot] = True
+            state["lru"][slot] = None
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "threshold": self.threshold,
+            "lookups": lookups,
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avg_hit_similarity": round(self._hit_similarity / self.hits, 4) if self.hits else None,
+            "entries": {scope: len(state["lru"]) for scope, state in self._scopes.items()},
+        }
+
+
+PRECOMPUTED_FORMAT_VERSION = 1
+_QUERY_PUNCTUATION = re.compile(r"[^\w\s]|_")
+
+
+def normalize_query(text: str) -> str:
+    """Case, punctuation and whitespace folded away: "What is X?" and "what is  x" match."""
+    text = unicodedata.normalize("NFC", text).casefold()
+    # \w keeps Devanagari letters but not their combining vowel signs, so those are kept explicitly
+    text = "".join(ch if unicodedata.category(ch) in ("Mn", "Mc") else _QUERY_PUNCTUATION.sub(" ", ch) for ch in text)
+    return " ".join(text.split())
+
+
+def write_precomputed_answers(path: Path, namespace: str, answers: Dict[str, Dict[str, Any]]):
+    """Write {lang: {question: response}} as the answers artifact for ``namespace``."""
+    artifact = {
+        "format_version": PRECOMPUTED_FORMAT_VERSION,
+        "namespace": namespace,
+        "created_at": time.time(),
+        "answers": {
+            lang: {normalize_query(question): response for question, response in responses.items()}
+            for lang, responses in answers.items()
+        },
+    }
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class PrecomputedAnswers:
+    """Responses computed at build time for canonical questions, served on normalized match.
+
+    The artifact is only used when it was built for the current namespace
+    (index version and answer settings); a stale artifact is ignored.
+    """
+
+    def __init__(self, path: Optional[Path], namespace: str):
+        self.path = path
+        self.answers: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.status = "disabled"
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+        except FileNotFoundError:
+            self.status = "missing"
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable precomputed answers {path}: {e}")
+            self.status = "unreadable"
+            return
+        if artifact.get("format_version") != PRECOMPUTED_FORMAT_VERSION or artifact.get("namespace") != namespace:
+            logger.warning(f"Ignoring precomputed answers {path}: built for {artifact.get('namespace')!r}, "
+                           f"serving {namespace!r}; rerun ingest_data.py --warm")
+            self.status = "stale"
+            return
+        self.answers = artifact.get("answers", {})
+        self.status = "loaded"
+
+    def get(self, lang: str, query: str) -> Optional[Dict[str, Any]]:
+        if not self.answers:
+            return None
+        response = self.answers.get(lang, {}).get(normalize_query(query))
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "entries": {lang: len(responses) for lang, responses in self.answers.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+        }
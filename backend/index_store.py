@@ -0,0 +1,236 @@
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# On-disk index layout (per indexes/<lang>/<law>/ folder):
+#   manifest.json        format version, model, dtype, row count, dimension, chunk granularity
+#   embeddings.npy       (count, dim) float32/float16 matrix, opened with mmap_mode="r"
+#   chunks.jsonl         one {"text": ..., "meta": ...} object per embedding row
+#   chunks.offsets.npy   int64 byte offsets into chunks.jsonl (count + 1 entries)
+#   centroid.npy         (dim,) mean of the L2-normalized embeddings, used for dataset routing
+INDEX_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.jsonl"
+OFFSETS_FILE = "chunks.offsets.npy"
+CENTROID_FILE = "centroid.npy"
+LEGACY_FILES = ("texts.pkl", "meta.pkl")
+SUPPORTED_DTYPES = ("float32", "float16")
+# ingest_data.py writes one chunk per section (or sub-clause group); migrated legacy
+# indexes hold one record per chapter and carry no granularity
+SECTION_GRANULARITY = "section"
+
+
+def read_manifest(folder: Path) -> Optional[Dict[str, Any]]:
+    """Return the index manifest, or None if the folder holds no current-format index."""
+    try:
+        with open(Path(folder) / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format_version") != INDEX_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def is_section_level(manifest: Optional[Dict[str, Any]]) -> bool:
+    """Whether the index's chunk ids identify the same section in every language."""
+    return bool(manifest) and manifest.get("granularity") == SECTION_GRANULARITY
+
+
+def _atomic_write(path: Path, write):
+    """Write via a temporary file and rename, so readers never see a half-written file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization as float32 (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def compute_centroid(embeddings: np.ndarray) -> np.ndarray:
+    """Representative vector of a dataset: normalized mean of its normalized rows."""
+    if len(embeddings) == 0:
+        return np.zeros(embeddings.shape[-1] if np.ndim(embeddings) == 2 else 0, dtype=np.float32)
+    return l2_normalize(l2_normalize(embeddings).mean(axis=0))
+
+
+def write_index(folder: Path, embeddings: np.ndarray, texts: List[str], metas: List[Dict[str, Any]],
+                dtype: str = "float32", extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Write an index in the memory-mappable format and remove legacy pickle files."""
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    if not (len(embeddings) == len(texts) == len(metas)):
+        raise ValueError("embeddings, texts and metas must have the same length")
+
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+
+    def write_chunks(f):
+        for i, (text, meta) in enumerate(zip(texts, metas)):
+            line = json.dumps({"text": text, "meta": meta}, ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets[i + 1] = offsets[i] + len(line)
+
+    matrix = np.ascontiguousarray(embeddings, dtype=dtype)
+    _atomic_write(folder / CHUNKS_FILE, write_chunks)
+    _atomic_write(folder / OFFSETS_FILE, lambda f: np.save(f, offsets))
+    _atomic_write(folder / EMBEDDINGS_FILE, lambda f: np.save(f, matrix))
+    _atomic_write(folder / CENTROID_FILE, lambda f: np.save(f, compute_centroid(embeddings)))
+
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "dtype": dtype,
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "created_at": time.time(),
+        **(extra or {}),
+    }
+    # Manifest goes last: its presence marks the index as complete
+    _atomic_write(folder / MANIFEST_FILE,
+                  lambda f: f.write(json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")))
+
+    for name in LEGACY_FILES:
+        try:
+            (folder / name).unlink()
+        except FileNotFoundError:
+            pass
+    return manifest
+
+
+def load_legacy_index(folder: Path) -> Dict[str, Any]:
+    """Read a pre-manifest index (embeddings.npy plus texts.pkl/meta.pkl) fully into memory."""
+    folder = Path(folder)
+    with open(folder / "texts.pkl", "rb") as f:
+        texts = pickle.load(f)
+    with open(folder / "meta.pkl", "rb") as f:
+        metas = pickle.load(f)
+    return {"embeddings": np.load(folder / EMBEDDINGS_FILE), "texts": texts, "metas": metas, "manifest": {}}
+
+
+def migrate_legacy_index(folder: Path, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Rewrite a legacy pickle index in the current format, row for row, and delete the pickles.
+
+    Runs at most once per folder: concurrent callers (several workers starting
+    together) serialize on a lock file and the later ones find the manifest.
+    """
+    folder = Path(folder)
+    with open(folder / ".migrate.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = read_manifest(folder)
+        if manifest is not None:
+            return manifest
+        legacy = load_legacy_index(folder)
+        dtype = "float16" if legacy["embeddings"].dtype == np.float16 else "float32"
+        manifest = write_index(folder, legacy["embeddings"], legacy["texts"], legacy["metas"], dtype=dtype,
+                               extra={"migrated_from": "pickle", **(extra or {})})
+    (folder / ".migrate.lock").unlink(missing_ok=True)
+    return manifest
+
+
+class ChunkStore:
+    """Read-only, offset-indexed view over chunks.jsonl.
+
+    The file is memory-mapped, so opening it is O(1) and all worker processes
+    share the same page cache; a record is only parsed when it is accessed.
+    """
+
+    def __init__(self, folder: Path):
+        folder = Path(folder)
+        self._offsets = np.load(folder / OFFSETS_FILE, mmap_mode="r")
+        self._file = open(folder / CHUNKS_FILE, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.texts = _FieldView(self, "text")
+        self.metas = _FieldView(self, "meta")
+
+    def __len__(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def record(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return json.loads(self._data[start:end])
+
+
+class _FieldView(Sequence):
+    """List-like access to one field of every chunk record."""
+
+    def __init__(self, store: ChunkStore, field: str):
+        self._store = store
+        self._field = field
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._store.record(i)[self._field]
+
+
+def open_index(folder: Path) -> Dict[str, Any]:
+    """Open a current-format index without reading the corpus into memory."""
+    folder = Path(folder)
+    manifest = read_manifest(folder)
+    if manifest is None:
+        raise FileNotFoundError(f"No version {INDEX_FORMAT_VERSION} index in {folder}")
+
+    embeddings = np.load(folder / EMBEDDINGS_FILE, mmap_mode="r")
+    chunks = ChunkStore(folder)
+    if len(chunks) != embeddings.shape[0]:
+        raise ValueError(f"Index in {folder} has {embeddings.shape[0]} embeddings but {len(chunks)} chunks")
+
+    try:
+        centroid = np.load(folder / CENTROID_FILE)
+    except OSError:
+        centroid = compute_centroid(embeddings)
+
+    return {
+        "embeddings": embeddings,
+        "texts": chunks.texts,
+        "metas": chunks.metas,
+        "centroid": centroid,
+        "manifest": manifest,
+    }
+
+
+def index_version(folders: List[Path]) -> str:
+    """Short id that changes whenever any of ``folders`` is rebuilt.
+
+    Current-format indexes contribute their manifest (row count, creation
+    time, model); legacy folders the size and mtime of their artifacts.
+    """
+    digest = hashlib.sha1()
+    for folder in sorted(Path(f) for f in folders):
+        digest.update(str(folder).encode("utf-8"))
+        manifest = read_manifest(folder)
+        if manifest is not None:
+            digest.update(json.dumps(manifest, sort_keys=True).encode("utf-8"))
+            continue
+        for name in (EMBEDDINGS_FILE,) + LEGACY_FILES:
+            try:
+                stat = (folder / name).stat()
+            except OSError:
+                continue
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:12]
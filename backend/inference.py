@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Execution layer for blocking work (model forward passes, translation network
+# calls, index loads, search) so it never runs on the event loop. The pool is
+# bounded and sized together with torch's intra-op threads: workers x threads
+# per worker = CPU cores, so concurrent forward passes don't oversubscribe.
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when more stages are pending than the executor accepts; maps to HTTP 503."""
+
+
+def threads_per_worker(workers: int) -> int:
+    """Equal share of the cores for each pool worker's intra-op parallelism."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def set_torch_threads(threads: int):
+    """Apply the per-worker thread count to torch (imported here, when models are about to load)."""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+@contextmanager
+def stage_timer(timings: Optional[Dict[str, float]], stage: str):
+    """Record the wall time of a block in ``timings[stage]`` (milliseconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000, 2)
+
+
+class InferenceExecutor:
+    """Bounded thread pool with admission control and per-stage timing.
+
+    At most ``workers`` stages run at once and at most ``max_queue`` more wait
+    for a thread; beyond that ``run`` raises InferenceQueueFull instead of
+    letting latency grow without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int, name: str = "inference"):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self.pending = 0
+        self.rejected = 0
+        # stage -> [calls, total ms, max ms]
+        self.stage_stats: Dict[str, list] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    async def run(self, stage: str, fn: Callable[..., Any], *args,
+                  timings: Optional[Dict[str, float]] = None, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise InferenceQueueFull(f"{self.name.capitalize()} queue is full ({self.pending} pending stages)")
+
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            with stage_timer(timings, stage):
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.pool, functools.partial(fn, *args, **kwargs)
+                )
+        finally:
+            self.pending -= 1
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def record(self, stage: str, elapsed_ms: float):
+        stats = self.stage_stats.setdefault(stage, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed_ms
+        stats[2] = max(stats[2], elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "rejected": self.rejected,
+            "stages": {
+                stage: {"calls": calls, "avg_ms": round(total / calls, 2), "max_ms": round(peak, 2)}
+                for stage, (calls, total, peak) in self.stage_stats.items()
+            },
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
@@ -1,16 +1,27 @@
+import argparse
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import pickle
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from tqdm import tqdm
+
+from index_store import SECTION_GRANULARITY, SUPPORTED_DTYPES, open_index, write_index
+from lexical import BM25Index
+from vector_index import HNSW_DEFAULTS, HNSW_FILE, HNSW_PARAMS_FILE, HNSWIndex
 
 # Paths
 BASE_FOLDER = Path("backend")
 RAW_JSON_FOLDER = BASE_FOLDER / "raw_json"
 DATA_FOLDER = BASE_FOLDER / "data"
 INDEX_FOLDER = BASE_FOLDER / "indexes"
+# {"<lang>": [questions]} answered by --warm (also used by test_chat.py and the ONNX parity check)
+CANONICAL_QUESTIONS = DATA_FOLDER / "canonical_questions.json"
 
 # Languages and laws
 LANGUAGES = ["en", "hi", "ne"]
@@ -18,7 +29,30 @@ LAWS = ["BNS", "BNSS", "BSA"]
 
 # Embedding model (multilingual: English, Hindi, Nepali) - as per architecture
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
-model = SentenceTransformer(EMBEDDING_MODEL)
+model = None  # loaded lazily, once per process (see get_model)
+
+# Batched encoding
+DEFAULT_BATCH_SIZE = 32
+
+# Chunking: English sections longer than this are split on their numbered sub-clauses
+MAX_CHUNK_CHARS = 1200
+SUBCLAUSE_PATTERN = re.compile(r"^\(([0-9\u0966-\u096F]+)\)")
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+def get_model():
+    """Load the embedding model once per process."""
+    global model
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    return model
+
+
+def _init_worker(torch_threads: int):
+    """Pool initializer: split the cores between workers (the model loads on first use)."""
+    import torch
+    torch.set_num_threads(max(1, torch_threads))
+
 
 def load_json_files(folder: Path):
     """Load all JSON files from a folder."""
@@ -49,61 +83,349 @@ def save_jsonl(documents, output_file: Path):
     except Exception as e:
         print(f"Error writing JSONL {output_file}: {e}")
 
-def generate_embeddings(documents):
-    """Generate embeddings for documents."""
-    embeddings = []
-    texts = []
-    meta = []
+def split_subclauses(text: str):
+    """Split a section into its numbered sub-clauses "(1)", "(2)", ...
+
+    Returns a list of (clause_no, text) pairs. Lines before the first
+    numbered clause and unnumbered continuation lines ("(a)", "Explanation.")
+    stay attached to the clause they belong to.
+    """
+    parts = []
+    preamble = []
+    for line in text.splitlines():
+        match = SUBCLAUSE_PATTERN.match(line.strip())
+        if match:
+            clause_no = int(match.group(1).translate(DEVANAGARI_DIGITS))
+            parts.append([clause_no, [line]])
+        elif parts:
+            parts[-1][1].append(line)
+        else:
+            preamble.append(line)
+
+    if parts and preamble:
+        parts[0][1] = preamble + parts[0][1]
+    return [(clause_no, "\n".join(lines).strip()) for clause_no, lines in parts]
+
+
+def subclause_plan(documents, law: str):
+    """Sub-clause numbers of every section that is chunked per sub-clause, by section chunk id.
+
+    The plan is made from the English documents and applied to every language:
+    translations differ in length, so deciding per language would give the
+    hi/ne indexes chunk ids with no English counterpart.
+    """
+    plan = {}
+    for chapter in documents:
+        for section in chapter.get("sections", []):
+            text = (section.get("text") or "").strip()
+            if len(text) <= MAX_CHUNK_CHARS:
+                continue
+            clause_numbers = [clause_no for clause_no, _ in split_subclauses(text)]
+            if len(clause_numbers) >= 2 and len(set(clause_numbers)) == len(clause_numbers):
+                plan[f"{law}_ch{chapter.get('chapter_no', '')}_sec{section.get('section_no', '')}"] = clause_numbers
+    return plan
+
+
+def chunk_documents(documents, law: str, lang: str, plan=None):
+    """Turn chapter documents into one record per section or per sub-clause.
+
+    Chunk ids are stable across runs and languages: ``BNS_ch1_sec3`` for a
+    whole section, ``BNS_ch1_sec3_p2`` for its sub-clause (2). Sections are
+    split as in ``plan`` (see subclause_plan; by default made from
+    ``documents``, which is right for English). A section whose clauses don't
+    match the plan, or that repeats an earlier section, is kept whole or
+    skipped rather than given an id the English index doesn't have.
+    """
+    if plan is None:
+        plan = subclause_plan(documents, law)
+    chunks = []
+    seen = set()
+    for chapter in documents:
+        chapter_no = chapter.get("chapter_no", "")
+        chapter_title = chapter.get("chapter_title", "")
+        for section in chapter.get("sections", []):
+            text = (section.get("text") or "").strip()
+            section_no = section.get("section_no", "")
+            if not text:
+                continue
+
+            base_id = f"{law}_ch{chapter_no}_sec{section_no}"
+            if base_id in seen:
+                # Chapters split across source files can repeat their boundary section
+                print(f"Warning: {lang}/{law} repeats section {base_id}; keeping the first")
+                continue
+            seen.add(base_id)
+            base = {
+                "source": law,
+                "lang": lang,
+                "chapter_no": chapter_no,
+                "chapter_title": chapter_title,
+                "section_no": section_no,
+            }
+
+            subclauses = split_subclauses(text) if base_id in plan else []
+            if [clause_no for clause_no, _ in subclauses] != plan.get(base_id, []):
+                print(f"Warning: {lang}/{law} {base_id} sub-clauses don't match the English text; kept whole")
+                subclauses = []
+            if not subclauses:
+                chunks.append({"id": base_id, **base, "part": None, "text": text})
+                continue
+
+            for clause_no, clause_text in subclauses:
+                chunks.append({"id": f"{base_id}_p{clause_no}", **base, "part": clause_no, "text": clause_text})
+    return chunks
+
+
+def embedding_text(chunk) -> str:
+    """Text that gets embedded for a chunk: chapter title gives short clauses some context."""
+    if chunk.get("chapter_title"):
+        return f"{chunk['chapter_title']}. {chunk['text']}"
+    return chunk["text"]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so whitespace/Unicode-form edits don't force re-embedding."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def content_hash(text: str, model_name: str = EMBEDDING_MODEL) -> str:
+    """Content address of an embedding: hash of the model name plus the normalized input text."""
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def load_embedding_cache(index_folder: Path):
+    """Map content hash -> embedding row from a previously built index, if any."""
+    try:
+        index = open_index(index_folder)
+    except Exception:
+        return {}
+
+    embeddings = index["embeddings"]
+    cache = {}
+    for i, m in enumerate(index["metas"]):
+        if isinstance(m, dict) and m.get("hash"):
+            cache[m["hash"]] = np.array(embeddings[i], dtype=np.float32)
+    return cache
+
+
+def generate_embeddings(chunks, batch_size: int = DEFAULT_BATCH_SIZE, desc: str = "Generating embeddings", cache=None):
+    """Generate embeddings for chunks in length-sorted batches.
+
+    Chunks whose content hash is already in ``cache`` reuse the cached vector;
+    only new or changed chunks are encoded. Sorting the remaining texts by
+    length keeps similarly sized texts in the same batch so little compute is
+    wasted on padding; rows are returned in input order.
+    """
+    cache = cache or {}
+    inputs = [embedding_text(chunk) for chunk in chunks]
+    for chunk, text in zip(chunks, inputs):
+        chunk["hash"] = content_hash(text)
+
+    missing = [i for i, chunk in enumerate(chunks) if chunk["hash"] not in cache]
+    dim = len(next(iter(cache.values()))) if cache else get_model().get_sentence_embedding_dimension()
+
+    embeddings = np.zeros((len(inputs), dim), dtype=np.float32)
+    for i, chunk in enumerate(chunks):
+        if chunk["hash"] in cache:
+            embeddings[i] = cache[chunk["hash"]]
+
+    from tqdm import tqdm
 
-    for doc in tqdm(documents, desc="Generating embeddings"):
+    order = sorted(missing, key=lambda i: len(inputs[i]), reverse=True)
+    for start in tqdm(range(0, len(order), batch_size), desc=desc, disable=not order):
+        batch = order[start:start + batch_size]
+        vectors = get_model().encode(
+            [inputs[i] for i in batch],
+            batch_size=len(batch),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        embeddings[batch] = vectors
+
+    texts = [chunk["text"] for chunk in chunks]
+    meta = list(chunks)
+    return embeddings, texts, meta, len(missing)
+
+def build_ann_index(index_folder: Path, embeddings, ann: str, hnsw_m: int, hnsw_ef_construction: int):
+    """Build and persist the approximate index next to the embeddings, or drop a stale one."""
+    if ann == "hnsw":
+        start_time = time.time()
+        HNSWIndex.build(embeddings, M=hnsw_m, ef_construction=hnsw_ef_construction).save(index_folder)
+        print(f"Built HNSW index (M={hnsw_m}, ef_construction={hnsw_ef_construction}) in {time.time() - start_time:.1f}s")
+        return
+    for name in (HNSW_FILE, HNSW_PARAMS_FILE):
         try:
-            text = doc.get("content") or doc.get("text") or str(doc)
-            emb = model.encode(text)
-            embeddings.append(emb)
-            texts.append(text)
-            meta.append(doc)
-        except Exception as e:
-            print(f"Error embedding document: {e}")
-    
-    embeddings = np.array(embeddings)
-    return embeddings, texts, meta
+            (index_folder / name).unlink()
+        except FileNotFoundError:
+            pass
 
-def process_law(lang: str, law: str):
-    """Process a single law for a single language."""
+
+def process_law(lang: str, law: str, batch_size: int = DEFAULT_BATCH_SIZE, full: bool = False, dtype: str = "float32",
+                ann: str = "none", hnsw_m: int = HNSW_DEFAULTS["M"], hnsw_ef_construction: int = HNSW_DEFAULTS["ef_construction"]):
+    """Process a single law for a single language. Returns per-job throughput stats."""
     print(f"\nProcessing {lang}/{law}...")
+    start_time = time.time()
 
     # Raw JSON folder for this law
     raw_folder = RAW_JSON_FOLDER / lang / law
     documents = load_json_files(raw_folder)
     if not documents:
         print(f"No documents found for {lang}/{law}. Skipping.")
-        return
+        return None
 
     # Save JSONL
     jsonl_output = DATA_FOLDER / lang / law / f"{law}.jsonl"
     save_jsonl(documents, jsonl_output)
     print(f"Saved JSONL: {jsonl_output}")
 
-    # Generate embeddings
-    embeddings, texts, meta = generate_embeddings(documents)
+    # Section-level chunks: row i of embeddings.npy <-> texts[i] <-> meta[i] (meta[i]["id"] is the chunk id)
+    # Sub-clause splits follow the English text, so chunk ids line up across languages
+    plan = None if lang == "en" else subclause_plan(load_json_files(RAW_JSON_FOLDER / "en" / law), law)
+    chunks = chunk_documents(documents, law, lang, plan)
+    chunks_output = DATA_FOLDER / lang / law / f"{law}_chunks.jsonl"
+    save_jsonl(chunks, chunks_output)
+    print(f"Saved {len(chunks)} chunks: {chunks_output}")
 
-    # Save vector store files
+    # Generate embeddings, reusing vectors of unchanged chunks from the existing index
     index_folder = INDEX_FOLDER / lang / law
-    index_folder.mkdir(parents=True, exist_ok=True)
+    cache = {} if full else load_embedding_cache(index_folder)
+    encode_start = time.time()
+    embeddings, texts, meta, encoded = generate_embeddings(chunks, batch_size=batch_size, desc=f"{lang}/{law}", cache=cache)
+    encode_time = time.time() - encode_start
+    print(f"{lang}/{law}: {len(chunks) - encoded} chunks reused from cache, {encoded} re-embedded")
+
+    # Save vector store files (memory-mappable, pickle-free format; see index_store.py)
+    write_index(index_folder, embeddings, texts, meta, dtype=dtype, extra={
+        "model": EMBEDDING_MODEL, "lang": lang, "law": law, "granularity": SECTION_GRANULARITY,
+    })
+    build_ann_index(index_folder, embeddings, ann, hnsw_m, hnsw_ef_construction)
 
-    np.save(index_folder / "embeddings.npy", embeddings)
-    with open(index_folder / "texts.pkl", "wb") as f:
-        pickle.dump(texts, f)
-    with open(index_folder / "meta.pkl", "wb") as f:
-        pickle.dump(meta, f)
+    # Lexical (BM25) inverted index over the same chunks, row-aligned with the embeddings
+    BM25Index.build((embedding_text(chunk) for chunk in chunks), lang).save(index_folder)
 
     print(f"Saved embeddings in: {index_folder}")
 
+    docs_per_sec = encoded / encode_time if encoded and encode_time > 0 else 0.0
+    print(f"{lang}/{law}: {encoded} chunks encoded in {encode_time:.1f}s ({docs_per_sec:.1f} docs/s)")
+    return {
+        "lang": lang,
+        "law": law,
+        "chunks": len(chunks),
+        "encoded": encoded,
+        "encode_seconds": encode_time,
+        "total_seconds": time.time() - start_time,
+        "docs_per_sec": docs_per_sec,
+    }
+
+def load_canonical_questions(path: Path = None):
+    with open(path or CANONICAL_QUESTIONS, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def warm_answers(langs, questions_path: Path = None):
+    """Run the canonical questions through the /chat pipeline and write the responses
+    to the precomputed answers artifact, tagged with the current index version."""
+    target = os.getenv("LEXIBOT_PRECOMPUTED_ANSWERS")
+    # Every answer is computed from scratch: no serving caches, no model server
+    os.environ.update({
+        "LEXIBOT_RESPONSE_CACHE": "none",
+        "LEXIBOT_SEMANTIC_CACHE_SIZE": "0",
+        "LEXIBOT_PRECOMPUTED_ANSWERS": "",
+        "LEXIBOT_MODEL_SERVER": "",
+    })
+    import main as server_app
+    from cache import write_precomputed_answers
+
+    questions = load_canonical_questions(questions_path)
+    target = Path(target) if target else server_app.INDEX_DIR / "answers.json"
+
+    async def answer_all():
+        await server_app._ensure_models_available_async()
+        answers = {}
+        for lang in langs:
+            answers[lang] = {}
+            for question in questions.get(lang, []):
+                request = server_app.ChatRequest(query=question, language=lang)
+                async for event, response in server_app._chat_events(request):
+                    if event == "response":
+                        answers[lang][question] = response.model_dump()
+        return answers
+
+    start_time = time.time()
+    answers = asyncio.run(answer_all())
+    write_precomputed_answers(target, server_app.CACHE_NAMESPACE, answers)
+    counts = ", ".join(f"{lang}: {len(responses)}" for lang, responses in answers.items())
+    print(f"Precomputed {counts} answers in {time.time() - start_time:.1f}s -> {target} "
+          f"(namespace {server_app.CACHE_NAMESPACE})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build JSONL data and embedding indexes for all laws.")
+    parser.add_argument("--langs", nargs="+", default=LANGUAGES, choices=LANGUAGES)
+    parser.add_argument("--laws", nargs="+", default=LAWS, choices=LAWS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Texts per encode call (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Parallel (lang, law) jobs; 0 = one per core, capped at the number of jobs")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the embedding cache and re-embed every chunk")
+    parser.add_argument("--dtype", default="float32", choices=SUPPORTED_DTYPES,
+                        help="Storage dtype of embeddings.npy (default: %(default)s)")
+    parser.add_argument("--ann", default="none", choices=["none", "hnsw"],
+                        help="Also build an approximate nearest-neighbour index (needs hnswlib)")
+    parser.add_argument("--hnsw-m", type=int, default=HNSW_DEFAULTS["M"])
+    parser.add_argument("--hnsw-ef-construction", type=int, default=HNSW_DEFAULTS["ef_construction"])
+    parser.add_argument("--warm", action="store_true",
+                        help="Afterwards, answer the canonical questions with the full pipeline and store the "
+                             "responses next to the indexes (uses the server's LEXIBOT_* settings)")
+    parser.add_argument("--warm-only", action="store_true",
+                        help="Only run the warm stage against the existing indexes")
+    parser.add_argument("--warm-questions", type=Path, default=CANONICAL_QUESTIONS,
+                        help='JSON file of {"<lang>": [questions]}; default: %(default)s')
+    return parser.parse_args()
+
 def main():
-    for lang in LANGUAGES:
-        for law in LAWS:
-            process_law(lang, law)
-    print("\nAll JSONL and embeddings generation completed.")
+    args = parse_args()
+    if args.warm_only:
+        warm_answers(args.langs, args.warm_questions)
+        return
+    jobs = [(lang, law) for lang in args.langs for law in args.laws]
+    options = (args.batch_size, args.full, args.dtype, args.ann, args.hnsw_m, args.hnsw_ef_construction)
+    cpu_count = os.cpu_count() or 1
+    workers = min(args.workers or cpu_count, len(jobs))
+    start_time = time.time()
+
+    results = []
+    if workers <= 1:
+        for lang, law in jobs:
+            results.append(process_law(lang, law, *options))
+    else:
+        # Each worker loads its own model; torch intra-op threads are split so
+        # the pool as a whole uses every core without oversubscribing them.
+        threads_per_worker = max(1, cpu_count // workers)
+        print(f"Encoding {len(jobs)} jobs on {workers} workers x {threads_per_worker} threads")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads_per_worker,),
+        ) as pool:
+            futures = {pool.submit(process_law, lang, law, *options): (lang, law) for lang, law in jobs}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    lang, law = futures[future]
+                    print(f"Error processing {lang}/{law}: {e}")
+
+    print("\nThroughput per job:")
+    for stats in sorted((r for r in results if r), key=lambda r: (r["lang"], r["law"])):
+        print(f"  {stats['lang']}/{stats['law']:<5} {stats['chunks']:>6} chunks  {stats['encoded']:>6} encoded  "
+              f"{stats['encode_seconds']:>7.1f}s  {stats['docs_per_sec']:>8.1f} docs/s")
+    print(f"\nAll JSONL and embeddings generation completed in {time.time() - start_time:.1f}s.")
+
+    if args.warm:
+        warm_answers(args.langs, args.warm_questions)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from search import top_k
+
+# BM25 inverted index, stored next to the dense index files:
+#   bm25.npz          term_offsets (V + 1), doc_ids / tfs (postings), doc_lens
+#   bm25_vocab.json   term list; a term's id is its position
+BM25_FILE = "bm25.npz"
+BM25_VOCAB_FILE = "bm25_vocab.json"
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+# Latin letters/digits, or runs of Devanagari letters, vowel signs and digits.
+# Python's \w does not match Devanagari vowel signs (matras), so the block is
+# spelled out; the danda punctuation marks (U+0964, U+0965) are excluded.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[ऀ-ॣ०-ॿ]+")
+POSSESSIVE_PATTERN = re.compile(r"['’]s\b")
+
+STOPWORDS = {
+    "en": {
+        "a", "an", "the", "is", "are", "was", "were", "be", "been", "of", "to", "in", "on", "for", "and", "or",
+        "by", "with", "what", "which", "who", "whom", "how", "when", "where", "any", "such", "this", "that",
+        "it", "its", "as", "at", "from", "if", "not", "shall", "may", "under", "than", "do", "does", "i", "me",
+        "my", "someone", "there",
+    },
+    "hi": {
+        "के", "का", "की", "को", "में", "से", "है", "हैं", "था", "थे", "और", "या", "पर", "क्या", "कैसे", "कौन",
+        "एक", "यह", "वह", "इस", "उस", "जो", "भी", "तो", "ही", "लिए", "द्वारा", "होता", "होती", "होते", "किया",
+        "जाता", "जाती", "जाते",
+    },
+    "ne": {
+        "को", "का", "की", "मा", "ले", "लाई", "बाट", "र", "वा", "छ", "छन्", "हो", "के", "कसरी", "कुन", "यो", "त्यो",
+        "यस", "त्यस", "जुन", "पनि", "नै", "लागि", "द्वारा", "गर्ने", "गरिन्छ", "हुन्छ",
+    },
+}
+
+# Postpositions and plural markers that hi/ne attach to the noun ("हत्याको" -> "हत्या")
+SUFFIXES = {
+    "hi": ("ों", "ें", "ाओं", "ियों"),
+    "ne": ("हरूको", "हरूका", "हरूलाई", "हरूमा", "हरू", "को", "का", "की", "मा", "लाई", "ले", "बाट", "सँग"),
+}
+
+
+def tokenize(text: str, lang: str = "en") -> List[str]:
+    """Lowercase, NFC-normalized tokens with Devanagari digits mapped to ASCII."""
+    text = unicodedata.normalize("NFC", text).lower().translate(DEVANAGARI_DIGITS)
+    text = POSSESSIVE_PATTERN.sub("", text)
+    stopwords = STOPWORDS.get(lang, set()) | STOPWORDS["en"]
+    suffixes = SUFFIXES.get(lang, ())
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        for suffix in suffixes:
+            if token.endswith(suffix) and len(token) > len(suffix) + 1:
+                token = token[:-len(suffix)]
+                break
+        if token not in stopwords:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over CSR-style postings arrays."""
+
+    def __init__(self, vocab: List[str], term_offsets: np.ndarray, doc_ids: np.ndarray,
+                 tfs: np.ndarray, doc_lens: np.ndarray, lang: str = "en"):
+        self.vocab = {term: i for i, term in enumerate(vocab)}
+        self.terms = vocab
+        self.term_offsets = term_offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lens = doc_lens
+        self.lang = lang
+        self.n_docs = len(doc_lens)
+        self.avg_doc_len = float(doc_lens.mean()) if self.n_docs else 0.0
+        # Per-document length normalization term, precomputed once
+        self._norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lens / max(self.avg_doc_len, 1e-9))
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    @classmethod
+    def build(cls, texts: Iterable[str], lang: str = "en") -> "BM25Index":
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lens = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text, lang))
+            doc_lens.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+
+        vocab = sorted(postings)
+        term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        for i, term in enumerate(vocab):
+            term_offsets[i + 1] = term_offsets[i] + len(postings[term])
+        doc_ids = np.fromiter((d for term in vocab for d, _ in postings[term]), dtype=np.int32, count=int(term_offsets[-1]))
+        tfs = np.fromiter((min(tf, 65535) for term in vocab for _, tf in postings[term]), dtype=np.uint16, count=int(term_offsets[-1]))
+        return cls(vocab, term_offsets, doc_ids, tfs, np.asarray(doc_lens, dtype=np.int32), lang)
+
+    def save(self, folder: Path):
+        folder = Path(folder)
+        np.savez(folder / BM25_FILE, term_offsets=self.term_offsets, doc_ids=self.doc_ids,
+                 tfs=self.tfs, doc_lens=self.doc_lens)
+        with open(folder / BM25_VOCAB_FILE, "w", encoding="utf-8") as f:
+            json.dump({"lang": self.lang, "terms": self.terms}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, folder: Path) -> "BM25Index":
+        folder = Path(folder)
+        with open(folder / BM25_VOCAB_FILE, "r", encoding="utf-8") as f:
+            vocab = json.load(f)
+        with np.load(folder / BM25_FILE) as arrays:
+            return cls(vocab["terms"], arrays["term_offsets"], arrays["doc_ids"], arrays["tfs"],
+                       arrays["doc_lens"], vocab.get("lang", "en"))
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for ``query`` (zeros where no term matches)."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(tokenize(query, self.lang)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end].astype(np.float32)
+            df = end - start
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            # Each document appears once per term's postings, so plain fancy-index add is safe
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + self._norm[docs])
+        return scores
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k documents with a positive BM25 score: (doc ids, scores), best first."""
+        scores = self.scores(query)
+        best = top_k(scores, k)
+        best = best[scores[best] > 0]
+        return best, scores[best]
+
+
+def load_or_build_bm25(folder: Path, texts: Sequence[str], lang: str) -> Optional[BM25Index]:
+    """Load the persisted BM25 index, or build one from ``texts`` for indexes built before it existed."""
+    if (Path(folder) / BM25_FILE).exists():
+        return BM25Index.load(folder)
+    if len(texts) == 0:
+        return None
+    return BM25Index.build(texts, lang)
+
+
+def reciprocal_rank_fusion(rankings: List[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Fuse several best-first rankings: score(d) = sum over rankings of 1 / (k + rank)."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc] = fused.get(doc, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: -item[1])
@@ -1,47 +1,41 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Any, Tuple
+from typing import AsyncIterator, Dict, List, Any, Tuple
 from pathlib import Path
-import pickle
+import json
 import uvicorn
 import logging
 import asyncio
-from collections import OrderedDict
-
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-except ImportError:
-    SentenceTransformer = None
-
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForQuestionAnswering
-except ImportError:
-    pipeline = None
-    AutoTokenizer = None
-    AutoModelForQuestionAnswering = None
-
-try:
-    from googletrans import Translator
-except ImportError:
-    Translator = None
-
-try:
-    from sentence_transformers import CrossEncoder
-except ImportError:
-    CrossEncoder = None
+import functools
+import importlib.util
+import os
+import threading
 
+# Heavy libraries (torch, transformers, sentence_transformers, googletrans) are
+# imported only when the models load, so importing this module is fast
 import numpy as np
 import re
 import time
 from typing import Optional
 
-try:
-    import torch
-except ImportError:
-    torch = None
+from batching import MicroBatcher
+from cache import CACHE_BACKENDS, PrecomputedAnswers, RedisTier, SemanticCache, SQLiteTier, TieredCache, TTLCache
+from inference import InferenceExecutor, InferenceQueueFull, set_torch_threads, threads_per_worker
+from index_store import (compute_centroid, index_version, is_section_level, load_legacy_index, migrate_legacy_index,
+                         open_index, read_manifest)
+from onnx_backend import INFERENCE_BACKENDS, load_embedder, load_qa_pipeline
+from router import DatasetRouter
+from lexical import load_or_build_bm25, reciprocal_rank_fusion
+from metrics import MetricsRegistry, RequestTrace, register_request_metrics
+from model_server import ModelClient, RemoteQAPipeline
+from translation import LOCAL_TRANSLATION_MODEL, TRANSLATION_BACKENDS, TranslationCache, TranslationService, is_in_language_script
+from registry import ComponentRegistry, estimate_nbytes, process_rss_bytes
+from startup import StartupTimeline
+from section_lookup import DEVANAGARI_DIGITS, build_reference_index, parse_reference
+from vector_index import VECTOR_BACKENDS, HNSW_DEFAULTS, BruteForceIndex, ShardedIndex, load_vector_index
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -76,12 +70,24 @@ DATASET_NAMES = {
     "BNSS": "Bharatiya Nagarik Suraksha Sanhita"
 }
 
+# Multilingual disclaimer
+DISCLAIMERS = {
+    "en": "This is for educational purposes, not legal advice. Please consult a qualified legal professional for actual legal matters.",
+    "hi": "यह शैक्षिक उद्देश्यों के लिए है, कानूनी सलाह नहीं। वास्तविक कानूनी मामलों के लिए कृपया किसी योग्य कानूनी पेशेवर से परामर्श करें।",
+    "ne": "यो शैक्षिक उद्देश्यका लागि हो, कानुनी सल्लाह होइन। वास्तविक कानुनी मामिलाहरूका लागि कृपया योग्य कानुनी व्यावसायीको परामर्श लिनुहोस्।"
+}
+
+# Localized labels for direct section/chapter lookups
+SECTION_LABELS = {"en": "Section", "hi": "धारा", "ne": "दफा"}
+CHAPTER_LABELS = {"en": "Chapter", "hi": "अध्याय", "ne": "परिच्छेद"}
+
 # -----------------------
 # Models
 # -----------------------
 class ChatRequest(BaseModel):
     query: str
     language: str  # "en" | "hi" | "ne"
+    dataset: Optional[str] = None  # Optional filter: "BNS" | "BSA" | "BNSS"
 
 class LanguageChangeRequest(BaseModel):
     language: str  # "en" | "hi" | "ne"
@@ -95,30 +101,213 @@ class SearchResponse(BaseModel):
     disclaimer: str
     source_code: str  # BNS, BSA, or BNSS
     source_name: str  # Full name of the legal code
+    routing_scores: Dict[str, float] = {}  # Dataset router scores, for debugging
 
 # -----------------------
 # In-memory index cache
 # -----------------------
 _indexes: Dict[str, Dict[str, Any]] = {}
 
+# Unified per-language retrieval matrices across all datasets (built once per language)
+_lang_indexes: Dict[str, Dict[str, Any]] = {}
+
+# Index loads run on worker threads, concurrently at startup: one lock per index
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+
+
+def _index_lock(key: str) -> threading.Lock:
+    with _index_locks_guard:
+        return _index_locks.setdefault(key, threading.Lock())
+
 # Global models - upgraded to multilingual with GPU support
 _sentence_model = None
 _qa_pipeline = None
-_translator = None
+_translation: Optional[TranslationService] = None  # created with the other models (see _ensure_models_available_async)
 
-# Enhanced query result cache with LRU eviction (max 200 entries)
-_query_cache: OrderedDict = OrderedDict()
-MAX_CACHE_SIZE = 200
+# Per-phase startup timeline, served by /startup
+_startup = StartupTimeline()
 
-# Query embedding cache with LRU eviction (max 500 entries, 15min TTL)
-_embedding_cache: OrderedDict = OrderedDict()
-MAX_EMBEDDING_CACHE_SIZE = 500
+# Dataset router: precomputed description embeddings + per-index centroids.
+# Retrieval spans every dataset, so routing only feeds the `routing` event and
+# routing_scores; it runs per request only with LEXIBOT_ROUTING_DEBUG=1.
+_router = DatasetRouter(DATASETS)
+ROUTING_DEBUG = os.getenv("LEXIBOT_ROUTING_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Query embedding cache: LRU bounded by bytes (a 768-dim embedding is 3 KB), 15min TTL
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("LEXIBOT_EMBEDDING_CACHE_MB", "2"))
 EMBEDDING_CACHE_TTL = 900  # 15 minutes
+_embedding_cache = TTLCache("embedding", int(EMBEDDING_CACHE_MAX_MB * (1 << 20)), EMBEDDING_CACHE_TTL)
+
+# Expired entries of the in-process caches are removed by a background task
+CACHE_SWEEP_INTERVAL = float(os.getenv("LEXIBOT_CACHE_SWEEP_INTERVAL", "30"))
 
     # Optimized thresholds for better performance and accuracy
 SIMILARITY_THRESHOLD = 0.3  # Lowered for better recall and fewer "no results" responses
 QA_CONFIDENCE_THRESHOLD = 0.45  # Increased for better answer quality
 TOP_K_RETRIEVAL = 3  # Reduced for faster processing
+HYBRID_CANDIDATES = 20  # Dense and BM25 candidates fed into reciprocal rank fusion
+
+# Vector index backend: "brute" (exact) or "hnsw" (approximate, built by ingest_data.py --ann hnsw)
+VECTOR_BACKEND = os.getenv("LEXIBOT_VECTOR_BACKEND", "brute")
+HNSW_EF_SEARCH = int(os.getenv("LEXIBOT_HNSW_EF_SEARCH", HNSW_DEFAULTS["ef_search"]))
+if VECTOR_BACKEND not in VECTOR_BACKENDS:
+    raise RuntimeError(f"LEXIBOT_VECTOR_BACKEND must be one of {VECTOR_BACKENDS}, got {VECTOR_BACKEND!r}")
+
+# Retrieval for hi/ne queries: "translate" (translate the query to English first) or
+# "native" (embed and search with the original query). In native mode the English-only
+# QA model reads the translated question over the aligned English chunks and the answer
+# is mapped back to the native text, so only the short query is ever translated; with
+# LEXIBOT_NATIVE_ANSWER=extractive (or no translation backend) the best native sentence
+# is selected by embedding instead.
+RETRIEVAL_MODE = os.getenv("LEXIBOT_RETRIEVAL_MODE", "translate")
+NATIVE_ANSWER_MODE = os.getenv("LEXIBOT_NATIVE_ANSWER", "qa")
+if RETRIEVAL_MODE not in ("translate", "native"):
+    raise RuntimeError(f"LEXIBOT_RETRIEVAL_MODE must be 'translate' or 'native', got {RETRIEVAL_MODE!r}")
+if NATIVE_ANSWER_MODE not in ("qa", "extractive"):
+    raise RuntimeError(f"LEXIBOT_NATIVE_ANSWER must be 'qa' or 'extractive', got {NATIVE_ANSWER_MODE!r}")
+
+# Model runtime: "torch", or ONNX Runtime fp32/int8 graphs exported by `python onnx_backend.py export`
+INFERENCE_BACKEND = os.getenv("LEXIBOT_INFERENCE_BACKEND", "torch")
+if INFERENCE_BACKEND not in INFERENCE_BACKENDS:
+    raise RuntimeError(f"LEXIBOT_INFERENCE_BACKEND must be one of {INFERENCE_BACKENDS}, got {INFERENCE_BACKEND!r}")
+
+# Query/answer translation: "google" (googletrans), "local" (offline seq2seq model) or "none".
+# Translations are cached in memory and, unless LEXIBOT_TRANSLATION_CACHE is empty, in SQLite.
+TRANSLATION_BACKEND = os.getenv("LEXIBOT_TRANSLATION_BACKEND", "google")
+TRANSLATION_MODEL = os.getenv("LEXIBOT_TRANSLATION_MODEL", LOCAL_TRANSLATION_MODEL)
+TRANSLATION_CACHE_PATH = os.getenv("LEXIBOT_TRANSLATION_CACHE", str(ROOT / "cache" / "translations.sqlite3"))
+if TRANSLATION_BACKEND not in TRANSLATION_BACKENDS:
+    raise RuntimeError(f"LEXIBOT_TRANSLATION_BACKEND must be one of {TRANSLATION_BACKENDS}, got {TRANSLATION_BACKEND!r}")
+# The SQLite table is opened with the translation backend, not at import
+_translation_cache = TranslationCache(max_entries=2048)
+
+# Multi-worker deployments: with LEXIBOT_MODEL_SERVER set to the Unix socket of
+# `python model_server.py`, this worker runs no models itself. Embedding and QA go
+# to the model server and the brute-force language matrices are mapped from its
+# shared memory, so each extra uvicorn worker costs little RAM.
+MODEL_SERVER_SOCKET = os.getenv("LEXIBOT_MODEL_SERVER", "")
+_model_client = ModelClient(MODEL_SERVER_SOCKET) if MODEL_SERVER_SOCKET else None
+
+# Response cache: a per-process LRU (L1) in front of a tier shared by all workers
+# that survives restarts (L2): "sqlite" (LEXIBOT_RESPONSE_CACHE_PATH, evicted LRU
+# beyond LEXIBOT_RESPONSE_CACHE_MAX_MB), "redis" (LEXIBOT_REDIS_URL) or "none".
+# Keys are namespaced by the index version and answer settings.
+RESPONSE_CACHE_BACKEND = os.getenv("LEXIBOT_RESPONSE_CACHE", "sqlite")
+RESPONSE_CACHE_PATH = os.getenv("LEXIBOT_RESPONSE_CACHE_PATH", str(ROOT / "cache" / "responses.sqlite3"))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("LEXIBOT_RESPONSE_CACHE_MAX_MB", "64"))
+RESPONSE_CACHE_TTL = float(os.getenv("LEXIBOT_RESPONSE_CACHE_TTL", "86400"))
+REDIS_URL = os.getenv("LEXIBOT_REDIS_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_L1_MB = float(os.getenv("LEXIBOT_RESPONSE_CACHE_L1_MB", "8"))
+RESPONSE_CACHE_L1_TTL = 300
+if RESPONSE_CACHE_BACKEND not in CACHE_BACKENDS:
+    raise RuntimeError(f"LEXIBOT_RESPONSE_CACHE must be one of {CACHE_BACKENDS}, got {RESPONSE_CACHE_BACKEND!r}")
+
+def _index_version() -> str:
+    return index_version([INDEX_DIR / lang / dataset for lang in SUPPORTED_LANGS for dataset in DATASETS])
+
+
+def _cache_namespace(version: str) -> str:
+    return f"{version}:{RETRIEVAL_MODE}:{NATIVE_ANSWER_MODE}:{INFERENCE_BACKEND}:{TRANSLATION_BACKEND}"
+
+
+# Re-derived by _refresh_cache_namespace whenever an index is (re)loaded
+INDEX_VERSION = _index_version()
+CACHE_NAMESPACE = _cache_namespace(INDEX_VERSION)
+
+
+def _response_cache_l2():
+    if RESPONSE_CACHE_BACKEND == "sqlite":
+        return SQLiteTier(Path(RESPONSE_CACHE_PATH), CACHE_NAMESPACE, int(RESPONSE_CACHE_MAX_MB * (1 << 20)), RESPONSE_CACHE_TTL)
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisTier(REDIS_URL, CACHE_NAMESPACE, RESPONSE_CACHE_TTL)
+    return None
+
+
+# The L2 is attached by _open_response_cache at startup, so importing this module
+# (tests, tooling, the model server) opens no files or connections
+_response_cache = TieredCache(TTLCache("response", int(RESPONSE_CACHE_L1_MB * (1 << 20)), RESPONSE_CACHE_L1_TTL))
+_response_cache_lock = threading.Lock()
+
+
+def _open_response_cache():
+    with _response_cache_lock:
+        if _response_cache.l2 is None:
+            _response_cache.l2 = _response_cache_l2()
+    return _response_cache.l2
+
+# Semantic response cache: a query whose embedding is within cosine
+# LEXIBOT_SEMANTIC_CACHE_THRESHOLD of an answered query (same language and
+# dataset filter) gets that query's response, skipping search, QA and translation.
+# LEXIBOT_SEMANTIC_CACHE_SIZE=0 disables it.
+SEMANTIC_CACHE_SIZE = int(os.getenv("LEXIBOT_SEMANTIC_CACHE_SIZE", "1000"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("LEXIBOT_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+_semantic_cache = SemanticCache(CACHE_NAMESPACE, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD)
+
+# Answers to the canonical questions, precomputed by `ingest_data.py --warm` for the
+# current indexes and settings; served on normalized match with no model calls.
+# An empty LEXIBOT_PRECOMPUTED_ANSWERS disables them.
+PRECOMPUTED_ANSWERS_PATH = os.getenv("LEXIBOT_PRECOMPUTED_ANSWERS", str(INDEX_DIR / "answers.json"))
+_precomputed_answers = PrecomputedAnswers(Path(PRECOMPUTED_ANSWERS_PATH) if PRECOMPUTED_ANSWERS_PATH else None, CACHE_NAMESPACE)
+_namespace_lock = threading.Lock()
+
+
+def _refresh_cache_namespace():
+    """Follow index rebuilds: when the index files on disk changed since CACHE_NAMESPACE was
+    derived, every namespaced cache switches over so no answer from the old indexes is served."""
+    global INDEX_VERSION, CACHE_NAMESPACE, _precomputed_answers
+    with _namespace_lock:
+        version = _index_version()
+        if version == INDEX_VERSION:
+            return
+        logger.info(f"Index version changed {INDEX_VERSION} -> {version}; switching cache namespace")
+        INDEX_VERSION = version
+        CACHE_NAMESPACE = _cache_namespace(version)
+        _response_cache.set_namespace(CACHE_NAMESPACE)
+        _semantic_cache.set_namespace(CACHE_NAMESPACE)
+        _precomputed_answers = PrecomputedAnswers(_precomputed_answers.path, CACHE_NAMESPACE)
+
+# Inference execution layer: every blocking stage runs on a bounded pool of
+# LEXIBOT_INFERENCE_WORKERS threads, each using cpu_count / workers torch threads.
+# Requests that would queue more than LEXIBOT_INFERENCE_MAX_QUEUE stages get a 503.
+INFERENCE_WORKERS = int(os.getenv("LEXIBOT_INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_QUEUE = int(os.getenv("LEXIBOT_INFERENCE_MAX_QUEUE", "64"))
+
+# Network translation (googletrans) mostly waits on I/O, so it gets its own pool of
+# LEXIBOT_TRANSLATION_WORKERS threads and queue limit instead of holding compute threads
+# and admission slots. The offline NLLB backend is a forward pass and stays on the inference pool.
+TRANSLATION_WORKERS = int(os.getenv("LEXIBOT_TRANSLATION_WORKERS", "8"))
+TRANSLATION_MAX_QUEUE = int(os.getenv("LEXIBOT_TRANSLATION_MAX_QUEUE", "64"))
+
+# Cross-request micro-batching: query embeddings and QA pairs from concurrent requests
+# are coalesced into one forward pass once a batch fills up or the max wait has passed
+EMBED_BATCH_SIZE = int(os.getenv("LEXIBOT_EMBED_BATCH_SIZE", "32"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("LEXIBOT_EMBED_BATCH_WAIT_MS", "5"))
+QA_BATCH_SIZE = int(os.getenv("LEXIBOT_QA_BATCH_SIZE", "16"))
+QA_BATCH_WAIT_MS = float(os.getenv("LEXIBOT_QA_BATCH_WAIT_MS", "5"))
+
+# QA runs once per request over every top-k candidate. Sequence length and stride
+# are fixed so batched features have bounded, uniform shapes; long contexts are
+# split into overlapping windows by the pipeline.
+QA_MAX_SEQ_LEN = 384
+QA_DOC_STRIDE = 128
+QA_CONTEXT_CHARS = 1200
+
+# Warm-up at startup: one batch of LEXIBOT_WARMUP_BATCH sample queries (0 disables)
+WARMUP_BATCH = int(os.getenv("LEXIBOT_WARMUP_BATCH", "8"))
+WARMUP_QUERIES = [
+    "What is the punishment for murder?",
+    "How is a FIR registered?",
+    "हत्या के लिए क्या सजा है?",
+    "जमानतका लागि के प्रावधानहरू छन्?",
+]
+
+# Load state of models and indexes; /ready turns 200 once every required component is loaded
+_registry = ComponentRegistry(
+    ["model:embedder", "model:qa"]
+    + [f"lang_index:{lang}" for lang in sorted(SUPPORTED_LANGS)]
+    + (["warmup"] if WARMUP_BATCH > 0 else [])
+)
 
 # Simple query patterns that don't need heavy processing
 SIMPLE_GREETINGS = {
@@ -131,56 +320,174 @@ SIMPLE_GREETINGS = {
 }
 
 
-async def _ensure_models_available_async():
-    """Async version: Load multilingual models optimized for Hindi and Nepali - with GPU support"""
-    global _sentence_model, _qa_pipeline, _translator
+def _model_device() -> str:
+    """GPU for the PyTorch backend when available; the ONNX backends target CPU nodes"""
+    if INFERENCE_BACKEND != "torch":
+        return "cpu"
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
 
-    if SentenceTransformer is None or pipeline is None or AutoTokenizer is None or AutoModelForQuestionAnswering is None:
+def _require_ml_libraries():
+    """Check the model libraries are installed without importing them (they are imported on model load)"""
+    if _model_client is not None:
+        return
+    if any(importlib.util.find_spec(name) is None for name in ("sentence_transformers", "transformers")):
         raise HTTPException(status_code=500, detail="Required ML libraries not installed. Please install sentence-transformers and transformers.")
 
-    if _sentence_model is None:
-        # Use architecture-specified model for better performance with GPU support
-        logger.info("Loading multilingual sentence transformer with GPU support...")
-        # Run in thread pool to avoid blocking
-        _sentence_model = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2', device='cuda' if torch.cuda.is_available() else 'cpu')
-        )
-        logger.info("Sentence transformer loaded successfully")
-
-    if _qa_pipeline is None:
-        # Use RoBERTa QA model for better multilingual support
-        logger.info("Loading RoBERTa QA pipeline for multilingual support...")
-        model_name = "deepset/roberta-base-squad2"
-        _qa_pipeline = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: pipeline("question-answering", model=model_name, device='cuda' if torch.cuda.is_available() else 'cpu')
-        )
-        logger.info("QA pipeline loaded successfully")
 
-    if _translator is None and Translator is not None:
-        # Initialize translator for Hindi/Nepali queries
-        logger.info("Initializing Google Translator...")
-        _translator = Translator()
-        logger.info("Translator initialized successfully")
+# One lock per model so concurrent loaders (startup, first request) load each model once
+_model_locks = {name: threading.Lock() for name in ("embedder", "qa", "translation")}
+
+
+def _load_sentence_model():
+    global _sentence_model
+    with _model_locks["embedder"]:
+        if _sentence_model is None:
+            # Use architecture-specified model for better performance with GPU support
+            if _model_client is not None:
+                with _registry.track("model:embedder") as component:
+                    _model_client.ping()
+                    _sentence_model = _model_client
+                    component.memory_bytes = 0
+                logger.info(f"Using model server at {MODEL_SERVER_SOCKET} for embeddings")
+                return _sentence_model
+            logger.info(f"Loading multilingual sentence transformer ({INFERENCE_BACKEND})...")
+            set_torch_threads(TORCH_THREADS)
+            with _registry.track("model:embedder") as component:
+                _sentence_model = load_embedder(INFERENCE_BACKEND, _model_device(), TORCH_THREADS)
+                component.memory_bytes = estimate_nbytes(_sentence_model)
+            logger.info("Sentence transformer loaded successfully")
+    return _sentence_model
+
+
+def _load_qa_model():
+    global _qa_pipeline
+    with _model_locks["qa"]:
+        if _qa_pipeline is None:
+            # Use RoBERTa QA model for better multilingual support
+            if _model_client is not None:
+                with _registry.track("model:qa") as component:
+                    _model_client.ping()
+                    _qa_pipeline = RemoteQAPipeline(_model_client)
+                    component.memory_bytes = 0
+                logger.info(f"Using model server at {MODEL_SERVER_SOCKET} for QA")
+                return _qa_pipeline
+            logger.info(f"Loading RoBERTa QA pipeline for multilingual support ({INFERENCE_BACKEND})...")
+            set_torch_threads(TORCH_THREADS)
+            with _registry.track("model:qa") as component:
+                _qa_pipeline = load_qa_pipeline(INFERENCE_BACKEND, _model_device(), TORCH_THREADS)
+                component.memory_bytes = estimate_nbytes(_qa_pipeline)
+            logger.info("QA pipeline loaded successfully")
+    return _qa_pipeline
+
+
+def _load_translation():
+    global _translation
+    with _model_locks["translation"]:
+        if _translation is None:
+            # Initialize translator for Hindi/Nepali queries
+            logger.info(f"Initializing translation backend ({TRANSLATION_BACKEND})...")
+            if TRANSLATION_CACHE_PATH:
+                try:
+                    _translation_cache.open(Path(TRANSLATION_CACHE_PATH))
+                except Exception as e:
+                    logger.warning(f"Translation cache unavailable: {e}; translations are cached in memory only")
+            service = TranslationService(TRANSLATION_BACKEND, _translation_cache, TRANSLATION_MODEL)
+            try:
+                with _registry.track("translation") as component:
+                    component.memory_bytes = estimate_nbytes(service.load())
+                logger.info("Translator initialized successfully")
+            except Exception as e:
+                logger.warning(f"Translation backend unavailable: {e}; queries will be processed untranslated")
+            _translation = service
+    return _translation
+
+
+async def _ensure_models_available_async():
+    """Async version: load the embedder, QA model and translator concurrently on worker threads"""
+    _require_ml_libraries()
+    if _sentence_model is None or _qa_pipeline is None or _translation is None:
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, load) for load in (_load_sentence_model, _load_qa_model, _load_translation)
+        ))
 
 
 def _ensure_models_available():
     """Load multilingual models optimized for Hindi and Nepali - with proper caching"""
-    global _sentence_model, _qa_pipeline
-    if SentenceTransformer is None or pipeline is None or AutoTokenizer is None or AutoModelForQuestionAnswering is None:
-        raise HTTPException(status_code=500, detail="Required ML libraries not installed. Please install sentence-transformers and transformers.")
+    _require_ml_libraries()
+    _load_sentence_model()
+    _load_qa_model()
+
+
+def _encode_batch(texts: List[str]) -> List[np.ndarray]:
+    """One sentence-transformer forward pass over a micro-batch of queries"""
+    return list(_sentence_model.encode(texts, batch_size=len(texts)))
+
+
+def _qa_batch(groups: List[List[Tuple[str, str]]]) -> List[List[Dict[str, Any]]]:
+    """One QA pipeline call over the (question, context) pairs of a micro-batch of requests.
+
+    Each item is one request's candidate pairs; results come back grouped the same way.
+    """
+    pairs = [pair for group in groups for pair in group]
+    if not pairs:
+        return [[] for _ in groups]
+    results = _qa_pipeline(
+        question=[question for question, _ in pairs],
+        context=[context for _, context in pairs],
+        batch_size=min(len(pairs), QA_BATCH_SIZE),
+        max_seq_len=QA_MAX_SEQ_LEN,
+        doc_stride=QA_DOC_STRIDE,
+    )
+    # The pipeline unwraps single-item inputs
+    results = [results] if isinstance(results, dict) else list(results)
+
+    grouped = []
+    start = 0
+    for group in groups:
+        grouped.append(results[start:start + len(group)])
+        start += len(group)
+    return grouped
+
+
+TORCH_THREADS = threads_per_worker(INFERENCE_WORKERS)
+_inference = InferenceExecutor(INFERENCE_WORKERS, INFERENCE_MAX_QUEUE)
+_translation_executor = (
+    _inference if TRANSLATION_BACKEND == "local"
+    else InferenceExecutor(TRANSLATION_WORKERS, TRANSLATION_MAX_QUEUE, name="translation")
+)
+
+# Per-stage latency histograms, batch sizes and runtime gauges, served by /metrics.
+# LEXIBOT_SERVER_TIMING=1 also returns each request's stage timings in a Server-Timing header.
+SERVER_TIMING = os.getenv("LEXIBOT_SERVER_TIMING", "").lower() in ("1", "true", "yes")
+_metrics = MetricsRegistry()
+register_request_metrics(_metrics)
 
-    if _sentence_model is None:
-        # Use architecture-specified model for better performance
-        logger.info("Loading sentence transformer as per architecture...")
-        _sentence_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
-        logger.info("Sentence transformer loaded successfully")
 
-    if _qa_pipeline is None:
-        # Use RoBERTa QA model for better multilingual support
-        logger.info("Loading RoBERTa QA pipeline for multilingual support...")
-        model_name = "deepset/roberta-base-squad2"
-        _qa_pipeline = pipeline("question-answering", model=model_name)
-        logger.info("QA pipeline loaded successfully")
+def _observe_batch(batcher: str, size: int, seconds: float):
+    _metrics.observe("lexibot_batch_size", size, batcher=batcher)
+    _metrics.observe("lexibot_batch_seconds", seconds, batcher=batcher)
+
+
+_embed_batcher = MicroBatcher("embed", _encode_batch, EMBED_BATCH_SIZE, EMBED_BATCH_WAIT_MS, executor=_inference,
+                              on_batch=functools.partial(_observe_batch, "embed"))
+_qa_batcher = MicroBatcher("qa", _qa_batch, QA_BATCH_SIZE, QA_BATCH_WAIT_MS, executor=_inference,
+                           on_batch=functools.partial(_observe_batch, "qa"))
+
+
+async def _embed_query(query: str, lang: str) -> np.ndarray:
+    """Query embedding from the cache, or from the next embedding micro-batch"""
+    cached_emb = _get_cached_embedding(query, lang)
+    if cached_emb is not None:
+        return cached_emb
+    query_embedding = await _embed_batcher.submit(query)
+    _cache_embedding(query, lang, query_embedding)
+    return query_embedding
 
 
 def _is_simple_query(query: str) -> bool:
@@ -189,80 +496,55 @@ def _is_simple_query(query: str) -> bool:
     return query_lower in SIMPLE_GREETINGS or len(query.split()) <= 2
 
 
-def _get_cache_key(query: str, lang: str) -> str:
-    """Generate cache key for query"""
-    return f"{lang}:{query.lower().strip()}"
+def _get_cache_key(query: str, lang: str, dataset_filter: Optional[str] = None) -> str:
+    """Generate cache key for query; filtered and unfiltered answers are cached separately"""
+    return f"{lang}:{dataset_filter or '*'}:{query.lower().strip()}"
 
 
 def _get_cached_embedding(query: str, lang: str) -> Optional[np.ndarray]:
     """Get cached query embedding if available and not expired"""
     cache_key = f"emb:{lang}:{query.lower().strip()}"
-    if cache_key in _embedding_cache:
-        cached = _embedding_cache[cache_key]
-        if time.time() - cached.get('timestamp', 0) < EMBEDDING_CACHE_TTL:
-            logger.info(f"Embedding cache hit for query: {cache_key}")
-            _embedding_cache.move_to_end(cache_key)
-            return cached['embedding']
-        else:
-            del _embedding_cache[cache_key]
-    return None
+    embedding = _embedding_cache.get(cache_key)
+    if embedding is not None:
+        logger.info(f"Embedding cache hit for query: {cache_key}")
+    return embedding
 
 
 def _cache_embedding(query: str, lang: str, embedding: np.ndarray):
-    """Cache query embedding with timestamp and LRU eviction"""
-    cache_key = f"emb:{lang}:{query.lower().strip()}"
-    _embedding_cache[cache_key] = {
-        'embedding': embedding,
-        'timestamp': time.time()
-    }
-    _embedding_cache.move_to_end(cache_key)
-
-    if len(_embedding_cache) > MAX_EMBEDDING_CACHE_SIZE:
-        _embedding_cache.popitem(last=False)
+    """Cache query embedding (LRU eviction by bytes)"""
+    _embedding_cache.put(f"emb:{lang}:{query.lower().strip()}", embedding)
 
 
 def _get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
-    """Get cached response if available and not expired - with LRU eviction"""
-    if cache_key in _query_cache:
-        cached = _query_cache[cache_key]
-        # Simple TTL check (5 minutes)
-        if time.time() - cached.get('timestamp', 0) < 300:
-            logger.info(f"Cache hit for query: {cache_key}")
-            # Move to end (most recently used)
-            _query_cache.move_to_end(cache_key)
-            return cached['response']
-        else:
-            # Remove expired cache entry
-            del _query_cache[cache_key]
-    return None
+    """Cached response from the process LRU, or from the shared tier (promoted to the LRU)"""
+    response = _response_cache.get(cache_key)
+    if response is not None:
+        logger.info(f"Cache hit for query: {cache_key}")
+    return response
 
 
 def _cache_response(cache_key: str, response: Dict[str, Any]):
-    """Cache response with timestamp and LRU eviction"""
-    _query_cache[cache_key] = {
-        'response': response,
-        'timestamp': time.time()
-    }
-    # Move to end (most recently used)
-    _query_cache.move_to_end(cache_key)
-
-    # Limit cache size to prevent memory issues (LRU eviction)
-    if len(_query_cache) > MAX_CACHE_SIZE:
-        # Remove least recently used entry
-        _query_cache.popitem(last=False)
+    """Cache response in both tiers"""
+    _response_cache.put(cache_key, response)
 
 
 def _cleanup_expired_cache():
     """Periodic cleanup of expired cache entries"""
-    current_time = time.time()
-    expired_keys = [
-        key for key, value in _query_cache.items()
-        if current_time - value.get('timestamp', 0) >= 300
-    ]
-    for key in expired_keys:
-        del _query_cache[key]
-    if expired_keys:
-        logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+    expired = _response_cache.purge_expired() + _embedding_cache.purge_expired()
+    if expired:
+        logger.info(f"Cleaned up {expired} expired cache entries")
+
+
+async def _sweep_caches_periodically():
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        try:
+            _cleanup_expired_cache()
+        except Exception as e:
+            logger.warning(f"Cache sweep failed: {e}")
+
+
+_cache_sweeper: Optional[asyncio.Task] = None
 
 
 async def _preload_models_async():
@@ -275,52 +557,224 @@ def _preload_models():
     _ensure_models_available()
 
 
-def _preload_common_indexes():
-    """Preload frequently used indexes on startup for all supported languages"""
-    try:
-        for lang in SUPPORTED_LANGS:
-            logger.info(f"Preloading common indexes for language: {lang} ...")
-            for dataset in DATASETS:
-                try:
-                    _load_index(lang, dataset)
-                    logger.info(f"Successfully preloaded {lang} {dataset} index")
-                except Exception as e:
-                    logger.warning(f"Failed to preload index for {lang} / {dataset}: {e}")
-    except Exception as e:
-        logger.warning(f"Failed to preload indexes: {e}")
-
-
 def _load_index(lang: str, dataset: str = "BNS"):
     """Lazy-load semantic embeddings artifacts for a language and dataset."""
     key = f"{lang}_{dataset}"
     if key in _indexes:
         return
+    with _index_lock(key):
+        if key not in _indexes:
+            with _registry.track(f"index:{lang}/{dataset}") as component:
+                _load_index_locked(lang, dataset)
+                component.memory_bytes = estimate_nbytes(_indexes[key])
+
+
+def _migrate_legacy_index(lang_dir: Path, lang: str, dataset: str) -> Dict[str, Any]:
+    """One-time in-place conversion of a legacy pickle index; the pickles stay in use only if it can't be written."""
+    logger.warning(f"LEGACY INDEX: {lang}/{dataset} is in the pickle format; converting it in place to the "
+                   f"memory-mapped format (one-time). Re-run ingest_data.py for section-level chunks.")
+    try:
+        migrate_legacy_index(lang_dir, extra={"lang": lang, "law": dataset})
+    except OSError as e:
+        logger.error(f"LEGACY INDEX: could not convert {lang}/{dataset} ({e}); loading the pickles into memory, "
+                     f"which repeats on every start until the index is rebuilt")
+        return load_legacy_index(lang_dir)
+    return open_index(lang_dir)
+
+
+def _load_index_locked(lang: str, dataset: str):
+    key = f"{lang}_{dataset}"
 
     lang_dir = INDEX_DIR / lang / dataset
     if not lang_dir.exists():
         raise HTTPException(status_code=400, detail=f"Language index not found: {lang} dataset: {dataset}")
 
     try:
-        with open(lang_dir / "texts.pkl", "rb") as f:
-            texts = pickle.load(f)
-        with open(lang_dir / "meta.pkl", "rb") as f:
-            metas = pickle.load(f)
-        embeddings = np.load(lang_dir / "embeddings.npy")
+        if read_manifest(lang_dir) is None:
+            store = _migrate_legacy_index(lang_dir, lang, dataset)
+        else:
+            # Memory-mapped format: O(1) open, pages shared between workers
+            store = open_index(lang_dir)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load index artifacts for {lang} dataset {dataset}: {e}")
 
-    _ensure_models_available()
+    try:
+        store["bm25"] = load_or_build_bm25(lang_dir, store["texts"], lang)
+    except Exception as e:
+        logger.warning(f"Lexical index unavailable for {lang}/{dataset}: {e}")
+        store["bm25"] = None
+
+    _indexes[key] = store
+    centroid = store.get("centroid")
+    _router.set_centroid(lang, dataset, centroid if centroid is not None else compute_centroid(store["embeddings"]))
+
+
+def _load_language_index(lang: str) -> Dict[str, Any]:
+    """Build (once) a single L2-normalized embedding matrix covering every dataset of a language.
+
+    Rows are the datasets' rows in DATASETS order; ``dataset_ids`` holds the
+    DATASETS position of each row and ``offsets`` the first row of each store.
+    With the brute backend ``index`` searches one stacked matrix; ANN backends
+    search one persisted index per dataset in the same row space.
+    """
+    if lang in _lang_indexes:
+        return _lang_indexes[lang]
+    with _index_lock(f"lang:{lang}"):
+        if lang not in _lang_indexes:
+            with _registry.track(f"lang_index:{lang}") as component:
+                _build_language_index(lang)
+                component.memory_bytes = estimate_nbytes(_lang_indexes[lang]["index"])
+            _refresh_cache_namespace()
+    return _lang_indexes[lang]
+
+
+def _build_language_index(lang: str):
+    stores = []
+    blocks = []
+    dataset_ids = []
+    for dataset_id, dataset in enumerate(DATASETS):
+        try:
+            _load_index(lang, dataset)
+        except HTTPException as e:
+            logger.warning(f"Skipping {lang}/{dataset} in unified index: {e.detail}")
+            continue
+        store = _indexes[f"{lang}_{dataset}"]
+        if len(store["embeddings"]) == 0:
+            continue
+        stores.append((dataset, store))
+        blocks.append(store["embeddings"])
+        dataset_ids.append(np.full(len(store["embeddings"]), dataset_id, dtype=np.int8))
 
-    _indexes[key] = {
-        "embeddings": embeddings,
-        "texts": texts,
-        "metas": metas,
+    if not blocks:
+        raise HTTPException(status_code=500, detail=f"No embeddings found for language {lang}")
+
+    offsets = np.cumsum([0] + [len(b) for b in blocks])
+    if VECTOR_BACKEND == "brute":
+        shared = _shared_language_matrix(lang, [(dataset, len(store["embeddings"])) for dataset, store in stores])
+        if shared is not None:
+            vector_index = ShardedIndex([(0, BruteForceIndex(shared, normalized=True), np.concatenate(dataset_ids))])
+        else:
+            vector_index = ShardedIndex([(0, BruteForceIndex(np.concatenate(blocks)), np.concatenate(dataset_ids))])
+    else:
+        vector_index = ShardedIndex([
+            (int(offset), load_vector_index(VECTOR_BACKEND, INDEX_DIR / lang / dataset, store["embeddings"],
+                                            ef_search=HNSW_EF_SEARCH, max_k=HYBRID_CANDIDATES), ids)
+            for (dataset, store), offset, ids in zip(stores, offsets, dataset_ids)
+        ])
+
+    _lang_indexes[lang] = {
+        "index": vector_index,
+        "references": build_reference_index(stores),
+        # Language-independent chunk id -> row, to align hits across languages
+        "chunk_rows": {
+            _chunk_key(dataset, meta): int(offset) + row
+            for (dataset, store), offset in zip(stores, offsets)
+            for row, meta in enumerate(store["metas"])
+            if isinstance(meta, dict)
+        },
+        "lexical": [
+            (int(offset), store["bm25"], DATASETS.index(dataset))
+            for (dataset, store), offset in zip(stores, offsets)
+            if store.get("bm25") is not None
+        ],
+        "dataset_ids": np.concatenate(dataset_ids),
+        "offsets": offsets,
+        "stores": stores,
+        # Chunk ids only align across languages when every store has section-level chunks
+        "section_level": all(is_section_level(store.get("manifest")) for _, store in stores),
     }
+    logger.info(f"Unified {lang} index ({VECTOR_BACKEND}): {len(_lang_indexes[lang]['dataset_ids'])} rows across {[d for d, _ in stores]}")
+
+
+def _shared_language_matrix(lang: str, layout: List[Tuple[str, int]]) -> Optional[np.ndarray]:
+    """The model server's normalized matrix for ``lang`` when it matches this worker's stores"""
+    if _model_client is None:
+        return None
+    try:
+        shared = _model_client.shared_matrix(lang)
+    except Exception as e:
+        logger.warning(f"Shared {lang} matrix unavailable, building a local copy: {e}")
+        return None
+    if shared is None:
+        return None
+    matrix, server_layout = shared
+    if server_layout != layout:
+        logger.warning(f"Model server {lang} matrix layout {server_layout} differs from {layout}; building a local copy")
+        return None
+    return matrix
+
+
+def _chunk_key(dataset: str, meta: Dict) -> str:
+    """Id shared by the same chunk in every language: the ingest id (law, chapter, section, part),
+    or law and chapter for legacy chapter-level records"""
+    return meta.get("id") or f"{dataset}_ch{meta.get('chapter_no')}"
+
+
+def _aligned_meta(dataset: str, meta: Dict, lang: str) -> Optional[Dict]:
+    """The counterpart of a chunk in another language's index, if that index has it."""
+    try:
+        lang_index = _load_language_index(lang)
+    except HTTPException:
+        return None
+    row = lang_index["chunk_rows"].get(_chunk_key(dataset, meta))
+    return None if row is None else _lang_index_meta(lang_index, row)[1]
+
+
+def _lexical_search(lang_index: Dict[str, Any], query: str, k: int,
+                    dataset_id: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """BM25 top-k over all datasets of a language, in the unified row space."""
+    rows = []
+    scores = []
+    for offset, bm25, shard_dataset_id in lang_index["lexical"]:
+        if dataset_id is not None and shard_dataset_id != dataset_id:
+            continue
+        ids, shard_scores = bm25.search(query, k)
+        rows.append(ids + offset)
+        scores.append(shard_scores)
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    rows = np.concatenate(rows)
+    scores = np.concatenate(scores)
+    order = np.argsort(-scores, kind="stable")[:k]
+    return rows[order], scores[order]
+
+
+def _hybrid_search(lang_index: Dict[str, Any], query_embedding: np.ndarray, query: str,
+                   dataset_id: Optional[int] = None) -> Tuple[List[Tuple[int, float]], Dict[int, float], Dict[int, float]]:
+    """Dense top-k fused with BM25 top-k by reciprocal rank.
+
+    Returns the fused (row, score) ranking plus the dense and BM25 score of each candidate row.
+    """
+    dense_rows, dense_scores = lang_index["index"].search(
+        query_embedding, HYBRID_CANDIDATES, threshold=SIMILARITY_THRESHOLD, dataset_id=dataset_id,
+    )
+    lexical_rows, lexical_scores = _lexical_search(lang_index, query, HYBRID_CANDIDATES, dataset_id)
+    fused = reciprocal_rank_fusion([dense_rows.tolist(), lexical_rows.tolist()])
+    return (
+        fused,
+        dict(zip(dense_rows.tolist(), dense_scores.tolist())),
+        dict(zip(lexical_rows.tolist(), lexical_scores.tolist())),
+    )
+
+
+def _lang_index_meta(lang_index: Dict[str, Any], row: int) -> Tuple[str, Dict]:
+    """Map a row of the unified matrix back to (dataset, chunk meta)."""
+    pos = int(np.searchsorted(lang_index["offsets"], row, side="right")) - 1
+    dataset, store = lang_index["stores"][pos]
+    return dataset, store["metas"][row - int(lang_index["offsets"][pos])]
 
 
 def _extract_text_from_meta(meta: Dict) -> str:
     """Extract actual text content from metadata for QA context"""
-    if not meta or 'sections' not in meta:
+    if not meta:
+        return ""
+
+    # Section-level chunk records carry their own text
+    if meta.get('text'):
+        return meta['text']
+
+    # Legacy chapter-level records: join all section texts
+    if 'sections' not in meta:
         return ""
 
     texts = []
@@ -331,11 +785,145 @@ def _extract_text_from_meta(meta: Dict) -> str:
     return ' '.join(texts)
 
 
+def _section_no_from_meta(meta: Dict) -> str:
+    """Section number of a chunk record (or first section of a legacy chapter record)"""
+    if meta.get('section_no'):
+        return str(meta['section_no'])
+    for sec in meta.get('sections') or []:
+        if sec.get('section_no'):
+            return str(sec['section_no'])
+    return ""
+
+
+def _build_reference(m: Dict, source: str, score: float, bm25: float = 0.0,
+                     section_no: Optional[int] = None) -> Dict[str, Any]:
+    """Reference entry for a retrieved chunk, as shown under the answer in the client"""
+    # Get source from metadata as backup
+    meta_source_i = m.get("source", "")
+    if meta_source_i and meta_source_i in DATASETS:
+        source = meta_source_i
+
+    # Extract section number for this specific reference
+    ref_section_no = str(section_no) if section_no is not None else _section_no_from_meta(m)
+
+    # Extract chapter number from ID or construct it
+    chapter_no = ""
+    ref_id = m.get("id", "")
+
+    if ref_id:
+        id_parts = ref_id.split("_ch")
+        if len(id_parts) > 1:
+            chapter_no = id_parts[1].split("_sec")[0]
+    else:
+        # If no ID, try to construct one from available data
+        # Look for chapter info in the meta
+        if m.get("chapter_title"):
+            # Try to extract chapter number from title or other fields
+            pass  # For now, leave empty and let frontend handle
+
+    # If still no chapter, try to extract from the text or other meta fields
+    if not chapter_no and m.get("chapter_no"):
+        chapter_no = str(m["chapter_no"])
+
+    # Construct ID if missing
+    if not ref_id and ref_section_no:
+        ref_id = f"{source}_ch{chapter_no}_sec{ref_section_no}"
+
+    return {
+        "id": ref_id,
+        "title": m.get("title", ""),
+        "section": ref_section_no,  # Use section_no specific to this reference
+        "source": source,
+        "source_name": DATASET_NAMES.get(source, source),
+        "type": m.get("type", ""),
+        "score": round(float(score), 4),
+        "bm25": round(float(bm25), 4),
+        "chapter": chapter_no,
+    }
+
+
+def _section_text_from_meta(meta: Dict, section_no: int) -> str:
+    """Text of one section from a chunk record (or from a legacy chapter record)"""
+    if meta.get('text'):
+        return meta['text']
+    for sec in meta.get('sections') or []:
+        if str(sec.get('section_no')) == str(section_no):
+            return sec.get('text', '')
+    return ""
+
+
+def _reference_lookup_response(query: str, lang: str, dataset_filter: Optional[str] = None) -> Optional[SearchResponse]:
+    """Answer "Section 103 of BNS" / "धारा 64" / "chapter 5 of BSA" straight from the index.
+
+    No translation, embedding or QA is involved: the parsed (law, number) is
+    looked up in the reference index built when the language index loaded.
+    Returns None when the query names no section/chapter, it does not exist,
+    or it names a law other than the request's dataset filter (the query then
+    goes through filtered retrieval instead).
+    """
+    reference = parse_reference(query)
+    if reference is None:
+        return None
+    if dataset_filter and reference["law"] and reference["law"] != dataset_filter:
+        return None
+
+    lang_index = _load_language_index(lang)
+    stores = dict(lang_index["stores"])
+    number = reference["number"]
+    laws = [reference["law"] or dataset_filter] if reference["law"] or dataset_filter else DATASETS
+    section_label = SECTION_LABELS.get(lang, SECTION_LABELS["en"])
+
+    if reference["kind"] == "section":
+        matches = [law for law in laws if (law, number) in lang_index["references"]["sections"]]
+        if not matches:
+            return None
+        law = matches[0]
+        entries = lang_index["references"]["sections"][(law, number)]
+        metas = [stores[dataset]["metas"][row] for dataset, row, _ in entries]
+        meta0 = metas[0]
+        text = "\n".join(_section_text_from_meta(m, number) for m in metas)
+        chapter_title = (meta0.get("chapter_title") or "").strip()
+        title = f"{chapter_title} - {section_label} {number} ({law})" if chapter_title else f"{section_label} {number} ({law})"
+        explanation = f"{section_label} {number}, {DATASET_NAMES.get(law, law)}:\n\n{text}"
+        # The same section number in the other codes, when the query did not name one
+        refs = [_build_reference(meta0, law, 1.0, section_no=number)] + [
+            _build_reference(stores[other]["metas"][lang_index["references"]["sections"][(other, number)][0][1]], other, 0.0,
+                             section_no=number)
+            for other in matches[1:]
+        ]
+    else:
+        law = next((law for law in laws if (law, number) in lang_index["references"]["chapters"]), None)
+        if law is None:
+            return None
+        section_numbers = lang_index["references"]["chapters"][(law, number)]
+        first_rows = [lang_index["references"]["sections"][(law, n)][0] for n in section_numbers]
+        metas = [stores[dataset]["metas"][row] for dataset, row, _ in first_rows]
+        chapter_title = (metas[0].get("chapter_title") or "").strip()
+        chapter_label = CHAPTER_LABELS.get(lang, CHAPTER_LABELS["en"])
+        title = f"{chapter_label} {number}: {chapter_title} ({law})" if chapter_title else f"{chapter_label} {number} ({law})"
+        lines = [
+            f"{section_label} {n}: {_section_text_from_meta(m, n)[:120].strip()}..."
+            for n, m in zip(section_numbers, metas)
+        ]
+        explanation = f"{title}\n\n" + "\n".join(lines)
+        refs = [_build_reference(m, law, 1.0, section_no=n) for n, m in zip(section_numbers, metas)]
+
+    return SearchResponse(
+        language=lang,
+        title=title,
+        explanation=explanation,
+        penalties=[],
+        references=refs,
+        disclaimer=DISCLAIMERS.get(lang, DISCLAIMERS["en"]),
+        source_code=law,
+        source_name=DATASET_NAMES.get(law, law),
+    )
+
+
 async def _extract_answer_from_multiple_docs_async(question: str, docs: List[str], metas: List[Dict], lang: str) -> Dict[str, Any]:
-    """Async version: Extract answer from multiple documents with validation - optimized for performance and quality"""
+    """Extract the best answer across all candidate documents with a single batched QA pass"""
     logger.info(f"Extracting answer for question: '{question}' from {len(metas)} documents")
 
-    # Use top 2 documents for better performance
     if not metas:
         logger.warning("No metadata provided for answer extraction")
         return {
@@ -346,10 +934,10 @@ async def _extract_answer_from_multiple_docs_async(question: str, docs: List[str
             'context': ""
         }
 
-    # Process up to 2 documents asynchronously
-    tasks = []
-    for i in range(min(2, len(metas))):
-        meta = metas[i]
+    # Build every (question, context) pair up front
+    doc_indices = []
+    pairs = []
+    for i, meta in enumerate(metas):
         qa_context = _extract_text_from_meta(meta)
 
         # Skip if no text content
@@ -357,29 +945,35 @@ async def _extract_answer_from_multiple_docs_async(question: str, docs: List[str
             logger.warning(f"Document {i}: No text content found in metadata")
             continue
 
-        # Use optimized context length for better performance
-        qa_context = qa_context[:1200]
-        logger.debug(f"Document {i}: Context length {len(qa_context)}, first 100 chars: {qa_context[:100]}")
-
-        # Create async task for QA processing
-        task = asyncio.get_event_loop().run_in_executor(
-            None, _process_qa_for_doc, question, qa_context, i, meta
-        )
-        tasks.append(task)
+        doc_indices.append(i)
+        pairs.append((question, qa_context[:QA_CONTEXT_CHARS]))
 
-    # Wait for all QA tasks to complete
-    qa_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # One forward pass scores every candidate (shared with concurrent requests by the QA batcher)
+    qa_results = []
+    if pairs:
+        try:
+            qa_results = await _qa_batcher.submit(pairs)
+        except InferenceQueueFull:
+            raise
+        except Exception as e:
+            logger.warning(f"QA failed for {len(pairs)} documents: {e}")
 
     answers = []
-    for result in qa_results:
-        if isinstance(result, Exception):
-            logger.warning(f"QA task failed: {result}")
-            continue
+    for doc_index, (_, qa_context), qa_result in zip(doc_indices, pairs, qa_results):
+        answer = qa_result['answer'].strip()
+        confidence = qa_result['score']
+        logger.info(f"Document {doc_index}: QA result - answer: '{answer[:50]}...', confidence: {confidence:.3f}")
 
-        if result and result['confidence'] >= QA_CONFIDENCE_THRESHOLD and len(result['answer']) > 3:
-            answers.append(result)
+        if confidence >= QA_CONFIDENCE_THRESHOLD and len(answer) > 3:
+            answers.append({
+                'answer': answer,
+                'confidence': confidence,
+                'doc_index': doc_index,
+                'meta': metas[doc_index],
+                'context': qa_context[:300] + "..." if len(qa_context) > 300 else qa_context
+            })
         else:
-            logger.warning(f"Answer rejected - confidence {result['confidence']:.3f} < {QA_CONFIDENCE_THRESHOLD} or answer too short")
+            logger.warning(f"Answer rejected - confidence {confidence:.3f} < {QA_CONFIDENCE_THRESHOLD} or answer too short")
 
     if answers:
         # Sort by confidence and return best answer
@@ -401,116 +995,131 @@ async def _extract_answer_from_multiple_docs_async(question: str, docs: List[str
         }
 
 
-def _process_qa_for_doc(question: str, qa_context: str, doc_index: int, meta: Dict) -> Dict[str, Any]:
-    """Process QA for a single document"""
-    try:
-        qa_result = _qa_pipeline(question=question, context=qa_context)
-        answer = qa_result['answer'].strip()
-        confidence = qa_result['score']
+CLAUSE_MARKER = re.compile(r"^\s*\(([0-9०-९]+)\)", re.MULTILINE)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[।॥.;:])\s+|\n+")
 
-        logger.info(f"Document {doc_index}: QA result - answer: '{answer[:50]}...', confidence: {confidence:.3f}")
 
-        return {
-            'answer': answer,
-            'confidence': confidence,
-            'doc_index': doc_index,
-            'meta': meta,
-            'context': qa_context[:300] + "..." if len(qa_context) > 300 else qa_context
-        }
-    except Exception as e:
-        logger.warning(f"QA failed for doc {doc_index}: {e}")
-        return None
+def _clause_markers(text: str) -> List[Tuple[int, int]]:
+    """(clause number, start offset) of each numbered sub-clause marker in a section text"""
+    return [(int(m.group(1).translate(DEVANAGARI_DIGITS)), m.start()) for m in CLAUSE_MARKER.finditer(text)]
 
 
-def _extract_answer_from_multiple_docs_old(question: str, docs: List[str], metas: List[Dict], lang: str) -> Dict[str, Any]:
-    """Extract answer from multiple documents with validation"""
-    answers = []
+def _native_clause(answer: str, english_text: str, native_text: str) -> str:
+    """Map an answer span of an English chunk to the same numbered clause of its hi/ne counterpart"""
+    position = english_text.find(answer)
+    number = None
+    for clause_no, start in _clause_markers(english_text):
+        if position < 0 or start > position:
+            break
+        number = clause_no
 
-    for i, (doc_text, meta) in enumerate(zip(docs, metas)):
-        try:
-            # Extract actual text content from metadata for QA context
-            qa_context = _extract_text_from_meta(meta)
-
-            # Skip if no text content
-            if not qa_context.strip():
-                continue
-
-            # Get QA result for this document
-            qa_result = _qa_pipeline(question=question, context=qa_context)
-            answer = qa_result['answer'].strip()
-            confidence = qa_result['score']
-
-            if confidence >= QA_CONFIDENCE_THRESHOLD and len(answer) > 3:
-                answers.append({
-                    'answer': answer,
-                    'confidence': confidence,
-                    'doc_index': i,
-                    'meta': meta,
-                    'context': qa_context[:200] + "..." if len(qa_context) > 200 else qa_context
-                })
-        except Exception as e:
-            logger.warning(f"QA failed for doc {i}: {e}")
-            continue
-
-    if not answers:
-        # Fallback: try to extract text from first meta
-        best_context = _extract_text_from_meta(metas[0] if metas else {})
-        return {
-            'answer': best_context[:800] + "..." if len(best_context) > 800 else best_context,
-            'confidence': 0.0,
-            'doc_index': 0,
-            'meta': metas[0] if metas else {},
-            'context': best_context
-        }
-
-    # Sort by confidence and select best answer
-    answers.sort(key=lambda x: x['confidence'], reverse=True)
-    best_answer = answers[0]
-
-    # Cross-validate with other high-confidence answers
-    if len(answers) > 1:
-        # Check if multiple documents agree on similar answers
-        top_answers = answers[:3]  # Check top 3
-        similar_answers = []
-        for ans in top_answers:
-            # Simple similarity check (could be improved with embeddings)
-            if _answers_similar(best_answer['answer'], ans['answer']):
-                similar_answers.append(ans)
-
-        if len(similar_answers) >= 2:
-            # Multiple documents agree, higher confidence
-            best_answer['confidence'] = min(1.0, best_answer['confidence'] * 1.2)
+    markers = _clause_markers(native_text)
+    for i, (clause_no, start) in enumerate(markers):
+        if clause_no == number:
+            end = markers[i + 1][1] if i + 1 < len(markers) else len(native_text)
+            return native_text[start:end].strip()
+    return native_text[:600] + "..." if len(native_text) > 600 else native_text
 
-    return best_answer
 
+_alignment_disabled_langs: set = set()
 
-def _answers_similar(ans1: str, ans2: str) -> bool:
-    """Check if two answers are similar (simple implementation)"""
-    # Normalize and compare
-    a1 = re.sub(r'[^\w\s\u0900-\u097F]', '', ans1.lower())
-    a2 = re.sub(r'[^\w\s\u0900-\u097F]', '', ans2.lower())
 
-    # Remove common stopwords
-    stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'shall', 'be', 'with', 'to', 'for', 'of', 'and', 'or'}
-    a1_words = set(a1.split()) - stopwords
-    a2_words = set(a2.split()) - stopwords
+def _native_alignment_ready(lang: str) -> bool:
+    """Native QA maps answers between the English and the hi/ne chunk of the same section.
 
-    if not a1_words or not a2_words:
-        return False
-
-    # Check overlap
-    overlap = len(a1_words & a2_words)
-    total = len(a1_words | a2_words)
-
-    return overlap / total >= 0.5 if total > 0 else False
+    Legacy chapter-level indexes can't be aligned that way: chapter numbering
+    differs between the translations and clause numbers repeat across sections.
+    For them native QA is disabled (with one error per language) in favour of
+    the extractive answer.
+    """
+    try:
+        levels = {index_lang: _load_language_index(index_lang)["section_level"] for index_lang in (lang, "en")}
+    except HTTPException as e:
+        levels = {"en": False}
+        logger.warning(f"No English index to align {lang} answers with: {e.detail}")
+    if all(levels.values()):
+        return True
+    if lang not in _alignment_disabled_langs:
+        _alignment_disabled_langs.add(lang)
+        legacy = [index_lang for index_lang, section_level in levels.items() if not section_level]
+        logger.error(f"NATIVE QA DISABLED for {lang}: the {legacy} indexes are not section-level, so their chunks "
+                     f"can't be aligned across languages; answering with the extractive sentence instead. "
+                     f"Re-run ingest_data.py to build section-level indexes.")
+    return False
+
+
+def _align_hits_to_english(hits: List[Tuple[str, Dict]]) -> List[Dict]:
+    """English counterpart of each native hit (the native chunk itself where there is none)"""
+    return [_aligned_meta(dataset, meta, "en") or meta for dataset, meta in hits]
+
+
+async def _answer_native_query(query: str, query_embedding: np.ndarray, hits: List[Tuple[str, Dict]],
+                               lang: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Answer a hi/ne query from native-language hits; the answer is taken from the native text.
+
+    Retrieval used the native query embedding. The QA model only reads English,
+    so it gets the translated question over the aligned English chunks; with no
+    translation backend, without section-level indexes (or in extractive mode)
+    the best native sentence is selected by embedding instead.
+    """
+    if NATIVE_ANSWER_MODE == "extractive" or not await _inference.run("align", _native_alignment_ready, lang, timings=timings):
+        return await _extract_native_sentence(query_embedding, hits, timings)
+
+    question = await _translation_executor.run("translate", _translate_query_if_needed, query, lang, timings=timings)
+    if is_in_language_script(question, lang):
+        logger.info(f"No English translation of the {lang} query for QA; using the extractive answer")
+        return await _extract_native_sentence(query_embedding, hits, timings)
+
+    english_metas = await _inference.run("align", _align_hits_to_english, hits, timings=timings)
+    result = await _extract_answer_from_multiple_docs_async(question, [], english_metas, lang)
+
+    native_meta = hits[result['doc_index']][1]
+    native_text = _extract_text_from_meta(native_meta)
+    if result['confidence'] <= 0.0:
+        # QA fallback snippet: show the native text instead of the English one
+        result['answer'] = native_text[:600] + "..." if len(native_text) > 600 else native_text
+    elif english_metas[result['doc_index']] is not native_meta:
+        result['answer'] = _native_clause(result['answer'], _extract_text_from_meta(english_metas[result['doc_index']]), native_text)
+    result['meta'] = native_meta
+    return result
+
+
+async def _extract_native_sentence(query_embedding: np.ndarray, hits: List[Tuple[str, Dict]],
+                                   timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Extractive answer: the sentence of the native hits closest to the query embedding"""
+    candidates = [
+        (i, sentence.strip())
+        for i, (_, meta) in enumerate(hits)
+        for sentence in SENTENCE_BOUNDARY.split(_extract_text_from_meta(meta))
+        if len(sentence.split()) > 3
+    ]
+    if not candidates:
+        meta = hits[0][1] if hits else {}
+        text = _extract_text_from_meta(meta)
+        return {'answer': text[:600], 'confidence': 0.0, 'doc_index': 0, 'meta': meta, 'context': text}
+
+    embeddings = np.asarray(await _inference.run("extract", _encode_batch, [sentence for _, sentence in candidates], timings=timings))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+    scores = embeddings @ (query_embedding / (np.linalg.norm(query_embedding) + 1e-12))
+    best = int(np.argmax(scores))
+    doc_index, sentence = candidates[best]
+    context = _extract_text_from_meta(hits[doc_index][1])
+    logger.info(f"Native extractive answer from doc {doc_index} with similarity {scores[best]:.3f}")
+    return {
+        'answer': sentence,
+        'confidence': float(scores[best]),
+        'doc_index': doc_index,
+        'meta': hits[doc_index][1],
+        'context': context[:300] + "..." if len(context) > 300 else context
+    }
 
 
 def _translate_query_if_needed(query: str, lang: str) -> str:
     """Translate Hindi/Nepali queries to English for better processing"""
-    if lang in ['hi', 'ne'] and _translator is not None:
+    if lang in ['hi', 'ne'] and _translation is not None:
         try:
             logger.info(f"Translating query from {lang} to English: '{query}'")
-            translated = _translator.translate(query, src=lang, dest='en').text
+            translated = _translation.translate(query, src=lang, dest='en')
             logger.info(f"Translated query: '{translated}'")
             return translated
         except Exception as e:
@@ -521,10 +1130,13 @@ def _translate_query_if_needed(query: str, lang: str) -> str:
 
 def _translate_answer_if_needed(answer: str, lang: str) -> str:
     """Translate answer back to user's language if needed"""
-    if lang in ['hi', 'ne'] and _translator is not None:
+    # Answers extracted from the hi/ne section texts are already in the user's language
+    if is_in_language_script(answer, lang):
+        return answer
+    if lang in ['hi', 'ne'] and _translation is not None:
         try:
             logger.info(f"Translating answer back to {lang}: '{answer[:50]}...'")
-            translated = _translator.translate(answer, src='en', dest=lang).text
+            translated = _translation.translate(answer, src='en', dest=lang)
             logger.info(f"Translated answer: '{translated[:50]}...'")
             return translated
         except Exception as e:
@@ -533,43 +1145,46 @@ def _translate_answer_if_needed(answer: str, lang: str) -> str:
     return answer
 
 
+def _determine_best_dataset(query: str, lang: str, query_embedding: np.ndarray,
+                            query_lang: str = "en") -> Tuple[str, Dict[str, float]]:
+    """Determine the most relevant dataset using precomputed dataset representatives.
 
-
-
-def _determine_best_dataset(query: str, lang: str) -> str:
-    """Determine the most relevant dataset using semantic similarity with dataset representatives"""
+    Returns the best dataset and the routing score of every dataset. ``query_lang``
+    is the language the query text is in (English unless native retrieval is on).
+    """
     try:
-        # Check embedding cache first
-        cached_embedding = _get_cached_embedding(query, lang)
-        if cached_embedding is not None:
-            query_embedding = cached_embedding
-        else:
-            # Encode the query
-            query_embedding = _sentence_model.encode([query])[0]
-            _cache_embedding(query, lang, query_embedding)
-
-        # Enhanced dataset representative descriptions for better semantic matching
-        dataset_descriptions = {
-            "BNS": "criminal offenses punishments penalties murder theft assault rape kidnapping robbery human trafficking crimes legal sections Bharatiya Nyaya Sanhita",
-            "BSA": "evidence witness testimony documents proof admission confession expert court trial Bharatiya Sakshya Adhiniyam",
-            "BNSS": "criminal procedure investigation police arrest bail summons warrant search seizure fir complaint registration appeal Bharatiya Nagarik Suraksha Sanhita"
-        }
-
-        # Compute similarities with each dataset representative
-        similarities = {}
-        for dataset, description in dataset_descriptions.items():
-            desc_embedding = _sentence_model.encode([description])[0]
-            similarity = cosine_similarity([query_embedding], [desc_embedding])[0][0]
-            similarities[dataset] = similarity
+        # Description embeddings are computed once; centroids register as indexes load
+        if not _router.ready:
+            _router.fit_descriptions(_sentence_model)
+        for dataset in DATASETS:
+            try:
+                _load_index(lang, dataset)
+            except HTTPException as e:
+                logger.warning(f"Router could not load {lang}/{dataset}: {e.detail}")
 
-        # Return the dataset with highest semantic similarity
-        best_dataset = max(similarities, key=similarities.get)
+        best_dataset, similarities = _router.route(query_embedding, lang)
         logger.info(f"Query: '{query}' -> Best dataset: {best_dataset} (similarities: {similarities})")
-        return best_dataset
+        return best_dataset, similarities
 
     except Exception as e:
-        logger.warning(f"Semantic dataset selection failed: {e}, falling back to keyword-based selection")
-        # Fallback to keyword-based selection
+        logger.warning(f"Semantic dataset selection failed: {e}, falling back to lexical selection")
+
+        # Fallback 1: best BM25 score per dataset, over the index in the query's language
+        try:
+            query_index = _load_language_index(query_lang)
+            scores = {d: 0.0 for d in DATASETS}
+            for _, bm25, dataset_id in query_index["lexical"]:
+                shard_scores = bm25.scores(query)
+                if len(shard_scores):
+                    scores[DATASETS[dataset_id]] = round(float(shard_scores.max()), 4)
+            if any(scores.values()):
+                best_dataset = max(scores, key=scores.get)
+                logger.info(f"Lexical selection: '{query}' -> Best dataset: {best_dataset} (scores: {scores})")
+                return best_dataset, scores
+        except Exception as e2:
+            logger.warning(f"Lexical dataset selection failed: {e2}")
+
+        # Fallback 2: keyword-based selection
         query_lower = query.lower()
 
         # Enhanced keywords for each dataset with multilingual support
@@ -598,15 +1213,72 @@ def _determine_best_dataset(query: str, lang: str) -> str:
         scores = {'BNS': bns_score, 'BSA': bsa_score, 'BNSS': bnss_score}
         best_dataset = max(scores, key=scores.get)
         logger.info(f"Keyword-based selection: '{query}' -> Best dataset: {best_dataset} (scores: {scores})")
-        return best_dataset
+        return best_dataset, {d: float(v) for d, v in scores.items()}
 
 
 # -----------------------
 # Endpoints
 # -----------------------
+@app.exception_handler(InferenceQueueFull)
+async def inference_queue_full_handler(request: Request, exc: InferenceQueueFull):
+    """Backpressure: shed load instead of queueing requests without bound"""
+    logger.warning(f"Rejecting {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.get("/live")
+async def live() -> Dict[str, Any]:
+    """Liveness: the process and its event loop are responsive"""
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 only once the models, language indexes and warm-up are done"""
+    if _registry.ready:
+        return {"status": "ready"}
+    return JSONResponse(status_code=503, content={"status": "not_ready", "components": _registry.not_ready()})
+
+
 @app.get("/health")
 def health() -> Dict[str, Any]:
-    return {"status": "ok", "loaded_langs": list(_indexes.keys()), "model": "multilingual"}
+    return {
+        "status": "ok" if _registry.ready else "degraded",
+        "ready": _registry.ready,
+        "rss_bytes": process_rss_bytes(),
+        "components": _registry.snapshot(),
+        "loaded_langs": list(_indexes.keys()),
+        "model": "multilingual",
+        "inference": _inference.stats(),
+        "batching": {"embed": _embed_batcher.stats(), "qa": _qa_batcher.stats()},
+        "native_answers": {"mode": NATIVE_ANSWER_MODE, "qa_disabled_langs": sorted(_alignment_disabled_langs)},
+        "translation": {
+            "backend": TRANSLATION_BACKEND,
+            "cache": _translation_cache.stats(),
+            "executor": _translation_executor.stats(),
+        },
+        "response_cache": {"namespace": CACHE_NAMESPACE, **_response_cache.stats()},
+        "semantic_cache": _semantic_cache.stats(),
+        "model_server": MODEL_SERVER_SOCKET or None,
+    }
+
+
+@app.get("/cache/stats")
+def cache_stats() -> Dict[str, Any]:
+    """Entries, bytes, hit ratios, evictions and expirations of every cache"""
+    return {
+        "embedding": _embedding_cache.stats(),
+        "response": {"namespace": CACHE_NAMESPACE, **_response_cache.stats()},
+        "semantic": _semantic_cache.stats(),
+        "precomputed": _precomputed_answers.stats(),
+        "translation": _translation_cache.stats(),
+    }
+
+
+@app.get("/startup")
+def startup_timeline() -> Dict[str, Any]:
+    """Per-phase startup timeline: offset, duration and status of every load step"""
+    return _startup.as_dict()
 
 
 @app.get("/langs")
@@ -628,38 +1300,94 @@ async def change_language(request: LanguageChangeRequest):
     return {"status": "success", "language": lang, "message": f"Language changed to {lang}"}
 
 
-@app.post("/chat", response_model=SearchResponse)
-async def chat(request: ChatRequest):
-    """
-    Enhanced multilingual endpoint with improved accuracy and performance optimizations.
+def _request_trace(request: ChatRequest) -> RequestTrace:
+    lang = (request.language or "en").lower()
+    # Unsupported languages share one label, so they can't blow up metric cardinality
+    return RequestTrace(lang if lang in SUPPORTED_LANGS else "other")
 
-    Key improvements:
-    1. Multilingual models (paraphrase-multilingual-mpnet-base-v2 + XLM-RoBERTa)
-    2. Higher similarity threshold (0.3) for better precision
-    3. Multi-document answer extraction and validation
-    4. Cross-document answer agreement checking
-    5. Better Hindi/Nepali text handling
-    6. Query caching and simple query detection for performance
+
+async def _chat_events(request: ChatRequest, trace: Optional[RequestTrace] = None) -> AsyncIterator[Tuple[str, Any]]:
+    """The /chat pipeline as (event, data) stages, yielded as soon as each one finishes:
+    "routing", "references", "answer" and "explanation", always ending with
+    ("response", SearchResponse). Short-circuit paths (reference lookup, greeting,
+    cache hit, no results) yield only the response.
+
+    Stage spans are recorded on ``trace`` and exported to /metrics when the
+    response is ready (or the request fails).
     """
+    trace = trace or _request_trace(request)
+    responded = False
+    try:
+        async for event, data in _chat_stages(request, trace):
+            if event == "response":
+                if trace.dataset == "none" and data.source_code:
+                    trace.dataset = data.source_code
+                responded = True
+                trace.finish(_metrics)
+            yield event, data
+    except GeneratorExit:
+        if not responded:
+            trace.outcome = "cancelled"
+        raise
+    except InferenceQueueFull:
+        trace.outcome = "shed"
+        raise
+    except HTTPException as e:
+        trace.outcome = "rejected" if e.status_code < 500 else "error"
+        raise
+    except Exception:
+        trace.outcome = "error"
+        raise
+    finally:
+        trace.finish(_metrics)
+
+
+async def _chat_stages(request: ChatRequest, trace: RequestTrace) -> AsyncIterator[Tuple[str, Any]]:
     start_time = time.time()
+    timings = trace.timings
     logger.info(f"Processing query: '{request.query}' in language: {request.language}")
 
     lang = (request.language or "en").lower()
     if lang not in SUPPORTED_LANGS:
         raise HTTPException(status_code=400, detail=f"Unsupported language: {lang}")
+    dataset_filter = (request.dataset or "").upper() or None
+    if dataset_filter and dataset_filter not in DATASETS:
+        raise HTTPException(status_code=400, detail=f"Unsupported dataset: {request.dataset}")
+
+    # Canonical question answered at build time: O(1), before any translation or model call
+    precomputed = None if dataset_filter else _precomputed_answers.get(lang, request.query)
+    if precomputed is not None:
+        logger.info(f"Serving precomputed answer for '{request.query}'")
+        trace.outcome = "precomputed"
+        yield "response", SearchResponse(**precomputed)
+        return
 
-    # Translate query if needed for better processing
-    processed_query = _translate_query_if_needed(request.query, lang)
+    # Fast path: explicit section/chapter references are answered by lookup, with no model inference
+    lookup_response = await _inference.run("lookup", _reference_lookup_response, request.query, lang, dataset_filter,
+                                           timings=timings)
+    if lookup_response is not None:
+        logger.info(f"Answered '{request.query}' by direct lookup in {(time.time() - start_time) * 1000:.1f}ms")
+        trace.outcome = "lookup"
+        yield "response", lookup_response
+        return
+
+    # Translate query if needed for better processing; native retrieval searches with the original query
+    native = RETRIEVAL_MODE == "native" and lang != "en"
+    if native:
+        processed_query = request.query
+    else:
+        processed_query = await _translation_executor.run("translate", _translate_query_if_needed, request.query, lang, timings=timings)
 
     # Check for simple queries that don't need heavy processing
     if _is_simple_query(processed_query):
         logger.info(f"Detected simple query: '{processed_query}' - returning quick response")
+        trace.outcome = "greeting"
         greeting_responses = {
             "en": "Hello! I'm your legal assistant. How can I help you with legal questions today?",
             "hi": "नमस्ते! मैं आपका कानूनी सहायक हूं। आज मैं आपकी कानूनी सवालों में कैसे मदद कर सकता हूं?",
             "ne": "नमस्ते! म तपाईको कानुनी सहायक हुँ। आज म तपाईका कानुनी प्रश्नहरूमा कसरी मद्दत गर्न सक्छु?"
         }
-        return SearchResponse(
+        yield "response", SearchResponse(
             language=lang,
             title="Greeting",
             explanation=greeting_responses.get(lang, greeting_responses["en"]),
@@ -669,62 +1397,49 @@ async def chat(request: ChatRequest):
             source_code="",
             source_name="",
         )
+        return
 
     # Check cache first
-    cache_key = _get_cache_key(processed_query, lang)
+    cache_key = _get_cache_key(processed_query, lang, dataset_filter)
     cached_response = _get_cached_response(cache_key)
     if cached_response:
         logger.info(f"Returning cached response for: {cache_key}")
-        return SearchResponse(**cached_response)
+        trace.outcome = "cache"
+        yield "response", SearchResponse(**cached_response)
+        return
 
     # Async preload models on first request for better performance
     await _preload_models_async()
 
-    # Load only the most relevant dataset for the language to optimize performance
-    # Determine best dataset based on processed query
-    best_dataset = _determine_best_dataset(processed_query, lang)
-
-    combined_texts = []
-    combined_metas = []
-    combined_embeddings = []
-    dataset_sources = []  # Track which dataset each text comes from
-
-    # Load only the best dataset instead of all datasets
-    try:
-        _load_index(lang, best_dataset)
-        key = f"{lang}_{best_dataset}"
-        store = _indexes.get(key)
-        if store:
-            combined_texts.extend(store["texts"])
-            combined_metas.extend(store["metas"])
-            combined_embeddings.append(store["embeddings"])
-            # Add dataset source for each text
-            dataset_sources.extend([best_dataset] * len(store["texts"]))
-    except Exception as e:
-        logger.warning(f"Failed to load index for {lang}/{best_dataset}: {e}")
-        # Fallback: try to load any available dataset
-        for dataset in DATASETS:
-            try:
-                _load_index(lang, dataset)
-                key = f"{lang}_{dataset}"
-                store = _indexes.get(key)
-                if store:
-                    combined_texts.extend(store["texts"])
-                    combined_metas.extend(store["metas"])
-                    combined_embeddings.append(store["embeddings"])
-                    dataset_sources.extend([dataset] * len(store["texts"]))
-                    break
-            except Exception as e2:
-                continue
-
-    if not combined_embeddings:
-        raise HTTPException(status_code=500, detail=f"No embeddings found for language {lang}")
-
-    # Stack embeddings vertically
-    combined_embeddings = np.vstack(combined_embeddings)
+    # Embed the processed query; concurrent requests share one forward pass
+    with trace.span("embed"):
+        query_embedding = await _embed_query(processed_query, lang)
+
+    # Paraphrase of an answered query: serve its response
+    semantic_scope = f"{lang}:{dataset_filter or '*'}"
+    if SEMANTIC_CACHE_SIZE > 0:
+        semantic_response = _semantic_cache.lookup(semantic_scope, query_embedding)
+        if semantic_response is not None:
+            logger.info(f"Semantic cache hit for: '{processed_query}'")
+            trace.outcome = "semantic_cache"
+            yield "response", SearchResponse(**semantic_response)
+            return
+
+    # Routing scores are only for debugging; retrieval itself spans all datasets (or the filtered one)
+    best_dataset, routing_scores = dataset_filter, {}
+    if ROUTING_DEBUG and not dataset_filter:
+        best_dataset, routing_scores = await _inference.run(
+            "route", _determine_best_dataset, processed_query, lang, query_embedding,
+            lang if native else "en", timings=timings,
+        )
+    lang_index = await _inference.run("load_index", _load_language_index, lang, timings=timings)
+    if best_dataset:
+        trace.dataset = best_dataset
+    yield "routing", {"query": processed_query, "dataset": best_dataset, "routing_scores": routing_scores}
 
     if not request.query.strip():
-        return SearchResponse(
+        trace.outcome = "empty"
+        yield "response", SearchResponse(
             language=lang,
             title="",
             explanation="",
@@ -734,25 +1449,19 @@ async def chat(request: ChatRequest):
             source_code="",
             source_name="",
         )
+        return
 
-    # Batch embedding optimization: Encode processed query with multilingual model
-    cached_emb = _get_cached_embedding(processed_query, lang)
-    if cached_emb is not None:
-        query_embedding = cached_emb
-        logger.info("Using cached query embedding")
-    else:
-        query_embedding = _sentence_model.encode([processed_query])[0]
-        _cache_embedding(processed_query, lang, query_embedding)
-        logger.info("Generated new query embedding")
-
-    # Optimized similarity computation with batch processing
-    similarities = cosine_similarity([query_embedding], combined_embeddings)[0]
-
-    # Get top-k results for better accuracy
-    ranked = sorted(range(len(similarities)), key=lambda i: -similarities[i])[:TOP_K_RETRIEVAL]
+    # Hybrid retrieval over all datasets of the language: dense top-k (one dot product
+    # with the brute backend, similarity threshold applied in NumPy) fused with BM25
+    # top-k by reciprocal rank. BM25 runs on the original query, which matches the
+    # language of the index it searches.
+    dataset_id = DATASETS.index(dataset_filter) if dataset_filter else None
+    fused, similarities, bm25_scores = await _inference.run(
+        "search", _hybrid_search, lang_index, query_embedding, request.query, dataset_id, timings=timings,
+    )
 
-    # Filter by similarity threshold
-    relevant_indices = [i for i in ranked if similarities[i] >= SIMILARITY_THRESHOLD]
+    relevant_indices = [row for row, _ in fused[:TOP_K_RETRIEVAL]]
+    hits = [_lang_index_meta(lang_index, i) for i in relevant_indices]
 
     if not relevant_indices:
         no_results_msg = {
@@ -760,7 +1469,8 @@ async def chat(request: ChatRequest):
             "hi": "कोई प्रासंगिक परिणाम नहीं मिला। अपना प्रश्न फिर से लिखने का प्रयास करें।",
             "ne": "कुनै प्रासंगिक परिणाम फेला परेन। आफ्नो प्रश्न पुन: लेख्ने प्रयास गर्नुहोस्।"
         }
-        return SearchResponse(
+        trace.outcome = "no_results"
+        yield "response", SearchResponse(
             language=lang,
             title="",
             explanation=no_results_msg.get(lang, no_results_msg["en"]),
@@ -770,45 +1480,50 @@ async def chat(request: ChatRequest):
             source_code="",
             source_name="",
         )
+        return
 
-    # Extract top documents for answer generation (reduced to 3 for optimization)
-    top_docs = [combined_texts[i] for i in relevant_indices[:3]]
-    top_metas = [combined_metas[i] for i in relevant_indices[:3]]
-    top_sources = [dataset_sources[i] for i in relevant_indices[:3]]
+    # References only depend on retrieval, so they go out before QA runs
+    refs = [
+        _build_reference(m, source, similarities.get(i, 0.0), bm25_scores.get(i, 0.0))
+        for i, (source, m) in zip(relevant_indices[:5], hits[:5])  # Show top 5 references
+    ]
+    yield "references", refs
 
-    # Use top documents directly without reranking
-    top_indices = relevant_indices[:2]  # Use top 2 documents
-    top_docs_final = [combined_texts[i] for i in top_indices]
-    top_metas_final = [combined_metas[i] for i in top_indices]
+    # Every top-k candidate goes through QA in one batched pass
+    top_metas_final = [meta for _, meta in hits]
+    top_docs_final = [_extract_text_from_meta(meta) for meta in top_metas_final]
 
     # Get best answer from multiple documents - async optimized version
-    answer_result = await _extract_answer_from_multiple_docs_async(processed_query, top_docs_final, top_metas_final, lang)
+    with trace.span("qa"):
+        if native:
+            answer_result = await _answer_native_query(processed_query, query_embedding, hits, lang, timings)
+        else:
+            answer_result = await _extract_answer_from_multiple_docs_async(processed_query, top_docs_final, top_metas_final, lang)
 
     # Use the best document's metadata for response
-    best_idx = relevant_indices[answer_result['doc_index']]
-    meta0 = combined_metas[best_idx]
-    source_dataset = dataset_sources[best_idx]
+    source_dataset, meta0 = hits[answer_result['doc_index']]
 
     # Get source information from metadata as backup
     meta_source = meta0.get("source", "")
     if meta_source and meta_source in DATASETS:
         source_dataset = meta_source
+    trace.dataset = source_dataset
 
     # Keep source name separate for display
     source_name = DATASET_NAMES.get(source_dataset, source_dataset)
 
-    # Extract section info from the sections array
-    section_no = ""
-    if 'sections' in meta0 and meta0['sections']:
-        # Get the first section that has a section_no
-        for sec in meta0['sections']:
-            if sec.get('section_no'):
-                section_no = str(sec['section_no'])
-                break
+    # Extract section info from the chunk record
+    section_no = _section_no_from_meta(meta0)
 
     # Translate answer back to user's language if needed
     raw_answer = answer_result['answer']
-    translated_answer = _translate_answer_if_needed(raw_answer, lang)
+    yield "answer", {
+        "answer": raw_answer,
+        "confidence": answer_result['confidence'],
+        "source_code": source_dataset,
+        "section": section_no,
+    }
+    translated_answer = await _translation_executor.run("translate_answer", _translate_answer_if_needed, raw_answer, lang, timings=timings)
 
     # Format explanation with better structure like a professional chatbot
     if answer_result['confidence'] >= QA_CONFIDENCE_THRESHOLD:
@@ -864,111 +1579,227 @@ async def chat(request: ChatRequest):
     else:
         title = "Legal Information"
 
-    # Build references
-    refs = []
-    for i in relevant_indices[:5]:  # Show top 5 references
-        m = combined_metas[i]
-        source = dataset_sources[i]
-
-        # Get source from metadata as backup
-        meta_source_i = m.get("source", "")
-        if meta_source_i and meta_source_i in DATASETS:
-            source = meta_source_i
-
-        # Extract section number for this specific reference
-        ref_section_no = ""
-        if 'sections' in m and m['sections']:
-            for sec in m['sections']:
-                if sec.get('section_no'):
-                    ref_section_no = str(sec['section_no'])
-                    break
-
-        # Extract chapter number from ID or construct it
-        chapter_no = ""
-        ref_id = m.get("id", "")
-
-        if ref_id:
-            id_parts = ref_id.split("_ch")
-            if len(id_parts) > 1:
-                chapter_no = id_parts[1].split("_sec")[0]
-        else:
-            # If no ID, try to construct one from available data
-            # Look for chapter info in the meta
-            if m.get("chapter_title"):
-                # Try to extract chapter number from title or other fields
-                pass  # For now, leave empty and let frontend handle
-
-        # If still no chapter, try to extract from the text or other meta fields
-        if not chapter_no and m.get("chapter_no"):
-            chapter_no = str(m["chapter_no"])
-
-        # Construct ID if missing
-        if not ref_id and ref_section_no:
-            ref_id = f"{source}_ch{chapter_no}_sec{ref_section_no}"
-
-        refs.append({
-            "id": ref_id,
-            "title": m.get("title", ""),
-            "section": ref_section_no,  # Use section_no specific to this reference
-            "source": source,
-            "source_name": DATASET_NAMES.get(source, source),
-            "type": m.get("type", ""),
-            "score": round(float(similarities[i]), 4),
-            "chapter": chapter_no,
-        })
-
-    # Multilingual disclaimer
-    disclaimers = {
-        "en": "This is for educational purposes, not legal advice. Please consult a qualified legal professional for actual legal matters.",
-        "hi": "यह शैक्षिक उद्देश्यों के लिए है, कानूनी सलाह नहीं। वास्तविक कानूनी मामलों के लिए कृपया किसी योग्य कानूनी पेशेवर से परामर्श करें।",
-        "ne": "यो शैक्षिक उद्देश्यका लागि हो, कानुनी सल्लाह होइन। वास्तविक कानुनी मामिलाहरूका लागि कृपया योग्य कानुनी व्यावसायीको परामर्श लिनुहोस्।"
-    }
+    penalties = meta0.get("penalties", []) or []
+    yield "explanation", {"title": title, "explanation": explanation, "penalties": penalties}
 
     # Create response object
     response = SearchResponse(
         language=lang,
         title=title,
         explanation=explanation,
-        penalties=meta0.get("penalties", []) or [],
+        penalties=penalties,
         references=refs,
-        disclaimer=disclaimers.get(lang, disclaimers["en"]),
+        disclaimer=DISCLAIMERS.get(lang, DISCLAIMERS["en"]),
         source_code=source_dataset,
         source_name=source_name,
+        routing_scores=routing_scores,
     )
 
     # Cache the response for future identical queries
-    _cache_response(cache_key, response.dict())
+    _cache_response(cache_key, response.model_dump())
+    if SEMANTIC_CACHE_SIZE > 0:
+        _semantic_cache.put(semantic_scope, query_embedding, response.model_dump())
 
     # Log processing time with detailed metrics
     processing_time = time.time() - start_time
     logger.info(f"Query processed in {processing_time:.2f}s: '{request.query}' - Confidence: {answer_result.get('confidence', 0):.3f}, Dataset: {source_dataset}, Lang: {lang}")
+    logger.info(f"Stage timings (ms): {timings}")
+
+    yield "response", response
 
-    return response
+
+@app.post("/chat", response_model=SearchResponse)
+async def chat(request: ChatRequest, response: Response):
+    """
+    Enhanced multilingual endpoint with improved accuracy and performance optimizations.
+
+    Key improvements:
+    1. Multilingual models (paraphrase-multilingual-mpnet-base-v2 + XLM-RoBERTa)
+    2. Higher similarity threshold (0.3) for better precision
+    3. Multi-document answer extraction and validation
+    4. Cross-document answer agreement checking
+    5. Better Hindi/Nepali text handling
+    6. Query caching and simple query detection for performance
+    """
+    trace = _request_trace(request)
+    async for event, data in _chat_events(request, trace):
+        if event == "response":
+            if SERVER_TIMING:
+                response.headers["Server-Timing"] = trace.server_timing()
+            return data
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_error_response(status_code: int, detail: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(
+        _sse("error", {"status_code": status_code, "detail": detail}),
+        status_code=status_code,
+        media_type="text/event-stream",
+        headers=headers,
+    )
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """/chat as Server-Sent Events: `routing`, `references`, `answer` and `explanation`
+    are sent as each stage finishes, then `done` with the full response (or `error`)"""
+    trace = _request_trace(request)
+    events = _chat_events(request, trace)
+    # Errors before the first stage (bad language, queue full) keep their HTTP status,
+    # and the body is still one `error` event so stream clients parse a single format
+    try:
+        first = await events.__anext__()
+    except HTTPException as e:
+        return _sse_error_response(e.status_code, e.detail)
+    except InferenceQueueFull as e:
+        logger.warning(f"Rejecting /chat/stream: {e}")
+        return _sse_error_response(503, str(e), {"Retry-After": "1"})
+
+    async def stream():
+        event, data = first
+        try:
+            while event != "response":
+                yield _sse(event, data)
+                event, data = await events.__anext__()
+            if SERVER_TIMING:
+                # Headers are gone by now, so the stage timings travel as an event
+                yield _sse("timings", {**trace.timings, "total": trace.total_ms})
+            yield _sse("done", data.model_dump())
+        except HTTPException as e:
+            yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+        except InferenceQueueFull as e:
+            yield _sse("error", {"status_code": 503, "detail": str(e)})
+        except Exception as e:
+            logger.exception(f"Streaming /chat failed for '{request.query}'")
+            yield _sse("error", {"status_code": 500, "detail": str(e)})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+def metrics() -> PlainTextResponse:
+    """Prometheus text exposition: stage/request latency histograms, batch sizes,
+    cache hit ratios, inference queue depth and component state"""
+    return PlainTextResponse(_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@_metrics.collector
+def _runtime_metrics():
+    caches = {
+        "embedding": _embedding_cache.stats(),
+        "response_l1": _response_cache.l1.stats(),
+        "semantic": _semantic_cache.stats(),
+        "translation": _translation_cache.stats(),
+        "precomputed": _precomputed_answers.stats(),
+    }
+    if _response_cache.l2 is not None:
+        caches["response_l2"] = _response_cache.l2.stats()
+    executors = {executor.name: executor.stats() for executor in (_inference, _translation_executor)}
+    batchers = {"embed": _embed_batcher, "qa": _qa_batcher}
+    return [
+        ("lexibot_cache_hits_total", "counter", "Cache hits", [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("lexibot_cache_misses_total", "counter", "Cache misses", [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("lexibot_cache_hit_ratio", "gauge", "Cache hits / lookups since start", [
+            ({"cache": name}, stats["hits"] / (stats["hits"] + stats["misses"]) if stats["hits"] + stats["misses"] else 0.0)
+            for name, stats in caches.items()
+        ]),
+        ("lexibot_cache_bytes", "gauge", "Estimated bytes held by a cache", [
+            ({"cache": name}, stats.get("bytes")) for name, stats in caches.items()
+        ]),
+        ("lexibot_inference_pending", "gauge", "Stages running or queued on an executor", [
+            ({"executor": name}, stats["pending"]) for name, stats in executors.items()
+        ]),
+        ("lexibot_inference_capacity", "gauge", "Stages an executor admits before shedding load", [
+            ({"executor": name}, stats["capacity"]) for name, stats in executors.items()
+        ]),
+        ("lexibot_inference_rejected_total", "counter", "Stages rejected with 503 because the queue was full", [
+            ({"executor": name}, stats["rejected"]) for name, stats in executors.items()
+        ]),
+        ("lexibot_batch_queued", "gauge", "Items waiting for the next micro-batch", [
+            ({"batcher": name}, batcher.stats()["queued"]) for name, batcher in batchers.items()
+        ]),
+        ("lexibot_ready", "gauge", "1 once every required component is loaded", [({}, int(_registry.ready))]),
+        ("lexibot_process_resident_memory_bytes", "gauge", "Resident set size of this worker", [({}, process_rss_bytes())]),
+    ]
+
+
+def _warm_up(batch_size: int):
+    """Run one batch through every model and index so the first request doesn't pay
+    for lazy initialisation, allocator growth and kernel selection"""
+    with _registry.track("warmup"):
+        _run_warm_up_batch(batch_size)
+
+
+def _run_warm_up_batch(batch_size: int):
+    queries = (WARMUP_QUERIES * batch_size)[:batch_size]
+    embeddings = _encode_batch(queries)
+    pairs = []
+    for lang in sorted(_lang_indexes):
+        for query, embedding in zip(queries, embeddings):
+            fused, _, _ = _hybrid_search(_lang_indexes[lang], embedding, query)
+            if fused and lang == "en":
+                _, meta = _lang_index_meta(_lang_indexes[lang], fused[0][0])
+                pairs.append((query, _extract_text_from_meta(meta)[:QA_CONTEXT_CHARS]))
+    if pairs:
+        _qa_batch([pairs[:QA_BATCH_SIZE]])
 
 
 # Startup event for preloading
 @app.on_event("startup")
 async def startup_event():
-    """Preload models and common indexes on startup for optimal performance"""
+    """Load models and indexes concurrently, then warm them up; every step is recorded in /startup"""
+    global _cache_sweeper
     logger.info("Starting Legal Advisor Backend with advanced optimizations...")
     start_time = time.time()
+    _cache_sweeper = asyncio.create_task(_sweep_caches_periodically())
+
+    # Models and the per-dataset indexes don't depend on each other
+    phases = {
+        "cache:response": _open_response_cache,
+        "model:embedder": _load_sentence_model,
+        "model:qa": _load_qa_model,
+        "translation": _load_translation,
+    }
     try:
-        # Preload models asynchronously with GPU support
-        await _preload_models_async()
-        model_load_time = time.time() - start_time
-        logger.info(f"Models loaded in {model_load_time:.2f}s")
-
-        # Preload common indexes
-        index_start = time.time()
-        _preload_common_indexes()
-        index_load_time = time.time() - index_start
-        logger.info(f"Indexes loaded in {index_load_time:.2f}s")
-
-        total_time = time.time() - start_time
-        logger.info(f"Startup preloading completed successfully in {total_time:.2f}s")
-    except Exception as e:
-        logger.warning(f"Startup preloading failed: {e}")
-
+        _require_ml_libraries()
+    except HTTPException as e:
+        logger.warning(f"Skipping model preloading: {e.detail}")
+        phases = {"cache:response": _open_response_cache}
+    for lang in sorted(SUPPORTED_LANGS):
+        for dataset in DATASETS:
+            phases[f"index:{lang}/{dataset}"] = functools.partial(_load_index, lang, dataset)
+    await _startup.run_all(phases)
+
+    if ROUTING_DEBUG and _sentence_model is not None:
+        await _startup.run("router", _router.fit_descriptions, _sentence_model)
+    await _startup.run_all({
+        f"lang_index:{lang}": functools.partial(_load_language_index, lang) for lang in sorted(SUPPORTED_LANGS)
+    })
+
+    if WARMUP_BATCH > 0 and _sentence_model is not None and _qa_pipeline is not None:
+        await _startup.run("warmup", _warm_up, WARMUP_BATCH)
+
+    _startup.finish()
+    failed = [phase["name"] for phase in _startup.phases if phase["status"] == "failed"]
+    logger.info(f"Startup completed in {time.time() - start_time:.2f}s" + (f" with failed phases: {failed}" if failed else ""))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _cache_sweeper is not None:
+        _cache_sweeper.cancel()
+    _inference.shutdown()
+    if _translation_executor is not _inference:
+        _translation_executor.shutdown()
 
 # Optional local runner
 if __name__ == "__main__":
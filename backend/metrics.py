@@ -0,0 +1,158 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from inference import stage_timer
+
+# Lightweight request tracing and Prometheus text exposition, with no client
+# library. Each /chat request carries a RequestTrace whose spans time the
+# pipeline stages; when the request ends they are observed into histograms
+# labelled by stage, language and dataset. Gauges that already live elsewhere
+# (cache stats, executor queue depth) are read by collectors at scrape time.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by label set, plus scrape-time collectors.
+
+    A collector returns ``(name, type, help, [(labels dict, value), ...])``
+    tuples for values owned by other components.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]]]] = []
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self._help[name] = ("histogram", help)
+        self._buckets[name] = tuple(buckets)
+        self._histograms.setdefault(name, {})
+
+    def counter(self, name: str, help: str):
+        self._help[name] = ("counter", help)
+        self._counters.setdefault(name, {})
+
+    def collector(self, fn):
+        self._collectors.append(fn)
+        return fn
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets[name])
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                lines += [f"# HELP {name} {self._help[name][1]}", f"# TYPE {name} counter"]
+                lines += [f"{name}{_format_labels(key)} {_format_value(value)}" for key, value in sorted(series.items())]
+            for name, series in self._histograms.items():
+                lines += [f"# HELP {name} {self._help[name][1]}", f"# TYPE {name} histogram"]
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(float(bound))))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def register_request_metrics(registry: MetricsRegistry):
+    """The families RequestTrace.finish and batch observers write to."""
+    registry.histogram("lexibot_stage_seconds", "Duration of one pipeline stage of a /chat request")
+    registry.histogram("lexibot_request_seconds", "Duration of a /chat request")
+    registry.counter("lexibot_requests_total", "/chat requests by language and outcome")
+    registry.histogram("lexibot_batch_size", "Items per model micro-batch", BATCH_SIZE_BUCKETS)
+    registry.histogram("lexibot_batch_seconds", "Duration of one model micro-batch")
+
+
+class RequestTrace:
+    """Spans of one request. ``timings`` (stage -> ms) is shared with the
+    stage timings the inference executor already records."""
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.dataset = "none"
+        self.outcome = "answered"
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self.total_ms: Optional[float] = None
+
+    def span(self, stage: str):
+        """Context manager timing a block as ``stage``."""
+        return stage_timer(self.timings, stage)
+
+    def finish(self, registry: MetricsRegistry):
+        if self.total_ms is not None:
+            return
+        self.total_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        for stage, ms in self.timings.items():
+            registry.observe("lexibot_stage_seconds", ms / 1000, stage=stage, lang=self.lang, dataset=self.dataset)
+        registry.observe("lexibot_request_seconds", self.total_ms / 1000, lang=self.lang, outcome=self.outcome)
+        registry.inc("lexibot_requests_total", lang=self.lang, outcome=self.outcome)
+
+    def server_timing(self) -> str:
+        """The spans as a Server-Timing header value (durations in ms)."""
+        entries = [f"{stage};dur={ms}" for stage, ms in self.timings.items()]
+        if self.total_ms is not None:
+            entries.append(f"total;dur={self.total_ms}")
+        return ", ".join(entries)
@@ -0,0 +1,301 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from inference import InferenceQueueFull
+
+logger = logging.getLogger(__name__)
+
+# Shared model server for multi-worker deployments. One process loads the
+# embedder, the QA model and the unified language matrices; the HTTP workers
+# (uvicorn --workers N with LEXIBOT_MODEL_SERVER=<socket>) send it encode and QA
+# requests over a Unix socket and map the normalized embedding matrices from
+# shared memory, so RAM per node no longer grows with the worker count.
+#
+#   python model_server.py --socket /run/lexibot/models.sock
+#
+# Wire format, both directions: 4-byte big-endian header length, a JSON header,
+# then ``payload_bytes`` of raw float32 data (embeddings) when present. Failed
+# requests answer {"ok": false, "error": ..., "code": ...}; QUEUE_FULL means the
+# server shed the request and the worker raises InferenceQueueFull (HTTP 503).
+DEFAULT_SOCKET = "/tmp/lexibot-models.sock"
+QUEUE_FULL = "queue_full"
+_FRAME = struct.Struct("!I")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def encode_frame(header: Dict[str, Any], payload: bytes = b"") -> bytes:
+    data = json.dumps(dict(header, payload_bytes=len(payload)), default=_json_default).encode("utf-8")
+    return _FRAME.pack(len(data)) + data + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Model server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    (length,) = _FRAME.unpack(_recv_exactly(sock, _FRAME.size))
+    header = json.loads(_recv_exactly(sock, length))
+    payload = _recv_exactly(sock, header["payload_bytes"]) if header.get("payload_bytes") else b""
+    return header, payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    (length,) = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    header = json.loads(await reader.readexactly(length))
+    payload = await reader.readexactly(header["payload_bytes"]) if header.get("payload_bytes") else b""
+    return header, payload
+
+
+def attach_shared_matrix(info: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Map a matrix exported by the model server; the segment must stay referenced while in use."""
+    try:
+        segment = shared_memory.SharedMemory(name=info["name"], track=False)
+    except TypeError:
+        # Python < 3.13 registers attached segments with the resource tracker,
+        # which would unlink them when this worker exits
+        from multiprocessing import resource_tracker
+        segment = shared_memory.SharedMemory(name=info["name"])
+        resource_tracker.unregister(segment._name, "shared_memory")
+    matrix = np.ndarray(tuple(info["shape"]), dtype=np.dtype(info["dtype"]), buffer=segment.buf)
+    matrix.flags.writeable = False
+    return segment, matrix
+
+
+# -----------------------
+# Worker side
+# -----------------------
+class ModelServerError(RuntimeError):
+    """The model server is unreachable or failed the request."""
+
+
+class ModelClient:
+    """Blocking client used from the inference pool; one connection per thread.
+
+    ``encode`` mirrors SentenceTransformer.encode, so the client can stand in
+    for the embedder wherever the in-process model is used.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Attached shared-memory segments, kept open for the life of the process
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+
+    def _connection(self) -> socket.socket:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            conn.connect(self.socket_path)
+            self._local.conn = conn
+        return conn
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        # One retry on a fresh connection covers a model server restart
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.sendall(encode_frame(header))
+                response, payload = recv_frame(conn)
+                break
+            except (OSError, ConnectionError) as e:
+                self._close()
+                if attempt:
+                    raise ModelServerError(f"Model server at {self.socket_path} unavailable: {e}")
+        if not response.get("ok"):
+            if response.get("code") == QUEUE_FULL:
+                raise InferenceQueueFull(response.get("error") or "Model server queue is full")
+            raise ModelServerError(response.get("error") or "Model server request failed")
+        return response, payload
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request({"op": "ping"})[0]
+
+    def encode(self, texts, batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        response, payload = self.request({"op": "encode", "texts": [texts] if single else list(texts)})
+        embeddings = np.frombuffer(payload, dtype=np.float32).reshape(response["shape"])
+        return embeddings[0] if single else embeddings
+
+    def answer(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        return self.request({"op": "qa", "pairs": [list(pair) for pair in pairs]})[0]["results"]
+
+    def shared_matrix(self, lang: str) -> Optional[Tuple[np.ndarray, List[Tuple[str, int]]]]:
+        """The server's normalized matrix for ``lang`` and its (dataset, rows) layout, or None."""
+        info = self.request({"op": "matrix", "lang": lang})[0].get("matrix")
+        if info is None:
+            return None
+        segment, matrix = attach_shared_matrix(info)
+        self._segments[info["name"]] = segment
+        return matrix, [tuple(item) for item in info["datasets"]]
+
+
+class RemoteQAPipeline:
+    """Stands in for the transformers QA pipeline; the pairs are answered by the model server."""
+
+    def __init__(self, client: ModelClient):
+        self.client = client
+
+    def __call__(self, question, context, **kwargs):
+        if isinstance(question, str):
+            return self.client.answer([(question, context)])[0]
+        return self.client.answer(list(zip(question, context)))
+
+
+# -----------------------
+# Server side
+# -----------------------
+class ModelServer:
+    """Owns the models and the shared language matrices; serves worker requests."""
+
+    def __init__(self, app_module, socket_path: str, langs: List[str]):
+        from batching import MicroBatcher
+
+        self.app = app_module
+        self.socket_path = socket_path
+        self.langs = langs
+        self.matrices: Dict[str, Dict[str, Any]] = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+        inference = app_module._inference
+        # Requests from every worker are coalesced into shared forward passes
+        self._embed_batcher = MicroBatcher("embed", app_module._encode_batch, app_module.EMBED_BATCH_SIZE,
+                                           app_module.EMBED_BATCH_WAIT_MS, executor=inference)
+        self._qa_batcher = MicroBatcher("qa", app_module._qa_batch, app_module.QA_BATCH_SIZE,
+                                        app_module.QA_BATCH_WAIT_MS, executor=inference)
+
+    def load(self):
+        self.app._ensure_models_available()
+        for lang in self.langs:
+            try:
+                lang_index = self.app._load_language_index(lang)
+            except Exception as e:
+                logger.warning(f"No shared matrix for {lang}: {e}")
+                continue
+            self._export_matrix(lang, lang_index)
+
+    def _export_matrix(self, lang: str, lang_index: Dict[str, Any]):
+        if self.app.VECTOR_BACKEND != "brute":
+            # ANN graphs are loaded per worker from disk; only the brute matrices are shared
+            return
+        matrix = lang_index["index"].normalized_matrix()
+        segment = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes),
+                                             name=f"lexibot_{os.getpid()}_{lang}")
+        shared = np.ndarray(matrix.shape, dtype=np.float32, buffer=segment.buf)
+        shared[:] = matrix
+        self._segments.append(segment)
+        self.matrices[lang] = {
+            "name": segment.name,
+            "shape": list(matrix.shape),
+            "dtype": "float32",
+            "datasets": [[dataset, len(store["embeddings"])] for dataset, store in lang_index["stores"]],
+        }
+        logger.info(f"Shared {lang} matrix {matrix.shape} as {segment.name}")
+
+    async def handle(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "langs": sorted(self.matrices)}, b""
+        if op == "encode":
+            embeddings = np.asarray(await self._embed_batcher.submit_many(header["texts"]), dtype=np.float32)
+            return {"ok": True, "shape": list(embeddings.shape)}, embeddings.tobytes()
+        if op == "qa":
+            results = await self._qa_batcher.submit([tuple(pair) for pair in header["pairs"]])
+            return {"ok": True, "results": results}, b""
+        if op == "matrix":
+            return {"ok": True, "matrix": self.matrices.get(header.get("lang"))}, b""
+        if op == "stats":
+            return {"ok": True, "batching": {"embed": self._embed_batcher.stats(), "qa": self._qa_batcher.stats()}}, b""
+        return {"ok": False, "error": f"Unknown op: {op!r}"}, b""
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header, _ = await _read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    response, payload = await self.handle(header)
+                except InferenceQueueFull as e:
+                    logger.warning(f"Shedding model server {header.get('op')} request: {e}")
+                    response, payload = {"ok": False, "error": str(e), "code": QUEUE_FULL}, b""
+                except Exception as e:
+                    logger.exception(f"Model server {header.get('op')} request failed")
+                    response, payload = {"ok": False, "error": str(e)}, b""
+                writer.write(encode_frame(response, payload))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.load)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._serve_connection, path=self.socket_path)
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        logger.info(f"Model server listening on {self.socket_path}")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.close()
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.app._inference.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the LexiBot models and index matrices to HTTP workers")
+    parser.add_argument("--socket", default=os.getenv("LEXIBOT_MODEL_SERVER") or DEFAULT_SOCKET)
+    parser.add_argument("--langs", nargs="+", default=["en", "hi", "ne"])
+    args = parser.parse_args()
+
+    # This process runs the models itself
+    os.environ["LEXIBOT_MODEL_SERVER"] = ""
+    import main as server_app
+
+    asyncio.run(ModelServer(server_app, args.socket, args.langs).serve())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
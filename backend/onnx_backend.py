@@ -0,0 +1,225 @@
+import argparse
+import importlib.util
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# sentence_transformers, transformers, onnxruntime and optimum are imported where
+# they are used, so importing this module (and main.py) stays cheap
+
+# Inference backends for the query embedder and the QA model:
+#   "torch"      full-precision PyTorch (the default)
+#   "onnx"       ONNX Runtime, fp32 graphs exported from the same checkpoints
+#   "onnx-int8"  ONNX Runtime with dynamically quantized int8 weights
+# The ONNX graphs are produced once by:  python onnx_backend.py export [--quantization-config avx2]
+# and checked against PyTorch with:       python onnx_backend.py parity --backend onnx-int8
+# (pip install "sentence-transformers[onnx]" "optimum[onnxruntime]")
+INFERENCE_BACKENDS = ("torch", "onnx", "onnx-int8")
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+QA_MODEL = "deepset/roberta-base-squad2"
+
+ROOT = Path(__file__).resolve().parent
+ONNX_DIR = Path(os.getenv("LEXIBOT_ONNX_DIR", ROOT / "models" / "onnx"))
+EXPORT_FILE = "export.json"
+# The canonical questions ingest_data.py --warm answers; the parity check runs on them too
+CANONICAL_QUESTIONS = ROOT / "data" / "canonical_questions.json"
+QUANTIZATION_CONFIGS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def _require_onnx():
+    if importlib.util.find_spec("onnxruntime") is None or importlib.util.find_spec("optimum") is None:
+        raise RuntimeError('ONNX backends need `pip install "sentence-transformers[onnx]" "optimum[onnxruntime]"`')
+
+
+def _session_options(threads: Optional[int]):
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+    return options
+
+
+def read_export_info(onnx_dir: Path = ONNX_DIR) -> Dict[str, Any]:
+    path = Path(onnx_dir) / EXPORT_FILE
+    if not path.exists():
+        raise RuntimeError(f"No ONNX export in {onnx_dir}; run `python onnx_backend.py export` first")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_models(onnx_dir: Path = ONNX_DIR, quantization_config: str = "avx2") -> Dict[str, Any]:
+    """Export both models to ONNX and write dynamically quantized int8 copies next to them."""
+    _require_onnx()
+    from optimum.onnxruntime import ORTModelForQuestionAnswering, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+    from transformers import AutoTokenizer
+
+    onnx_dir = Path(onnx_dir)
+    embedder_dir = onnx_dir / "embedder"
+    qa_dir = onnx_dir / "qa"
+
+    print(f"Exporting {EMBEDDING_MODEL} -> {embedder_dir}")
+    embedder = SentenceTransformer(EMBEDDING_MODEL, device="cpu", backend="onnx")
+    embedder.save_pretrained(str(embedder_dir))
+    export_dynamic_quantized_onnx_model(embedder, quantization_config, str(embedder_dir))
+
+    print(f"Exporting {QA_MODEL} -> {qa_dir}")
+    qa_model = ORTModelForQuestionAnswering.from_pretrained(QA_MODEL, export=True)
+    qa_model.save_pretrained(qa_dir)
+    AutoTokenizer.from_pretrained(QA_MODEL).save_pretrained(qa_dir)
+    quantizer = ORTQuantizer.from_pretrained(qa_model)
+    quantizer.quantize(
+        save_dir=qa_dir,
+        quantization_config=getattr(AutoQuantizationConfig, quantization_config)(is_static=False, per_channel=False),
+    )
+
+    info = {
+        "embedding_model": EMBEDDING_MODEL,
+        "qa_model": QA_MODEL,
+        "quantization_config": quantization_config,
+        "files": {
+            "onnx": {"embedder": "onnx/model.onnx", "qa": "model.onnx"},
+            "onnx-int8": {"embedder": f"onnx/model_qint8_{quantization_config}.onnx", "qa": "model_quantized.onnx"},
+        },
+    }
+    with open(onnx_dir / EXPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+def load_embedder(backend: str = "torch", device: str = "cpu", threads: Optional[int] = None,
+                  onnx_dir: Path = ONNX_DIR):
+    """SentenceTransformer for ``backend``; every backend exposes the same ``encode``."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(EMBEDDING_MODEL, device=device)
+    _require_onnx()
+    file_name = read_export_info(onnx_dir)["files"][backend]["embedder"]
+    return SentenceTransformer(
+        str(Path(onnx_dir) / "embedder"), device="cpu", backend="onnx",
+        model_kwargs={"file_name": file_name, "session_options": _session_options(threads)},
+    )
+
+
+def load_qa_pipeline(backend: str = "torch", device: str = "cpu", threads: Optional[int] = None,
+                     onnx_dir: Path = ONNX_DIR):
+    """Question-answering pipeline for ``backend``; ONNX models run behind the same pipeline API."""
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "torch":
+        return pipeline("question-answering", model=QA_MODEL, device=device)
+    _require_onnx()
+    from optimum.onnxruntime import ORTModelForQuestionAnswering
+
+    qa_dir = Path(onnx_dir) / "qa"
+    file_name = read_export_info(onnx_dir)["files"][backend]["qa"]
+    model = ORTModelForQuestionAnswering.from_pretrained(qa_dir, file_name=file_name,
+                                                         session_options=_session_options(threads))
+    return pipeline("question-answering", model=model, tokenizer=AutoTokenizer.from_pretrained(qa_dir))
+
+
+# -----------------------
+# Parity check
+# -----------------------
+def _normalize_answer(answer: str) -> List[str]:
+    return re.sub(r"[^\w\sऀ-ॿ]", " ", answer.lower()).split()
+
+
+def _token_f1(a: str, b: str) -> float:
+    a_tokens, b_tokens = _normalize_answer(a), _normalize_answer(b)
+    if not a_tokens or not b_tokens:
+        return float(a_tokens == b_tokens)
+    common = sum(min(a_tokens.count(t), b_tokens.count(t)) for t in set(a_tokens))
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(a_tokens), common / len(b_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+def parity_check(backend: str, onnx_dir: Path = ONNX_DIR, questions_path: Path = CANONICAL_QUESTIONS):
+    """Compare ``backend`` with PyTorch on the canonical questions.
+
+    Embeddings: cosine similarity per query (drift = 1 - cosine). QA: exact and
+    token-F1 agreement of the answers over the top retrieved English chunk.
+    """
+    import main as server
+
+    with open(questions_path, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    reference_embedder = load_embedder("torch")
+    reference_qa = load_qa_pipeline("torch")
+    candidate_embedder = load_embedder(backend, onnx_dir=onnx_dir)
+    candidate_qa = load_qa_pipeline(backend, onnx_dir=onnx_dir)
+
+    print(f"Embedding drift, {backend} vs torch")
+    print(f"{'lang':>5} {'queries':>8} {'mean cos':>9} {'min cos':>8} {'torch ms':>9} {f'{backend} ms':>12}")
+    for lang, queries in questions.items():
+        start = time.perf_counter()
+        expected = reference_embedder.encode(queries, normalize_embeddings=True)
+        reference_ms = (time.perf_counter() - start) / len(queries) * 1000
+        start = time.perf_counter()
+        actual = candidate_embedder.encode(queries, normalize_embeddings=True)
+        candidate_ms = (time.perf_counter() - start) / len(queries) * 1000
+        cosines = np.sum(expected * actual, axis=1)
+        print(f"{lang:>5} {len(queries):>8} {cosines.mean():>9.5f} {cosines.min():>8.5f} "
+              f"{reference_ms:>9.1f} {candidate_ms:>12.1f}")
+
+    # QA contexts: the best hybrid-retrieval chunk of each English query, as /chat would pick it
+    lang_index = server._load_language_index("en")
+    pairs = []
+    for query in questions.get("en", []):
+        query_embedding = reference_embedder.encode([query])[0]
+        fused, _, _ = server._hybrid_search(lang_index, query_embedding, query)
+        if fused:
+            _, meta = server._lang_index_meta(lang_index, fused[0][0])
+            pairs.append((query, server._extract_text_from_meta(meta)[:server.QA_CONTEXT_CHARS]))
+
+    qa_kwargs = {"max_seq_len": server.QA_MAX_SEQ_LEN, "doc_stride": server.QA_DOC_STRIDE}
+    exact = 0
+    f1 = 0.0
+    score_diffs = []
+    for question, context in pairs:
+        expected = reference_qa(question=question, context=context, **qa_kwargs)
+        actual = candidate_qa(question=question, context=context, **qa_kwargs)
+        exact += _normalize_answer(expected["answer"]) == _normalize_answer(actual["answer"])
+        f1 += _token_f1(expected["answer"], actual["answer"])
+        score_diffs.append(abs(expected["score"] - actual["score"]))
+
+    if pairs:
+        print(f"\nQA agreement, {backend} vs torch over {len(pairs)} questions")
+        print(f"exact match {exact / len(pairs):.3f}  token F1 {f1 / len(pairs):.3f}  "
+              f"mean |score diff| {np.mean(score_diffs):.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, quantize and check the ONNX inference backends.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export both models to ONNX fp32 and int8")
+    export_parser.add_argument("--onnx-dir", type=Path, default=ONNX_DIR)
+    export_parser.add_argument("--quantization-config", choices=QUANTIZATION_CONFIGS, default="avx2",
+                               help="Target instruction set of the int8 kernels")
+    parity_parser = subparsers.add_parser("parity", help="Compare an ONNX backend with PyTorch")
+    parity_parser.add_argument("--onnx-dir", type=Path, default=ONNX_DIR)
+    parity_parser.add_argument("--backend", choices=INFERENCE_BACKENDS[1:], default="onnx-int8")
+    parity_parser.add_argument("--questions", type=Path, default=CANONICAL_QUESTIONS,
+                               help='JSON file of {"<lang>": [questions]}; default: %(default)s')
+    args = parser.parse_args()
+
+    if args.command == "export":
+        info = export_models(args.onnx_dir, args.quantization_config)
+        print(f"Exported to {args.onnx_dir}: {json.dumps(info['files'])}")
+    else:
+        parity_check(args.backend, args.onnx_dir, args.questions)
+
+
+if __name__ == "__main__":
+    main()
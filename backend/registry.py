@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# Load state of every model and index the server depends on. /ready reports
+# ready only once every required component has loaded, so load balancers keep
+# traffic away from workers that are still cold; /health shows the details.
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def estimate_nbytes(obj: Any, _depth: int = 0) -> int:
+    """Approximate memory held by a loaded component: array buffers and model parameters."""
+    if obj is None or _depth > 8 or isinstance(obj, (str, bytes, int, float, bool)):
+        return 0
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    parameters = getattr(obj, "parameters", None)
+    if callable(parameters):
+        try:
+            return int(sum(p.numel() * p.element_size() for p in parameters()))
+        except Exception:
+            pass
+    # HF pipelines hold the model in .model
+    if hasattr(obj, "model") and not isinstance(obj, dict):
+        return estimate_nbytes(obj.model, _depth + 1)
+    if isinstance(obj, dict):
+        return sum(estimate_nbytes(value, _depth + 1) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_nbytes(value, _depth + 1) for value in obj)
+    if hasattr(obj, "__dict__"):
+        return sum(estimate_nbytes(value, _depth + 1) for value in vars(obj).values())
+    return 0
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux), or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Component:
+    def __init__(self, name: str, required: bool):
+        self.name = name
+        self.required = required
+        self.state = PENDING
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "load_seconds": None if self.load_seconds is None else round(self.load_seconds, 3),
+            "memory_bytes": self.memory_bytes,
+            "last_error": self.last_error,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class ComponentRegistry:
+    def __init__(self, required: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._components: Dict[str, Component] = {}
+        for name in required:
+            self.register(name, required=True)
+
+    def register(self, name: str, required: bool = False) -> Component:
+        with self._lock:
+            component = self._components.get(name)
+            if component is None:
+                component = self._components[name] = Component(name, required)
+            component.required = component.required or required
+            return component
+
+    @contextmanager
+    def track(self, name: str):
+        """Mark ``name`` loading for the duration of the block, then ready or failed.
+
+        The block may set ``memory_bytes`` on the yielded component; exceptions
+        are recorded as the component's last error and re-raised.
+        """
+        component = self.register(name)
+        component.state = LOADING
+        start = time.perf_counter()
+        try:
+            yield component
+        except BaseException as e:
+            component.state = FAILED
+            component.last_error = getattr(e, "detail", None) or str(e) or type(e).__name__
+            raise
+        else:
+            component.state = READY
+            component.loaded_at = time.time()
+        finally:
+            component.load_seconds = time.perf_counter() - start
+
+    @property
+    def ready(self) -> bool:
+        return all(c.state == READY for c in self._components.values() if c.required)
+
+    def not_ready(self) -> Dict[str, str]:
+        return {c.name: c.state for c in self._components.values() if c.required and c.state != READY}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: component.as_dict() for name, component in sorted(self._components.items())}
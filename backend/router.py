@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from index_store import l2_normalize
+
+# Representative descriptions of each legal code, embedded once per process
+DATASET_DESCRIPTIONS = {
+    "BNS": "criminal offenses punishments penalties murder theft assault rape kidnapping robbery human trafficking crimes legal sections Bharatiya Nyaya Sanhita",
+    "BSA": "evidence witness testimony documents proof admission confession expert court trial Bharatiya Sakshya Adhiniyam",
+    "BNSS": "criminal procedure investigation police arrest bail summons warrant search seizure fir complaint registration appeal Bharatiya Nagarik Suraksha Sanhita"
+}
+
+# Weight of the description similarity vs. the centroid similarity in the routing score
+DESCRIPTION_WEIGHT = 0.5
+
+
+class DatasetRouter:
+    """Routes a query embedding to the most relevant dataset with one matrix product.
+
+    Each dataset is represented by two precomputed unit vectors: the embedding
+    of its description (computed once at startup) and the centroid of its chunk
+    embeddings (computed at ingestion time). Per language these are stacked
+    into a (2 * n_datasets, dim) matrix, so routing costs a single mat-vec.
+    """
+
+    def __init__(self, datasets: List[str], descriptions: Dict[str, str] = DATASET_DESCRIPTIONS,
+                 description_weight: float = DESCRIPTION_WEIGHT):
+        self.datasets = list(datasets)
+        self.descriptions = descriptions
+        self.description_weight = description_weight
+        self._description_matrix: Optional[np.ndarray] = None
+        self._centroids: Dict[str, Dict[str, np.ndarray]] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._description_matrix is not None
+
+    def fit_descriptions(self, encoder):
+        """Embed all dataset descriptions in one batch."""
+        vectors = encoder.encode([self.descriptions[d] for d in self.datasets])
+        self._description_matrix = l2_normalize(vectors)
+        self._matrices.clear()
+
+    def set_centroid(self, lang: str, dataset: str, centroid: np.ndarray):
+        """Register the chunk-embedding centroid of one (lang, dataset) index."""
+        self._centroids.setdefault(lang, {})[dataset] = l2_normalize(centroid)
+        self._matrices.pop(lang, None)
+
+    def _matrix(self, lang: str) -> np.ndarray:
+        matrix = self._matrices.get(lang)
+        if matrix is None:
+            centroids = self._centroids.get(lang, {})
+            # Datasets without a centroid fall back to their description vector
+            centroid_rows = [
+                centroids.get(d, self._description_matrix[i])
+                for i, d in enumerate(self.datasets)
+            ]
+            matrix = np.vstack([self._description_matrix, np.vstack(centroid_rows)])
+            self._matrices[lang] = matrix
+        return matrix
+
+    def route(self, query_embedding: np.ndarray, lang: str) -> Tuple[str, Dict[str, float]]:
+        """Return the best dataset and the routing score of every dataset."""
+        if not self.ready:
+            raise RuntimeError("Dataset router has no description embeddings yet")
+
+        query = l2_normalize(query_embedding).reshape(-1)
+        similarities = (self._matrix(lang) @ query).reshape(2, len(self.datasets))
+        scores = self.description_weight * similarities[0] + (1 - self.description_weight) * similarities[1]
+
+        best = self.datasets[int(np.argmax(scores))]
+        return best, {d: round(float(s), 4) for d, s in zip(self.datasets, scores)}
@@ -0,0 +1,75 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from index_store import l2_normalize
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, in O(n + k log k)."""
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_k_batch(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise top-k of a (queries, rows) score matrix: (indices, scores), best first."""
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+class DenseSearcher:
+    """Exact cosine-similarity search over a pre-normalized float32 matrix.
+
+    Rows are normalized once at construction, so a query costs one mat-vec
+    (or one mat-mat for a batch of queries) plus an argpartition.
+    """
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False):
+        matrix = np.asarray(embeddings, dtype=np.float32) if normalized else l2_normalize(embeddings)
+        self.matrix = np.ascontiguousarray(matrix)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def scores(self, query: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of one query against every row (masked-out rows get -inf)."""
+        similarities = self.matrix @ l2_normalize(query).reshape(-1)
+        if mask is not None:
+            similarities = np.where(mask, similarities, -np.inf)
+        return similarities
+
+    def search(self, query: np.ndarray, k: int, threshold: Optional[float] = None,
+               mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k rows for one query: (indices, scores), best first, at or above ``threshold``."""
+        similarities = self.scores(query, mask)
+        indices = top_k(similarities, k)
+        scores = similarities[indices]
+        keep = np.isfinite(scores) if threshold is None else scores >= threshold
+        return indices[keep], scores[keep]
+
+    def search_batch(self, queries: np.ndarray, k: int, threshold: Optional[float] = None,
+                     mask: Optional[np.ndarray] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Top-k rows for many queries at once, scored with a single matrix product."""
+        similarities = l2_normalize(np.atleast_2d(queries)) @ self.matrix.T
+        if mask is not None:
+            similarities = np.where(mask[None, :], similarities, -np.inf)
+        indices, scores = top_k_batch(similarities, k)
+        keep = np.isfinite(scores) if threshold is None else scores >= threshold
+        return [(indices[i][keep[i]], scores[i][keep[i]]) for i in range(len(indices))]
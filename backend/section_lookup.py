@@ -0,0 +1,113 @@
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+# Multilingual parser for explicit section/chapter references ("Section 103 of BNS",
+# "BNS 103", "धारा ६४", "दफा 64 BNSS", "chapter 5 of BSA") and the (law, number) ->
+# chunk indexes that answer them without any model inference.
+
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+NUMBER = r"([0-9]{1,3})\b"
+SECTION_WORDS = r"(?:sections?|secs?\.?|s\.|u/s\.?|धारा|धाराओं|दफा|दफामा|खण्ड)"
+CHAPTER_WORDS = r"(?:chapters?|ch\.|अध्याय|परिच्छेद)"
+
+SECTION_PATTERN = re.compile(rf"(?<![\wऀ-ॿ]){SECTION_WORDS}\s*(?:no\.?|number|संख्या|नं\.?)?\s*{NUMBER}")
+CHAPTER_PATTERN = re.compile(rf"(?<![\wऀ-ॿ]){CHAPTER_WORDS}\s*(?:no\.?|number|संख्या|नं\.?)?\s*{NUMBER}")
+
+# Law names and abbreviations in English, Hindi and Nepali. BNSS is checked
+# before BNS so "BNSS 35" is not read as BNS. The repealed IPC/CrPC/Evidence Act
+# are not aliases: the new codes are renumbered, so their section numbers differ.
+LAW_PATTERNS = [
+    ("BNSS", re.compile(r"\bbnss\b|nagarik\s+suraksha|नागरिक\s+सुरक्षा|बीएनएसएस")),
+    # "साक्ष्य" alone just means evidence; only the act's name selects BSA
+    ("BSA", re.compile(r"\bbsa\b|sakshya|भारतीय\s+साक्ष्य|साक्ष्य\s+(?:अधिनियम|ऐन)|बीएसए")),
+    ("BNS", re.compile(r"\bbns\b|nyaya\s+sanhita|न्याय\s+संहिता|बीएनएस")),
+]
+# Any other act or code ("IPC 302", "section 5 of the Dowry Prohibition Act",
+# "दहेज प्रतिषेध अधिनियम"): its numbers must not be looked up in BNS/BNSS/BSA
+OTHER_LAW_PATTERN = re.compile(
+    r"\bipc\b|\bcrpc\b|cr\.\s*p\.\s*c|\biea\b|penal\s+code|code\s+of\s+criminal|evidence\s+act"
+    r"|\b(?:of|under|in)\s+(?:the\s+)?(?:[a-z]+\s+){0,5}(?:act|code|rules|ordinance)\b"
+    r"|अधिनियम|ऐन|संहिता"
+)
+# "BNS 103", "BNSS-35": a law abbreviation directly followed by a number
+LAW_NUMBER_PATTERN = re.compile(r"\b(bnss|bns|bsa)\s*[-:]?\s*([0-9]{1,3})\b")
+
+
+def _normalize(query: str) -> str:
+    return unicodedata.normalize("NFC", query).lower().translate(DEVANAGARI_DIGITS)
+
+
+def parse_reference(query: str) -> Optional[Dict[str, Any]]:
+    """Recognise an explicit section or chapter reference.
+
+    Returns {"kind": "section" | "chapter", "number": int, "law": str | None}
+    or None when the query names no section or chapter number, or names a
+    law other than BNS, BNSS and BSA.
+    """
+    text = _normalize(query)
+
+    law = None
+    for code, pattern in LAW_PATTERNS:
+        if pattern.search(text):
+            law = code
+            break
+    if law is None and OTHER_LAW_PATTERN.search(text):
+        return None
+
+    match = SECTION_PATTERN.search(text)
+    if match:
+        return {"kind": "section", "number": int(match.group(1)), "law": law}
+
+    match = LAW_NUMBER_PATTERN.search(text)
+    if match:
+        return {"kind": "section", "number": int(match.group(2)), "law": match.group(1).upper()}
+
+    match = CHAPTER_PATTERN.search(text)
+    if match:
+        return {"kind": "chapter", "number": int(match.group(1)), "law": law}
+    return None
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(str(value).translate(DEVANAGARI_DIGITS))
+    except (TypeError, ValueError):
+        return None
+
+
+def build_reference_index(stores: List[Tuple[str, Any]]) -> Dict[str, Dict[Tuple[str, int], List]]:
+    """Index chunk rows by (law, section_no) and section numbers by (law, chapter_no).
+
+    ``stores`` is a list of (dataset, store) pairs. Section entries are
+    (dataset, local row, part) tuples sorted by part; chapter entries are the
+    sorted section numbers of the chapter.
+    """
+    sections: Dict[Tuple[str, int], List[Tuple[str, int, int]]] = {}
+    chapters: Dict[Tuple[str, int], List[int]] = {}
+    for dataset, store in stores:
+        for row, meta in enumerate(store["metas"]):
+            if not isinstance(meta, dict):
+                continue
+            section_no = _as_int(meta.get("section_no"))
+            chapter_no = _as_int(meta.get("chapter_no"))
+            if section_no is None:
+                # Legacy chapter-level records: the whole chapter is one row
+                for sec in meta.get("sections") or []:
+                    legacy_no = _as_int(sec.get("section_no"))
+                    if legacy_no is not None:
+                        sections.setdefault((dataset, legacy_no), []).append((dataset, row, 0))
+                        if chapter_no is not None:
+                            chapters.setdefault((dataset, chapter_no), []).append(legacy_no)
+                continue
+            sections.setdefault((dataset, section_no), []).append((dataset, row, meta.get("part") or 0))
+            if chapter_no is not None:
+                chapters.setdefault((dataset, chapter_no), []).append(section_no)
+
+    for entries in sections.values():
+        entries.sort(key=lambda entry: entry[2])
+    return {
+        "sections": sections,
+        "chapters": {key: sorted(set(numbers)) for key, numbers in chapters.items()},
+    }
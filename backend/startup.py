@@ -0,0 +1,52 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Startup timeline: every load step (model, index, warm-up) is recorded as a phase
+# with its offset from process start and its duration, so slow restarts can be
+# attributed to a component. Independent phases run concurrently on threads.
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.phases: List[Dict[str, Any]] = []
+
+    async def run(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` on a worker thread as a named phase; failures are recorded, not raised."""
+        phase = {"name": name, "start_ms": round((time.perf_counter() - self._origin) * 1000, 1), "status": "running"}
+        self.phases.append(phase)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+            phase["status"] = "ok"
+            return result
+        except Exception as e:
+            phase["status"] = "failed"
+            phase["error"] = str(e)
+            logger.warning(f"Startup phase {name} failed: {e}")
+            return None
+        finally:
+            phase["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def run_all(self, phases: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """Run independent phases concurrently; returns each phase's result by name."""
+        results = await asyncio.gather(*(self.run(name, fn) for name, fn in phases.items()))
+        return dict(zip(phases, results))
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "finished": self.finished_at is not None,
+            "total_ms": round((self.finished_at - self.started_at) * 1000, 1) if self.finished_at else None,
+            "phases": sorted(self.phases, key=lambda phase: phase["start_ms"]),
+        }
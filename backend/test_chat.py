@@ -1,154 +1,18 @@
 import requests
 import json
 import time
+from pathlib import Path
 
 # Base URL for the API
 url = "http://localhost:8001/chat"
 
-english_queries = [
-    "What is the punishment for theft?",
-    "What is the punishment for murder?",
-    "What happens if someone steals property?",
-    "What is the Dowry Prohibition Act?",
-    "What is the punishment for rape?",
-    "How are witness statements recorded?",
-    "What is the age of consent for marriage?",
-    "What are the penalties for domestic violence?",
-    "How is evidence collected in criminal cases?",
-    "What is the punishment for drug trafficking?",
-    "What are the rights of an accused person?",
-    "What is the procedure for filing a police complaint?",
-    "What is the punishment for corruption?",
-    "How are juvenile offenders treated?",
-    "What is the punishment for cybercrime?",
-    "What are the provisions for bail?",
-    "What is the punishment for kidnapping?",
-    "How is a FIR registered?",
-    "What are the penalties for environmental crimes?",
-    "What is the punishment for human trafficking?",
-    "How are court judgments appealed?"
-]
+# Canonical questions, shared with ingest_data.py --warm and the ONNX parity check
+with open(Path(__file__).resolve().parent / "data" / "canonical_questions.json", "r", encoding="utf-8") as f:
+    _questions = json.load(f)
+english_queries = _questions["en"]
+hindi_queries = _questions["hi"]
+nepali_queries = _questions["ne"]
 
-# Hindi queries (20 questions)
-hindi_queries = [
-    "हत्या के लिए क्या सजा है?",
-    "चोरी करने पर क्या होता है?",
-    "दहेज प्रतिषेध अधिनियम क्या है?",
-    "बलात्कार के मामले में कितनी सजा होती है?",
-    "गवाहों के बयान कैसे दर्ज होते हैं?",
-    "विवाह के लिए सहमति की आयु क्या है?",
-    "घरेलू हिंसा के लिए क्या दंड हैं?",
-    "आपराधिक मामलों में सबूत कैसे एकत्र किए जाते हैं?",
-    "नशीली दवाओं की तस्करी के लिए क्या सजा है?",
-    "आरोपी व्यक्ति के क्या अधिकार हैं?",
-    "पुलिस शिकायत दर्ज करने की प्रक्रिया क्या है?",
-    "भ्रष्टाचार के लिए क्या सजा है?",
-    "किशोर अपराधियों का कैसे इलाज किया जाता है?",
-    "साइबर अपराध के लिए क्या सजा है?",
-    "जमानत के लिए क्या प्रावधान हैं?",
-    "अपहरण के लिए क्या सजा है?",
-    "एफआईआर कैसे दर्ज की जाती है?",
-    "पर्यावरण अपराधों के लिए क्या दंड हैं?",
-    "मानव तस्करी के लिए क्या सजा है?",
-    "न्यायालय के निर्णयों को कैसे अपील की जाती है?"
-]
-
-# Nepali queries (20 questions)
-nepali_queries = [
-    "हत्याको लागि के सजाय छ?",
-    "चोरी गर्नु परे के हुन्छ?",
-    "दाइजो निषेध ऐन के हो?",
-    "बलात्कारको मामिलामा कति सजाय हुन्छ?",
-    "साक्षीहरूका बयानहरू कसरी रेकर्ड गरिन्छ?",
-    "विवाहको लागि सहमतिका उमेर के हो?",
-    "घरेलु हिंसाका लागि के दण्डहरू छन्?",
-    "आपराधिक मामिलाहरूमा प्रमाणहरू कसरी संकलन गरिन्छ?",
-    "नशीली औषधिहरूको तस्करीका लागि के सजाय छ?",
-    "आरोपी व्यक्तिका के अधिकारहरू छन्?",
-    "प्रहरी उजुरी दर्ता गर्ने प्रक्रिया के हो?",
-    "भ्रष्टाचारका लागि के सजाय छ?",
-    "किशोर अपराधीहरूलाई कसरी व्यवहार गरिन्छ?",
-    "साइबर अपराधका लागि के सजाय छ?",
-    "जमानतका लागि के प्रावधानहरू छन्?",
-    "अपहरणका लागि के सजाय छ?",
-    "एफआईआर कसरी दर्ता गरिन्छ?",
-    "पर्यावरण अपराधहरूका लागि के दण्डहरू छन्?",
-    "मानव तस्करीका लागि के सजाय छ?",
-    "न्यायालयका निर्णयहरूलाई कसरी अपिल गरिन्छ?"
-]
-
-
-# English queries (20 questions)
-english_queries = [
-    "What is the punishment for murder in BNS?",
-    "What is the punishment for culpable homicide?",
-    "What is the punishment for attempt to murder?",
-    "What is the punishment for rash act?",
-    "What is the punishment for causing death by rash act?",
-    "What is the punishment for dowry death?",
-    "What is the punishment for abetment of suicide?",
-    "What is the punishment for attempt to suicide?",
-    "What is the punishment for hurt?",
-    "What is the punishment for grievous hurt?",
-    "What is the punishment for theft in BNS?",
-    "What is the punishment for robbery?",
-    "What is the punishment for dacoity?",
-    "What is the punishment for blackmail?",
-    "What is the punishment for cheating?",
-    "What is the punishment for forgery?",
-    "What is the punishment for defamation?",
-    "What is the punishment for assault?",
-    "What is the punishment for kidnapping?",
-    "What is the punishment for human trafficking?"
-]
-
-# Hindi queries (20 questions)
-hindi_queries = [
-    "BNS में हत्या की सजा?",
-    "दोषपूर्ण हत्या की सजा?",
-    "हत्या के प्रयास की सजा?",
-    "अविवेकपूर्ण कार्य की सजा?",
-    "अविवेकपूर्ण कार्य से मृत्यु की सजा?",
-    "दहेज मृत्यु की सजा?",
-    "आत्महत्या उकसाने की सजा?",
-    "आत्महत्या के प्रयास की सजा?",
-    "चोट की सजा?",
-    "गंभीर चोट की सजा?",
-    "BNS में चोरी की सजा?",
-    "लूट की सजा?",
-    "डकैती की सजा?",
-    "ब्लैकमेल की सजा?",
-    "धोखाधड़ी की सजा?",
-    "जालसाजी की सजा?",
-    "मानहानि की सजा?",
-    "हमले की सजा?",
-    "अपहरण की सजा?",
-    "मानव तस्करी की सजा?"
-]
-
-# Nepali queries (20 questions)
-nepali_queries = [
-    "BNS मा हत्याको सजाय?",
-    "दोषपूर्ण हत्याको सजाय?",
-    "हत्या प्रयासको सजाय?",
-    "अविवेकपूर्ण कार्यको सजाय?",
-    "अविवेकपूर्ण कार्यबाट मृत्युको सजाय?",
-    "दाइजो मृत्युको सजाय?",
-    "आत्महत्या उक्साउने सजाय?",
-    "आत्महत्या प्रयासको सजाय?",
-    "चोटको सजाय?",
-    "गम्भीर चोटको सजाय?",
-    "BNS मा चोरीको सजाय?",
-    "लुटको सजाय?",
-    "डकैतीको सजाय?",
-    "ब्ल्याकमेलको सजाय?",
-    "धोखाको सजाय?",
-    "जालसाजीको सजाय?",
-    "मानहानिको सजाय?",
-    "हमलाको सजाय?",
-    "अपहरणको सजाय?",
-    "मानव तस्करीको सजाय?"
-]
 
 def test_query(query, language, results_list):
     data = {
@@ -0,0 +1,57 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Backend modules import each other as siblings
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# No network, no shared state on disk: translation off, L2 cache and precomputed answers disabled
+os.environ.setdefault("LEXIBOT_TRANSLATION_BACKEND", "none")
+os.environ.setdefault("LEXIBOT_TRANSLATION_CACHE", "")
+os.environ.setdefault("LEXIBOT_RESPONSE_CACHE", "none")
+os.environ.setdefault("LEXIBOT_PRECOMPUTED_ANSWERS", "")
+
+
+class FakeEmbedder:
+    """Bag-of-words hashing embedder: deterministic, and similar texts get similar vectors."""
+
+    def encode(self, texts, batch_size=None, **kwargs):
+        single = isinstance(texts, str)
+        vectors = []
+        for text in [texts] if single else texts:
+            vector = np.zeros(768, dtype=np.float32)
+            for word in text.lower().split():
+                vector[sum(map(ord, word)) % 768] += 1.0
+            vectors.append(vector)
+        matrix = np.stack(vectors)
+        return matrix[0] if single else matrix
+
+
+def fake_qa(question, context, **kwargs):
+    contexts = [context] if isinstance(context, str) else list(context)
+    results = [{"answer": c[:40], "score": 0.6, "start": 0, "end": 40} for c in contexts]
+    return results[0] if len(results) == 1 else results
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """main with fake models and empty caches."""
+    import main
+
+    monkeypatch.setattr(main, "_sentence_model", FakeEmbedder())
+    monkeypatch.setattr(main, "_qa_pipeline", fake_qa)
+    monkeypatch.setattr(main, "_require_ml_libraries", lambda: None)
+    main._response_cache.clear()
+    main._embedding_cache.clear()
+    main._semantic_cache.clear()
+    return main
+
+
+@pytest.fixture
+def client(server):
+    from fastapi.testclient import TestClient
+
+    return TestClient(server.app)
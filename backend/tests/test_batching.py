@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+
+from batching import MicroBatcher
+from conftest import FakeEmbedder
+from inference import InferenceExecutor, InferenceQueueFull
+
+
+def double(items):
+    return [item * 2 for item in items]
+
+
+def test_concurrent_items_share_one_batch():
+    sizes = []
+    batcher = MicroBatcher("test", double, max_batch_size=8, max_wait_ms=20,
+                           on_batch=lambda size, seconds: sizes.append(size))
+    assert asyncio.run(batcher.submit_many([1, 2, 3, 4, 5])) == [2, 4, 6, 8, 10]
+    assert sizes == [5]
+
+
+def test_a_failing_batch_fails_only_its_own_requests():
+    def fragile(items):
+        if "bad" in items:
+            raise ValueError("bad input")
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher("test", fragile, max_batch_size=4, max_wait_ms=0)
+        with pytest.raises(ValueError):
+            await batcher.submit("bad")
+        return await asyncio.wait_for(batcher.submit("good"), 1)
+
+    assert asyncio.run(scenario()) == "good"
+
+
+def test_wrong_result_count_and_observer_errors_do_not_stop_the_worker():
+    def observer(size, seconds):
+        raise RuntimeError("metrics backend down")
+
+    async def scenario():
+        short = MicroBatcher("test", lambda items: [], max_wait_ms=0)
+        with pytest.raises(RuntimeError):
+            await short.submit(1)
+        observed = MicroBatcher("test", double, max_wait_ms=0, on_batch=observer)
+        return await asyncio.wait_for(observed.submit(21), 1)
+
+    assert asyncio.run(scenario()) == 42
+
+
+def test_dead_worker_is_restarted_on_the_same_queue():
+    async def scenario():
+        batcher = MicroBatcher("test", double, max_batch_size=4, max_wait_ms=0)
+        queued = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0)
+        # The worker dies before it takes the queued item
+        batcher._worker.cancel()
+        await asyncio.sleep(0)
+        assert batcher._worker.done()
+        assert await asyncio.wait_for(batcher.submit(2), 1) == 4
+        return await asyncio.wait_for(queued, 1)
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_batcher_follows_a_new_event_loop():
+    batcher = MicroBatcher("test", double, max_wait_ms=0)
+    assert asyncio.run(batcher.submit(1)) == 2
+    assert asyncio.run(asyncio.wait_for(batcher.submit(2), 1)) == 4
+
+
+def test_batches_go_through_inference_admission_control():
+    inference = InferenceExecutor(workers=1, max_queue=0)
+    batcher = MicroBatcher("test", double, max_wait_ms=0, executor=inference)
+    try:
+        assert asyncio.run(batcher.submit(1)) == 2
+        assert inference.stats()["stages"]["test_batch"]["calls"] == 1
+
+        inference.pending = inference.capacity
+        with pytest.raises(InferenceQueueFull):
+            asyncio.run(batcher.submit(2))
+        assert inference.rejected == 1
+    finally:
+        inference.shutdown()
+
+
+def test_a_shed_qa_batch_is_a_503_not_a_fallback_answer(server, client, monkeypatch):
+    async def queue_full(pairs):
+        raise InferenceQueueFull("Inference queue is full")
+
+    monkeypatch.setattr(server._qa_batcher, "submit", queue_full)
+    response = client.post("/chat", json={"query": "What is the punishment for theft of property?", "language": "en"})
+    assert response.status_code == 503
+
+
+def test_network_translation_is_outside_the_compute_admission_limit(server, monkeypatch):
+    assert server._translation_executor is not server._inference
+    monkeypatch.setattr(server._inference, "pending", server._inference.capacity)
+
+    thread = asyncio.run(server._translation_executor.run("translate", lambda: threading.current_thread().name))
+    assert thread.startswith("translation")
+    assert server._inference.rejected == 0
+
+
+def test_native_query_translation_runs_on_the_translation_pool(server, monkeypatch):
+    threads = []
+
+    def translate(query, lang):
+        threads.append(threading.current_thread().name)
+        return query
+
+    monkeypatch.setattr(server, "NATIVE_ANSWER_MODE", "qa")
+    monkeypatch.setattr(server, "_native_alignment_ready", lambda lang: True)
+    monkeypatch.setattr(server, "_translate_query_if_needed", translate)
+    hits = [("BNS", {"id": "BNS_ch6_sec103", "source": "BNS", "text": "जो कोई हत्या करता है, वह दंडित किया जाएगा।"})]
+    asyncio.run(server._answer_native_query("हत्या की सजा?", FakeEmbedder().encode("हत्या की सजा?"), hits, "hi"))
+    assert threads and threads[0].startswith("translation")
+    assert "translate" not in server._inference.stats()["stages"]
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cache import RedisTier, SemanticCache, SQLiteTier, TieredCache, TTLCache, estimate_size
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_ttl_cache_evicts_least_recently_used_beyond_max_bytes():
+    cache = TTLCache("test", max_bytes=3 * estimate_size("x" * 50), ttl=60)
+    for key in "abc":
+        cache.put(key, "x" * 50)
+    cache.get("a")
+    cache.put("d", "x" * 50)
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.bytes <= cache.max_bytes
+    assert cache.evictions >= 1
+
+
+def test_ttl_cache_purges_expired_entries_and_skips_overwritten_ones():
+    cache = TTLCache("test", max_bytes=1 << 20, ttl=60)
+    cache.put("old", 1, ttl=-1)
+    cache.put("kept", 2, ttl=-1)
+    cache.put("kept", 3)
+    assert cache.purge_expired() == 1
+    assert cache.get("old") is None
+    assert cache.get("kept") == 3
+
+
+def test_tiered_cache_promotes_l2_hits_and_survives_l2_failures(tmp_path):
+    l2 = SQLiteTier(tmp_path / "responses.sqlite3", "ns")
+    l2.put("q", {"answer": 1})
+    tiered = TieredCache(TTLCache("l1", 1 << 20, 60), l2)
+    assert tiered.get("q") == {"answer": 1}
+    assert tiered.l1.get("q") == {"answer": 1}
+
+    class Broken:
+        def get(self, key):
+            raise OSError("database is locked")
+
+        def put(self, key, value):
+            raise OSError("database is locked")
+
+    tiered = TieredCache(TTLCache("l1", 1 << 20, 60), Broken())
+    tiered.put("q", 1)
+    tiered.l1.clear()
+    assert tiered.get("q") is None
+
+
+def test_sqlite_tier_keeps_other_namespaces_on_open(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    SQLiteTier(path, "v1").put("q", "old answer")
+    current = SQLiteTier(path, "v2")
+    current.put("q", "new answer")
+    assert current.get("q") == "new answer"
+    # A worker still on the previous index version is unaffected by the new one
+    assert SQLiteTier(path, "v1").get("q") == "old answer"
+
+
+def test_sqlite_tier_purges_expired_rows_of_every_namespace(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    SQLiteTier(path, "v1", ttl=-1).put("q", "stale")
+    tier = SQLiteTier(path, "v2", ttl=60)
+    tier.put("q", "fresh")
+    assert tier.purge_expired() == 1
+    assert tier.stats()["bytes"] == len('"fresh"')
+
+
+def test_sqlite_tier_tracks_bytes_and_evicts_least_recently_used(tmp_path):
+    tier = SQLiteTier(tmp_path / "responses.sqlite3", "ns", max_bytes=1000)
+    tier.put("a", "x" * 300)
+    tier.put("a", "x" * 100)
+    assert tier.stats()["bytes"] == 102
+    tier.put("b", "x" * 400)
+    time.sleep(0.01)
+    assert tier.get("a") is not None
+    tier.put("c", "x" * 300)
+    tier.put("d", "x" * 300)
+    assert tier.get("b") is None
+    assert tier.get("a") is not None
+    stats = tier.stats()
+    assert stats["bytes"] <= 1000
+    assert stats["evictions"] >= 1
+    tier.clear()
+    assert tier.stats()["bytes"] == 0
+
+
+def test_sqlite_tier_batches_access_time_updates(tmp_path):
+    tier = SQLiteTier(tmp_path / "responses.sqlite3", "ns")
+    tier.put("q", "answer")
+    before = tier._db.total_changes
+    for _ in range(tier.TOUCH_BATCH - 1):
+        assert tier.get("q") == "answer"
+    assert tier._db.total_changes == before
+    tier.get("q")
+    assert tier._db.total_changes > before
+
+
+def test_importing_main_opens_no_cache_files(tmp_path):
+    env = dict(os.environ, LEXIBOT_RESPONSE_CACHE="sqlite",
+               LEXIBOT_RESPONSE_CACHE_PATH=str(tmp_path / "responses.sqlite3"),
+               LEXIBOT_TRANSLATION_CACHE=str(tmp_path / "translations.sqlite3"))
+    subprocess.run([sys.executable, "-c", "import main"], cwd=BACKEND, env=env, check=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_semantic_cache_refreshes_a_near_duplicate_instead_of_adding_one():
+    cache = SemanticCache("ns", max_entries=4, threshold=0.95)
+    cache.put("en:*", np.array([1.0, 0.0, 0.0]), "first")
+    cache.put("en:*", np.array([1.0, 0.01, 0.0]), "second")
+    assert cache.stats()["entries"] == {"en:*": 1}
+    assert cache.lookup("en:*", np.array([1.0, 0.0, 0.0])) == "second"
+
+    cache.put("en:*", np.array([0.0, 1.0, 0.0]), "other")
+    assert cache.stats()["entries"] == {"en:*": 2}
+
+
+def test_semantic_cache_evicts_least_recently_used_and_clears_on_namespace_change():
+    cache = SemanticCache("v1", max_entries=2, threshold=0.95)
+    cache.put("en:*", np.array([1.0, 0.0, 0.0]), "a")
+    cache.put("en:*", np.array([0.0, 1.0, 0.0]), "b")
+    assert cache.lookup("en:*", np.array([1.0, 0.0, 0.0])) == "a"
+    cache.put("en:*", np.array([0.0, 0.0, 1.0]), "c")
+    assert cache.lookup("en:*", np.array([0.0, 1.0, 0.0])) is None
+    assert cache.lookup("en:*", np.array([1.0, 0.0, 0.0])) == "a"
+
+    cache.set_namespace("v2")
+    assert cache.lookup("en:*", np.array([1.0, 0.0, 0.0])) is None
+
+
+def test_index_rebuild_switches_every_cache_namespace(server, monkeypatch):
+    for name in ("INDEX_VERSION", "CACHE_NAMESPACE", "_precomputed_answers"):
+        monkeypatch.setattr(server, name, getattr(server, name))
+    monkeypatch.setattr(server._semantic_cache, "namespace", server._semantic_cache.namespace)
+    server._response_cache.put("en:*:q", {"answer": "old"})
+    server._semantic_cache.put("en:*", np.ones(3), {"answer": "old"})
+
+    monkeypatch.setattr(server, "_index_version", lambda: "rebuilt")
+    server._refresh_cache_namespace()
+    assert server.CACHE_NAMESPACE.startswith("rebuilt:")
+    assert server._semantic_cache.namespace == server.CACHE_NAMESPACE
+    assert server._response_cache.get("en:*:q") is None
+    assert server._semantic_cache.lookup("en:*", np.ones(3)) is None
+
+
+def test_sqlite_tier_entries_survive_reopening(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    first = SQLiteTier(path, "ns")
+    first.put("q", {"answer": 1})
+    # Another worker starting (or this one restarting) must not wipe the shared table
+    second = SQLiteTier(path, "ns")
+    assert second.get("q") == {"answer": 1}
+    assert first.get("q") == {"answer": 1}
+    assert SQLiteTier(path, "ns").stats()["bytes"] == first.stats()["bytes"]
+
+
+def test_sqlite_tier_drops_the_first_schema_only_once(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    db = sqlite3.connect(str(path))
+    db.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, value TEXT)")
+    db.commit()
+    db.close()
+
+    SQLiteTier(path, "ns").put("q", 1)
+    tables = {row[0] for row in sqlite3.connect(str(path)).execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "responses" not in tables
+    assert SQLiteTier(path, "ns").get("q") == 1
+
+
+class FakeRedis:
+    """The subset of redis.Redis that RedisTier uses, with expiry times recorded."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8")
+        self.expiry[key] = ex
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.data) if key.startswith(prefix)]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _redis_tier(monkeypatch, client, namespace):
+    module = types.ModuleType("redis")
+    module.Redis = types.SimpleNamespace(from_url=lambda url: client)
+    monkeypatch.setitem(sys.modules, "redis", module)
+    return RedisTier("redis://localhost:6379/0", namespace, ttl=120)
+
+
+def test_redis_tier_namespaces_keys_and_sets_the_ttl(monkeypatch):
+    client = FakeRedis()
+    tier = _redis_tier(monkeypatch, client, "v1")
+    tier.put("en:*:q", {"answer": "ok"})
+    assert client.expiry == {"lexibot:response:v1:en:*:q": 120}
+    assert tier.get("en:*:q") == {"answer": "ok"}
+
+    tier.set_namespace("v2")
+    assert tier.get("en:*:q") is None
+    assert tier.stats() == {"backend": "redis", "hits": 1, "misses": 1}
+
+
+def test_redis_tier_clear_only_touches_its_namespace(monkeypatch):
+    client = FakeRedis()
+    old = _redis_tier(monkeypatch, client, "v1")
+    current = _redis_tier(monkeypatch, client, "v2")
+    old.put("q", 1)
+    current.put("q", 2)
+    current.clear()
+    assert old.get("q") == 1
+    assert current.get("q") is None
+
+
+def test_redis_tier_needs_the_client_library(monkeypatch):
+    monkeypatch.setitem(sys.modules, "redis", None)
+    with pytest.raises(RuntimeError):
+        RedisTier("redis://localhost:6379/0", "ns")
@@ -0,0 +1,29 @@
+QUERY = "What is the punishment for dowry death under the law?"
+
+
+def test_cache_key_includes_dataset_filter(server):
+    assert server._get_cache_key(QUERY, "en") != server._get_cache_key(QUERY, "en", "BSA")
+    assert server._get_cache_key(QUERY, "en", "BSA") != server._get_cache_key(QUERY, "en", "BNS")
+    assert server._get_cache_key(" What ", "en") == server._get_cache_key("what", "en")
+
+
+def test_filtered_request_is_not_served_an_unfiltered_cached_answer(client):
+    unfiltered = client.post("/chat", json={"query": QUERY, "language": "en"})
+    assert unfiltered.status_code == 200
+
+    filtered = client.post("/chat", json={"query": QUERY, "language": "en", "dataset": "BSA"})
+    assert filtered.status_code == 200
+    assert filtered.json()["source_code"] == "BSA"
+    assert all(ref["source"] == "BSA" for ref in filtered.json()["references"])
+
+
+def test_unknown_dataset_is_rejected_even_when_the_query_is_cached(client):
+    assert client.post("/chat", json={"query": QUERY, "language": "en"}).status_code == 200
+
+    response = client.post("/chat", json={"query": QUERY, "language": "en", "dataset": "XYZ"})
+    assert response.status_code == 400
+
+
+def test_unknown_dataset_is_rejected_before_lookup(client):
+    response = client.post("/chat", json={"query": "Section 64 of BNS", "language": "en", "dataset": "XYZ"})
+    assert response.status_code == 400
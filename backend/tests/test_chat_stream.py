@@ -0,0 +1,52 @@
+import json
+
+from inference import InferenceQueueFull
+
+QUERY = "What is the punishment for theft of property?"
+
+
+def _events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_sends_each_stage_then_done(client):
+    response = client.post("/chat/stream", json={"query": QUERY, "language": "en"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response)
+    assert [event for event, _ in events] == ["routing", "references", "answer", "explanation", "done"]
+    done = events[-1][1]
+    assert done["references"] == events[1][1]
+    assert done["explanation"] == events[3][1]["explanation"]
+
+
+def test_streamed_response_fills_the_cache(server, client):
+    done = _events(client.post("/chat/stream", json={"query": QUERY, "language": "en"}))[-1][1]
+    assert server._response_cache.get(server._get_cache_key(QUERY, "en")) == done
+
+    # The repeat is answered from the cache, so only the full response is sent
+    repeat = _events(client.post("/chat/stream", json={"query": QUERY, "language": "en"}))
+    assert repeat == [("done", done)]
+
+
+def test_bad_language_is_an_error_event_with_its_status(client):
+    response = client.post("/chat/stream", json={"query": QUERY, "language": "fr"})
+    assert response.status_code == 400
+    assert _events(response) == [("error", {"status_code": 400, "detail": "Unsupported language: fr"})]
+
+
+def test_failure_after_the_first_stage_ends_the_stream_with_an_error(server, client, monkeypatch):
+    async def queue_full(pairs):
+        raise InferenceQueueFull("Inference queue is full")
+
+    monkeypatch.setattr(server._qa_batcher, "submit", queue_full)
+    response = client.post("/chat/stream", json={"query": QUERY, "language": "en"})
+    events = _events(response)
+    assert [event for event, _ in events] == ["routing", "references", "error"]
+    assert events[-1][1]["status_code"] == 503
+    assert server._response_cache.get(server._get_cache_key(QUERY, "en")) is None
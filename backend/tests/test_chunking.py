@@ -0,0 +1,42 @@
+from ingest_data import MAX_CHUNK_CHARS, chunk_documents, subclause_plan
+
+
+def _section(section_no, clauses, filler):
+    return {"section_no": section_no, "text": "\n".join(f"({n}) {filler}" for n in clauses)}
+
+
+def _documents(filler, sections):
+    return [{"chapter_no": 1, "chapter_title": "Offences", "sections": sections(filler)}]
+
+
+LONG = "x" * (MAX_CHUNK_CHARS // 2)
+SHORT = "x" * 50
+
+
+def test_native_chunks_follow_the_english_split_decision():
+    english = _documents(LONG, lambda f: [_section(1, [1, 2, 3], f), _section(2, [1, 2], SHORT)])
+    # The translation is shorter, yet section 1 must still be split the same way
+    hindi = _documents(SHORT, lambda f: [_section(1, ["१", "२", "३"], f), _section(2, [1, 2], f)])
+
+    plan = subclause_plan(english, "BNS")
+    english_ids = [chunk["id"] for chunk in chunk_documents(english, "BNS", "en")]
+    hindi_ids = [chunk["id"] for chunk in chunk_documents(hindi, "BNS", "hi", plan)]
+    assert english_ids == ["BNS_ch1_sec1_p1", "BNS_ch1_sec1_p2", "BNS_ch1_sec1_p3", "BNS_ch1_sec2"]
+    assert hindi_ids == english_ids
+
+
+def test_mismatched_clauses_keep_the_section_whole():
+    english = _documents(LONG, lambda f: [_section(1, [1, 2], f)])
+    nepali = _documents(SHORT, lambda f: [_section(1, [1], f)])
+    chunks = chunk_documents(nepali, "BNS", "ne", subclause_plan(english, "BNS"))
+    assert [chunk["id"] for chunk in chunks] == ["BNS_ch1_sec1"]
+
+
+def test_repeated_sections_keep_unique_ids():
+    documents = [
+        {"chapter_no": 14, "sections": [_section(254, [1], SHORT), _section(255, [1], SHORT)]},
+        {"chapter_no": 14, "sections": [_section(255, [1], "y" * 50), _section(256, [1], SHORT)]},
+    ]
+    chunks = chunk_documents(documents, "BNS", "ne", {})
+    assert [chunk["id"] for chunk in chunks] == ["BNS_ch14_sec254", "BNS_ch14_sec255", "BNS_ch14_sec256"]
+    assert chunks[1]["text"].endswith(SHORT)
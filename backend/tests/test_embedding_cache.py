@@ -0,0 +1,83 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import ingest_data
+from conftest import FakeEmbedder
+from index_store import write_index
+from ingest_data import content_hash, generate_embeddings, load_embedding_cache
+
+
+class RecordingModel:
+    """Stands in for the SentenceTransformer and records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 768
+
+    def encode(self, texts, batch_size=None, **kwargs):
+        self.encoded.extend(texts)
+        return FakeEmbedder().encode(list(texts))
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = RecordingModel()
+    monkeypatch.setattr(ingest_data, "model", model)
+    # tqdm ships with sentence_transformers; only its progress bar is used here
+    monkeypatch.setitem(sys.modules, "tqdm", types.SimpleNamespace(tqdm=lambda iterable, **kwargs: iterable))
+    return model
+
+
+def _chunks(*texts):
+    return [{"id": f"BNS_ch1_sec{i}", "chapter_title": "Offences", "text": text} for i, text in enumerate(texts, 1)]
+
+
+def _build(tmp_path, chunks):
+    embeddings, texts, metas, _ = generate_embeddings(chunks)
+    write_index(tmp_path, embeddings, texts, metas)
+    return embeddings
+
+
+def test_only_changed_chunks_are_re_encoded(tmp_path, model):
+    before = _build(tmp_path, _chunks("Whoever commits theft", "Whoever commits murder", "Whoever commits robbery"))
+    assert len(model.encoded) == 3
+    model.encoded.clear()
+
+    chunks = _chunks("Whoever commits theft", "Whoever commits culpable homicide", "Whoever commits robbery")
+    embeddings, _, metas, encoded = generate_embeddings(chunks, cache=load_embedding_cache(tmp_path))
+    assert encoded == 1
+    assert model.encoded == ["Offences. Whoever commits culpable homicide"]
+    np.testing.assert_array_equal(embeddings[[0, 2]], before[[0, 2]])
+    np.testing.assert_array_equal(embeddings[1], FakeEmbedder().encode("Offences. Whoever commits culpable homicide"))
+    assert [meta["hash"] for meta in metas] == [chunk["hash"] for chunk in chunks]
+
+
+def test_whitespace_and_unicode_form_edits_hit_the_cache(tmp_path, model):
+    _build(tmp_path, _chunks("\u0958ानून के अनुसार", "Whoever commits murder"))
+    model.encoded.clear()
+
+    # Precomposed and decomposed nukta, and extra spaces, normalize to the same text
+    chunks = _chunks("\u0915\u093cानून  के अनुसार ", "Whoever  commits\nmurder")
+    _, _, _, encoded = generate_embeddings(chunks, cache=load_embedding_cache(tmp_path))
+    assert encoded == 0
+    assert model.encoded == []
+
+
+def test_changing_the_model_invalidates_the_cache():
+    assert content_hash("Whoever commits theft") != content_hash("Whoever commits theft", model_name="another-model")
+
+
+def test_rows_keep_input_order_across_length_sorted_batches(model):
+    chunks = _chunks("short", "a much longer clause about theft of movable property", "mid length clause")
+    embeddings, texts, _, encoded = generate_embeddings(chunks, batch_size=1)
+    assert encoded == 3
+    # Longest first, so similarly sized texts share a batch
+    assert model.encoded[0] == "Offences. a much longer clause about theft of movable property"
+    assert texts == [chunk["text"] for chunk in chunks]
+    for row, chunk in zip(embeddings, chunks):
+        np.testing.assert_array_equal(row, FakeEmbedder().encode(f"Offences. {chunk['text']}"))
@@ -0,0 +1,61 @@
+import pickle
+
+import numpy as np
+
+from index_store import (LEGACY_FILES, SECTION_GRANULARITY, index_version, is_section_level, migrate_legacy_index,
+                         open_index, read_manifest, write_index)
+
+
+def _legacy_index(folder, rows=3):
+    folder.mkdir(parents=True)
+    embeddings = np.random.default_rng(0).standard_normal((rows, 4)).astype(np.float32)
+    np.save(folder / "embeddings.npy", embeddings)
+    texts = [f"text {i}" for i in range(rows)]
+    metas = [{"chapter_no": i, "text": f"text {i}"} for i in range(rows)]
+    with open(folder / "texts.pkl", "wb") as f:
+        pickle.dump(texts, f)
+    with open(folder / "meta.pkl", "wb") as f:
+        pickle.dump(metas, f)
+    return embeddings, texts, metas
+
+
+def test_legacy_index_is_migrated_once_row_for_row(tmp_path):
+    folder = tmp_path / "en" / "BNS"
+    embeddings, texts, metas = _legacy_index(folder)
+
+    manifest = migrate_legacy_index(folder, extra={"lang": "en", "law": "BNS"})
+    assert manifest["migrated_from"] == "pickle"
+    assert manifest["count"] == 3
+    assert not any((folder / name).exists() for name in LEGACY_FILES)
+
+    store = open_index(folder)
+    np.testing.assert_array_equal(store["embeddings"], embeddings)
+    assert list(store["texts"]) == texts
+    assert list(store["metas"]) == metas
+    # A second call finds the manifest and leaves the index alone
+    assert migrate_legacy_index(folder) == manifest
+
+
+def test_index_version_changes_when_an_index_is_rebuilt(tmp_path):
+    folder = tmp_path / "en" / "BNS"
+    _legacy_index(folder)
+    legacy_version = index_version([folder])
+    migrate_legacy_index(folder)
+    migrated_version = index_version([folder])
+    assert migrated_version != legacy_version
+
+    write_index(folder, np.ones((1, 4), dtype=np.float32), ["t"], [{}])
+    assert read_manifest(folder)["count"] == 1
+    assert index_version([folder]) != migrated_version
+
+
+def test_only_ingested_indexes_are_section_level(tmp_path):
+    legacy = tmp_path / "hi" / "BNS"
+    _legacy_index(legacy)
+    assert not is_section_level(migrate_legacy_index(legacy))
+
+    ingested = tmp_path / "hi" / "BNSS"
+    write_index(ingested, np.ones((1, 4), dtype=np.float32), ["t"], [{"id": "BNSS_ch1_sec1"}],
+                extra={"granularity": SECTION_GRANULARITY})
+    assert is_section_level(read_manifest(ingested))
+    assert not is_section_level(None)
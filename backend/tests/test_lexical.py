@@ -0,0 +1,37 @@
+import numpy as np
+
+from lexical import BM25Index, load_or_build_bm25, reciprocal_rank_fusion, tokenize
+
+DOCS = [
+    "Whoever commits murder shall be punished with death or imprisonment for life.",
+    "Whoever commits theft shall be punished with imprisonment which may extend to three years.",
+    "The police officer shall register the first information report of a cognizable offence.",
+]
+
+
+def test_tokenize_drops_stopwords_and_folds_devanagari():
+    assert tokenize("What is the punishment for Murder's victim?") == ["punishment", "murder", "victim"]
+    assert tokenize("धारा १०३ हत्याको सजाय", "ne") == ["धारा", "103", "हत्या", "सजाय"]
+
+
+def test_bm25_ranks_the_document_with_the_query_terms_first():
+    index = BM25Index.build(DOCS)
+    ids, scores = index.search("punishment for murder", k=3)
+    assert ids[0] == 0
+    assert list(scores) == sorted(scores, reverse=True)
+    # Documents sharing no term are not returned
+    assert 2 not in ids
+    assert len(index.search("bail bond", k=3)[0]) == 0
+
+
+def test_bm25_round_trips_through_disk(tmp_path):
+    index = BM25Index.build(DOCS)
+    index.save(tmp_path)
+    loaded = load_or_build_bm25(tmp_path, [], "en")
+    np.testing.assert_allclose(loaded.scores("theft imprisonment"), index.scores("theft imprisonment"))
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+    assert [doc for doc, _ in fused] == [1, 3, 2, 4]
+    assert fused[0][1] == 1 / 61 + 1 / 62
@@ -0,0 +1,47 @@
+from metrics import MetricsRegistry, RequestTrace, register_request_metrics
+
+
+def test_histogram_buckets_are_cumulative_in_the_exposition():
+    registry = MetricsRegistry()
+    registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        registry.observe("latency_seconds", value, stage="qa")
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="qa",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="qa",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{stage="qa",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="qa"} 3' in text
+    assert 'latency_seconds_sum{stage="qa"} 5.55' in text
+
+
+def test_counters_escape_labels_and_collectors_skip_missing_values():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests")
+    registry.inc("requests_total", lang='say "hi"\n')
+    registry.collector(lambda: [("queue_depth", "gauge", "Queued stages", [({"pool": "a"}, 3), ({"pool": "b"}, None)])])
+    text = registry.render()
+    assert 'requests_total{lang="say \\"hi\\"\\n"} 1' in text
+    assert 'queue_depth{pool="a"} 3' in text
+    assert 'pool="b"' not in text
+
+
+def test_request_trace_is_observed_once():
+    registry = MetricsRegistry()
+    register_request_metrics(registry)
+    trace = RequestTrace("hi")
+    with trace.span("search"):
+        pass
+    trace.finish(registry)
+    trace.finish(registry)
+    text = registry.render()
+    assert 'lexibot_requests_total{lang="hi",outcome="answered"} 1' in text
+    assert 'lexibot_stage_seconds_count{dataset="none",lang="hi",stage="search"} 1' in text
+    assert trace.server_timing().startswith("search;dur=")
+
+
+def test_metrics_endpoint_reports_chat_requests(client):
+    assert client.post("/chat", json={"query": "What is the punishment for theft of property?", "language": "en"}).status_code == 200
+    text = client.get("/metrics").text
+    assert 'lexibot_requests_total{lang="en",outcome="answered"}' in text
+    assert "lexibot_batch_size_bucket" in text
@@ -0,0 +1,111 @@
+import asyncio
+import tempfile
+import threading
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import FakeEmbedder, fake_qa
+from inference import InferenceExecutor, InferenceQueueFull
+from model_server import ModelClient, ModelServer, ModelServerError
+
+
+def _app(inference):
+    embedder = FakeEmbedder()
+    return types.SimpleNamespace(
+        _inference=inference,
+        _encode_batch=lambda texts: list(embedder.encode(list(texts))),
+        _qa_batch=lambda groups: [[fake_qa(question, context) for question, context in group] for group in groups],
+        EMBED_BATCH_SIZE=8, EMBED_BATCH_WAIT_MS=0, QA_BATCH_SIZE=8, QA_BATCH_WAIT_MS=0,
+    )
+
+
+async def _cancel_tasks():
+    # Connection handlers and batcher workers still waiting for input
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.fixture
+def serve():
+    """Run a ModelServer's connection handler on a socket in a background event loop."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers, clients = [], []
+    directory = tempfile.TemporaryDirectory()
+
+    def start(inference):
+        # Unix socket paths are limited to ~100 bytes, so not under pytest's tmp_path
+        path = str(Path(directory.name) / "models.sock")
+        model_server = ModelServer(_app(inference), path, [])
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_unix_server(model_server._serve_connection, path=path), loop).result(5)
+        servers.append(server)
+        clients.append(ModelClient(path, timeout=5))
+        return clients[-1]
+
+    yield start
+    for client in clients:
+        client._close()
+    for server in servers:
+        server.close()
+        asyncio.run_coroutine_threadsafe(server.wait_closed(), loop).result(5)
+    asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    directory.cleanup()
+
+
+def test_encode_and_qa_round_trip(serve):
+    inference = InferenceExecutor(workers=1, max_queue=4)
+    client = serve(inference)
+    try:
+        embeddings = client.encode(["theft of property", "murder"])
+        np.testing.assert_allclose(embeddings, FakeEmbedder().encode(["theft of property", "murder"]))
+        assert client.encode("murder").shape == (768,)
+        assert client.answer([("What is theft?", "Whoever intends to take dishonestly")])[0]["score"] == 0.6
+    finally:
+        inference.shutdown()
+
+
+def test_a_full_server_queue_is_raised_as_queue_full(serve):
+    inference = InferenceExecutor(workers=1, max_queue=0)
+    inference.pending = inference.capacity
+    client = serve(inference)
+    try:
+        with pytest.raises(InferenceQueueFull):
+            client.encode(["murder"])
+        assert inference.rejected == 1
+        # The connection stays usable once the server has capacity again
+        inference.pending = 0
+        assert client.encode("murder").shape == (768,)
+    finally:
+        inference.shutdown()
+
+
+def test_other_server_failures_stay_model_server_errors(serve):
+    inference = InferenceExecutor(workers=1, max_queue=4)
+    client = serve(inference)
+    try:
+        with pytest.raises(ModelServerError) as excinfo:
+            client.request({"op": "unknown"})
+        assert not isinstance(excinfo.value, InferenceQueueFull)
+    finally:
+        inference.shutdown()
+
+
+def test_worker_answers_503_when_the_model_server_sheds_load(server, client, monkeypatch):
+    class SheddingClient:
+        def encode(self, texts, **kwargs):
+            raise InferenceQueueFull("Model server queue is full")
+
+    monkeypatch.setattr(server, "_sentence_model", SheddingClient())
+    response = client.post("/chat", json={"query": "What is the punishment for theft of property?", "language": "en"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
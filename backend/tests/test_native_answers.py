@@ -0,0 +1,71 @@
+import asyncio
+
+from conftest import FakeEmbedder, fake_qa
+
+NATIVE_TEXT = "जो कोई हत्या करता है, वह मृत्यु दंड या आजीवन कारावास से दंडित किया जाएगा और जुर्माने का भी दायी होगा।"
+ENGLISH_TEXT = "Whoever commits murder shall be punished with death or imprisonment for life, and shall also be liable to fine."
+HITS = [("BNS", {"id": "BNS_ch6_sec103", "source": "BNS", "text": NATIVE_TEXT})]
+
+
+def _answer(server, query):
+    embedding = FakeEmbedder().encode(query)
+    return asyncio.run(server._answer_native_query(query, embedding, HITS, "hi"))
+
+
+def test_native_qa_reads_the_translated_question(server, monkeypatch):
+    questions = []
+
+    def recording_qa(question, context, **kwargs):
+        questions.extend(question)
+        return fake_qa(question, context)
+
+    monkeypatch.setattr(server, "NATIVE_ANSWER_MODE", "qa")
+    monkeypatch.setattr(server, "_native_alignment_ready", lambda lang: True)
+    monkeypatch.setattr(server, "_qa_pipeline", recording_qa)
+    monkeypatch.setattr(server, "_translate_query_if_needed", lambda query, lang: "What is the punishment for murder?")
+    monkeypatch.setattr(server, "_align_hits_to_english", lambda hits: [{"id": "BNS_ch6_sec103", "text": ENGLISH_TEXT}])
+
+    result = _answer(server, "हत्या के लिए क्या सजा है?")
+    assert questions == ["What is the punishment for murder?"]
+    assert result["meta"] is HITS[0][1]
+
+
+def test_native_query_without_translation_never_reaches_english_qa(server, monkeypatch):
+    def failing_qa(question, context, **kwargs):
+        raise AssertionError("the English QA model got an untranslated question")
+
+    monkeypatch.setattr(server, "NATIVE_ANSWER_MODE", "qa")
+    monkeypatch.setattr(server, "_qa_pipeline", failing_qa)
+    monkeypatch.setattr(server, "_translate_query_if_needed", lambda query, lang: query)
+
+    result = _answer(server, "हत्या के लिए क्या सजा है?")
+    assert result["answer"] in NATIVE_TEXT
+
+
+def test_native_qa_is_disabled_on_chapter_level_indexes(server, client, monkeypatch, caplog):
+    def failing_qa(question, context, **kwargs):
+        raise AssertionError("chapter-level chunks were aligned for QA")
+
+    monkeypatch.setattr(server, "NATIVE_ANSWER_MODE", "qa")
+    monkeypatch.setattr(server, "_qa_pipeline", failing_qa)
+    monkeypatch.setattr(server, "_translate_query_if_needed", lambda query, lang: "What is the punishment for murder?")
+    monkeypatch.setattr(server, "_alignment_disabled_langs", set())
+
+    # The shipped indexes are migrated chapter-level pickles
+    assert not server._load_language_index("hi")["section_level"]
+    for _ in range(2):
+        result = _answer(server, "हत्या के लिए क्या सजा है?")
+        assert result["answer"] in NATIVE_TEXT
+    assert len([r for r in caplog.records if "NATIVE QA DISABLED for hi" in r.getMessage()]) == 1
+    assert client.get("/health").json()["native_answers"]["qa_disabled_langs"] == ["hi"]
+
+
+def test_native_alignment_needs_section_level_indexes_in_both_languages(server, monkeypatch):
+    monkeypatch.setattr(server, "_alignment_disabled_langs", set())
+    levels = {"en": True, "hi": True, "ne": False}
+    monkeypatch.setattr(server, "_load_language_index", lambda lang: {"section_level": levels[lang]})
+    assert server._native_alignment_ready("hi")
+    assert not server._native_alignment_ready("ne")
+
+    levels["en"] = False
+    assert not server._native_alignment_ready("hi")
@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import ingest_data
+from cache import PrecomputedAnswers, normalize_query, write_precomputed_answers
+
+BACKEND = Path(__file__).resolve().parents[1]
+RESPONSE = {
+    "language": "en",
+    "title": "Murder (BNS)",
+    "explanation": "Whoever commits murder shall be punished with death or imprisonment for life.",
+    "penalties": [],
+    "references": [],
+    "disclaimer": "This is for educational purposes, not legal advice.",
+    "source_code": "BNS",
+    "source_name": "Bharatiya Nyaya Sanhita",
+}
+
+
+@pytest.mark.parametrize("query, normalized", [
+    ("What is the punishment for murder?", "what is the punishment for murder"),
+    ("  what IS the punishment  for murder ", "what is the punishment for murder"),
+    ("section_103, BNS!", "section 103 bns"),
+    # Vowel signs are combining marks, so they must survive the punctuation pass
+    ("हत्या के लिए क्या सजा है?", "हत्या के लिए क्या सजा है"),
+    ("BNS मा हत्याको सजाय?", "bns मा हत्याको सजाय"),
+])
+def test_normalize_query(query, normalized):
+    assert normalize_query(query) == normalized
+
+
+def test_answers_are_served_on_a_normalized_match(tmp_path):
+    path = tmp_path / "answers.json"
+    write_precomputed_answers(path, "v1", {"en": {"What is the punishment for murder?": RESPONSE}})
+    answers = PrecomputedAnswers(path, "v1")
+    assert answers.stats()["status"] == "loaded"
+    assert answers.get("en", "what is the punishment for MURDER") == RESPONSE
+    assert answers.get("hi", "What is the punishment for murder?") is None
+    assert answers.get("en", "What is the punishment for theft?") is None
+    assert answers.stats()["hits"] == 1
+    assert answers.stats()["misses"] == 2
+
+
+def test_an_artifact_from_another_namespace_is_ignored(tmp_path):
+    path = tmp_path / "answers.json"
+    write_precomputed_answers(path, "old-index:hybrid", {"en": {"What is murder?": RESPONSE}})
+    answers = PrecomputedAnswers(path, "new-index:hybrid")
+    assert answers.stats()["status"] == "stale"
+    assert answers.get("en", "What is murder?") is None
+
+
+@pytest.mark.parametrize("content, status", [
+    (None, "missing"),
+    ("{not json", "unreadable"),
+    (json.dumps({"format_version": 0, "namespace": "v1", "answers": {"en": {"q": RESPONSE}}}), "stale"),
+])
+def test_unusable_artifacts_serve_nothing(tmp_path, content, status):
+    path = tmp_path / "answers.json"
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    answers = PrecomputedAnswers(path, "v1")
+    assert answers.stats()["status"] == status
+    assert answers.get("en", "q") is None
+
+
+def test_disabled_without_a_path():
+    assert PrecomputedAnswers(None, "v1").stats()["status"] == "disabled"
+
+
+@pytest.fixture
+def precomputed(server, monkeypatch, tmp_path):
+    path = tmp_path / "answers.json"
+    write_precomputed_answers(path, server.CACHE_NAMESPACE, {"en": {"What is the punishment for murder?": RESPONSE}})
+    for name in ("INDEX_VERSION", "CACHE_NAMESPACE"):
+        monkeypatch.setattr(server, name, getattr(server, name))
+    monkeypatch.setattr(server._semantic_cache, "namespace", server._semantic_cache.namespace)
+    monkeypatch.setattr(server, "_precomputed_answers", PrecomputedAnswers(path, server.CACHE_NAMESPACE))
+    return path
+
+
+def test_chat_serves_a_precomputed_answer_without_the_models(server, client, precomputed, monkeypatch):
+    def no_models(*args, **kwargs):
+        raise AssertionError("a precomputed answer reached the models")
+
+    monkeypatch.setattr(server, "_sentence_model", type("NoModel", (), {"encode": no_models})())
+    response = client.post("/chat", json={"query": "what is the punishment for murder", "language": "en"})
+    assert response.status_code == 200
+    assert response.json()["title"] == RESPONSE["title"]
+
+
+def test_index_rebuild_makes_the_precomputed_answers_stale(server, client, precomputed, monkeypatch):
+    monkeypatch.setattr(server, "_index_version", lambda: "rebuilt")
+    server._refresh_cache_namespace()
+    assert server._precomputed_answers.stats()["status"] == "stale"
+
+    response = client.post("/chat", json={"query": "What is the punishment for murder?", "language": "en"})
+    assert response.status_code == 200
+    assert response.json()["title"] != RESPONSE["title"]
+
+
+def test_canonical_questions_come_from_the_shared_data_file(monkeypatch):
+    monkeypatch.chdir(BACKEND.parent)
+    questions = ingest_data.load_canonical_questions()
+    assert set(questions) == {"en", "hi", "ne"}
+    assert all(len(lang_questions) == 20 for lang_questions in questions.values())
+
+
+def test_onnx_parity_check_reads_the_same_questions(monkeypatch):
+    import onnx_backend
+
+    monkeypatch.chdir(BACKEND.parent)
+    assert onnx_backend.CANONICAL_QUESTIONS.resolve() == ingest_data.CANONICAL_QUESTIONS.resolve()
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pytest
+
+from registry import FAILED, LOADING, PENDING, READY, ComponentRegistry, estimate_nbytes
+
+
+def test_required_components_start_pending_and_block_readiness():
+    registry = ComponentRegistry(required=["model:embedder", "index:en/BNS"])
+    assert not registry.ready
+    assert registry.not_ready() == {"index:en/BNS": PENDING, "model:embedder": PENDING}
+
+
+def test_track_moves_a_component_through_loading_to_ready():
+    registry = ComponentRegistry(required=["model:embedder"])
+    with registry.track("model:embedder") as component:
+        assert component.state == LOADING
+        assert not registry.ready
+        component.memory_bytes = 1024
+    snapshot = registry.snapshot()["model:embedder"]
+    assert snapshot["state"] == READY
+    assert snapshot["memory_bytes"] == 1024
+    assert snapshot["load_seconds"] is not None
+    assert snapshot["loaded_at"] is not None
+    assert registry.ready
+
+
+def test_a_failed_load_records_the_error_and_can_be_retried():
+    registry = ComponentRegistry(required=["model:qa"])
+    with pytest.raises(OSError):
+        with registry.track("model:qa"):
+            raise OSError("weights not found")
+    assert registry.snapshot()["model:qa"]["state"] == FAILED
+    assert registry.snapshot()["model:qa"]["last_error"] == "weights not found"
+    assert registry.not_ready() == {"model:qa": FAILED}
+
+    with registry.track("model:qa"):
+        pass
+    assert registry.ready
+
+
+def test_optional_components_do_not_gate_readiness():
+    registry = ComponentRegistry(required=["model:embedder"])
+    with registry.track("model:embedder"):
+        pass
+    with pytest.raises(RuntimeError):
+        with registry.track("translation"):
+            raise RuntimeError("no network")
+    assert registry.ready
+    assert registry.snapshot()["translation"]["state"] == FAILED
+
+    # Registering a tracked component as required later makes it count
+    registry.register("translation", required=True)
+    assert not registry.ready
+
+
+def test_concurrent_registration_keeps_one_component_per_name():
+    registry = ComponentRegistry()
+    threads = [threading.Thread(target=registry.register, args=("index:hi/BNS",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert list(registry.snapshot()) == ["index:hi/BNS"]
+
+
+def test_estimate_nbytes_counts_nested_arrays():
+    component = {"embeddings": np.zeros((4, 8), dtype=np.float32), "meta": [np.zeros(3, dtype=np.int64), "text"]}
+    assert estimate_nbytes(component) == 4 * 8 * 4 + 3 * 8
+
+
+@pytest.fixture
+def registry(server, monkeypatch):
+    registry = ComponentRegistry(required=["model:embedder", "lang_index:en"])
+    monkeypatch.setattr(server, "_registry", registry)
+    return registry
+
+
+def test_probes_while_components_are_loading(client, registry):
+    with registry.track("model:embedder"):
+        ready = client.get("/ready")
+        assert ready.status_code == 503
+        assert ready.json()["components"] == {"model:embedder": LOADING, "lang_index:en": PENDING}
+        assert client.get("/live").status_code == 200
+        assert client.get("/health").json()["status"] == "degraded"
+
+
+def test_probes_after_a_component_failed(client, registry):
+    with registry.track("model:embedder"):
+        pass
+    with pytest.raises(OSError):
+        with registry.track("lang_index:en"):
+            raise OSError("index missing")
+
+    ready = client.get("/ready")
+    assert ready.status_code == 503
+    assert ready.json()["components"] == {"lang_index:en": FAILED}
+    assert client.get("/live").status_code == 200
+    health = client.get("/health").json()
+    assert health["ready"] is False
+    assert health["components"]["lang_index:en"]["last_error"] == "index missing"
+
+
+def test_probes_once_everything_is_loaded(client, registry):
+    for name in ("model:embedder", "lang_index:en"):
+        with registry.track(name):
+            pass
+    assert client.get("/ready").json() == {"status": "ready"}
+    assert client.get("/live").status_code == 200
+    health = client.get("/health").json()
+    assert health["status"] == "ok"
+    assert health["components"]["model:embedder"]["state"] == READY
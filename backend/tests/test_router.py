@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pytest
+
+from conftest import FakeEmbedder
+from index_store import CENTROID_FILE, compute_centroid, l2_normalize, write_index
+from router import DatasetRouter
+
+DATASETS = ["BNS", "BSA", "BNSS"]
+QUERY = "What is the punishment for theft of property?"
+
+
+def _unit(i, dim=8):
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+class AxisEncoder:
+    """Description i embeds to axis i, so descriptions alone favour no query in particular."""
+
+    def encode(self, texts):
+        return np.stack([_unit(3 + i) for i in range(len(texts))])
+
+
+def _router(description_weight=0.5):
+    router = DatasetRouter(DATASETS, description_weight=description_weight)
+    router.fit_descriptions(AxisEncoder())
+    return router
+
+
+def test_route_picks_the_dataset_with_the_nearest_centroid():
+    router = _router(description_weight=0.0)
+    for i, dataset in enumerate(DATASETS):
+        router.set_centroid("en", dataset, _unit(i) * 5)
+
+    best, scores = router.route(_unit(1) + 0.1 * _unit(0), "en")
+    assert best == "BSA"
+    assert scores["BSA"] > scores["BNS"] > scores["BNSS"]
+    assert set(scores) == set(DATASETS)
+
+
+def test_centroids_are_per_language_and_replacing_one_rebuilds_the_matrix():
+    router = _router(description_weight=0.0)
+    for i, dataset in enumerate(DATASETS):
+        router.set_centroid("en", dataset, _unit(i))
+        router.set_centroid("hi", dataset, _unit(2 - i))
+    assert router.route(_unit(0), "en")[0] == "BNS"
+    assert router.route(_unit(0), "hi")[0] == "BNSS"
+
+    router.set_centroid("en", "BNSS", _unit(0) * 2 + _unit(2))
+    assert router.route(_unit(2), "en")[0] == "BNSS"
+
+
+def test_a_dataset_without_a_centroid_falls_back_to_its_description():
+    router = _router(description_weight=0.0)
+    router.set_centroid("en", "BNS", _unit(0))
+    # BSA and BNSS have no centroid, so their description vectors (axes 4 and 5) stand in
+    assert router.route(_unit(4), "en")[0] == "BSA"
+    assert router.route(_unit(0), "en")[0] == "BNS"
+
+
+def test_route_before_the_descriptions_are_embedded_fails():
+    with pytest.raises(RuntimeError):
+        DatasetRouter(DATASETS).route(_unit(0), "en")
+
+
+def test_index_without_a_centroid_file_registers_the_computed_centroid(server, monkeypatch, tmp_path):
+    embeddings = FakeEmbedder().encode(["theft of movable property", "dishonest taking of property"])
+    folder = tmp_path / "en" / "BNS"
+    write_index(folder, embeddings, ["a", "b"], [{"id": "BNS_ch17_sec303"}, {"id": "BNS_ch17_sec304"}])
+    (folder / CENTROID_FILE).unlink()
+
+    router = DatasetRouter(DATASETS)
+    monkeypatch.setattr(server, "INDEX_DIR", tmp_path)
+    monkeypatch.setattr(server, "_router", router)
+    monkeypatch.setattr(server, "_indexes", {})
+    server._load_index("en", "BNS")
+    np.testing.assert_allclose(router._centroids["en"]["BNS"], l2_normalize(compute_centroid(embeddings)), rtol=1e-6)
+
+
+def _routing_event(client, **body):
+    response = client.post("/chat/stream", json={"query": QUERY, "language": "en", **body})
+    block = response.text.split("\n\n")[0]
+    event, data = (line.split(": ", 1)[1] for line in block.splitlines())
+    assert event == "routing"
+    return json.loads(data)
+
+
+def test_routing_is_skipped_on_the_hot_path(server, client, monkeypatch):
+    def no_routing(*args, **kwargs):
+        raise AssertionError("the router ran without LEXIBOT_ROUTING_DEBUG")
+
+    monkeypatch.setattr(server, "_determine_best_dataset", no_routing)
+    assert _routing_event(client) == {"query": QUERY, "dataset": None, "routing_scores": {}}
+
+
+def test_debug_routing_reports_the_router_scores(server, client, monkeypatch):
+    monkeypatch.setattr(server, "ROUTING_DEBUG", True)
+    monkeypatch.setattr(server, "_router", DatasetRouter(DATASETS))
+    routing = _routing_event(client)
+    assert routing["dataset"] in DATASETS
+    assert set(routing["routing_scores"]) == set(DATASETS)
+
+    response = client.post("/chat", json={"query": "Who can be a witness in court?", "language": "en"})
+    assert set(response.json()["routing_scores"]) == set(DATASETS)
+
+
+def test_a_dataset_filter_replaces_routing(server, client, monkeypatch):
+    def no_routing(*args, **kwargs):
+        raise AssertionError("a filtered request was routed")
+
+    monkeypatch.setattr(server, "ROUTING_DEBUG", True)
+    monkeypatch.setattr(server, "_determine_best_dataset", no_routing)
+    assert _routing_event(client, dataset="bsa")["dataset"] == "BSA"
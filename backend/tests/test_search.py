@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from search import DenseSearcher, top_k, top_k_batch
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 50, 200])
+def test_top_k_matches_a_full_sort(k):
+    scores = np.random.default_rng(k).standard_normal(100).astype(np.float32)
+    expected = np.argsort(-scores, kind="stable")[:k]
+    np.testing.assert_array_equal(top_k(scores, k), expected)
+
+
+def test_top_k_keeps_ties_in_row_order():
+    scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1], dtype=np.float32)
+    assert list(top_k(scores, 5)) == [1, 3, 0, 2, 4]
+
+
+def test_top_k_batch_agrees_with_top_k_per_row():
+    scores = np.random.default_rng(1).standard_normal((4, 30)).astype(np.float32)
+    indices, best = top_k_batch(scores, 7)
+    for row in range(4):
+        np.testing.assert_array_equal(indices[row], top_k(scores[row], 7))
+        np.testing.assert_array_equal(best[row], scores[row][indices[row]])
+    assert top_k_batch(scores, 0)[0].shape == (4, 0)
+
+
+def test_dense_search_applies_mask_and_threshold():
+    rows = np.eye(4, dtype=np.float32) * 3
+    searcher = DenseSearcher(rows)
+    query = np.array([1.0, 0.5, 0.0, 0.0], dtype=np.float32)
+
+    ids, scores = searcher.search(query, k=4)
+    assert list(ids[:2]) == [0, 1]
+    assert scores[0] == pytest.approx(1 / np.sqrt(1.25))
+
+    ids, _ = searcher.search(query, k=4, mask=np.array([False, True, True, True]))
+    assert 0 not in ids
+
+    ids, _ = searcher.search(query, k=4, threshold=0.5)
+    assert list(ids) == [0]
+
+    batched = searcher.search_batch(np.stack([query, query]), k=2)
+    np.testing.assert_array_equal(batched[1][0], searcher.search(query, k=2)[0])
@@ -0,0 +1,61 @@
+import pytest
+
+from section_lookup import parse_reference
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Section 103 of BNS", {"kind": "section", "number": 103, "law": "BNS"}),
+    ("BNSS 35", {"kind": "section", "number": 35, "law": "BNSS"}),
+    ("धारा १०३", {"kind": "section", "number": 103, "law": None}),
+    ("chapter 5 of the Bharatiya Sakshya Adhiniyam", {"kind": "chapter", "number": 5, "law": "BSA"}),
+    ("भारतीय साक्ष्य अधिनियम की धारा 23", {"kind": "section", "number": 23, "law": "BSA"}),
+])
+def test_parse_reference(query, expected):
+    assert parse_reference(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "section 302 of IPC",
+    "Section 154 of CrPC",
+    "u/s 420 IPC",
+    "section 65B of the Indian Evidence Act",
+    "section 5 of the Dowry Prohibition Act",
+    "दहेज प्रतिषेध अधिनियम की धारा 3",
+])
+def test_other_laws_are_not_looked_up_in_the_new_codes(query):
+    assert parse_reference(query) is None
+
+
+def test_other_law_queries_skip_the_lookup(server):
+    assert server._reference_lookup_response("section 302 of IPC", "en") is None
+    assert server._reference_lookup_response("section 5 of the Dowry Prohibition Act", "en") is None
+
+
+def test_no_reference_without_a_number():
+    assert parse_reference("What is the punishment for theft?") is None
+
+
+def test_evidence_alone_does_not_select_bsa():
+    # "साक्ष्य" is the ordinary word for evidence, not the act's name
+    assert parse_reference("धारा 64 में साक्ष्य क्या है")["law"] is None
+
+
+def test_lookup_respects_dataset_filter(server):
+    assert server._reference_lookup_response("Section 64 of BNS", "en", "BSA") is None
+    response = server._reference_lookup_response("Section 64", "en", "BSA")
+    assert response.source_code == "BSA"
+    assert "64" in response.title
+    assert server._reference_lookup_response("Section 64 of BNS", "en", "BNS").source_code == "BNS"
+
+
+def test_lookup_titles_use_the_localized_section_label(server):
+    response = server._reference_lookup_response("BNS धारा 64", "hi")
+    assert response is not None
+    assert "Section" not in response.title
+    assert "धारा 64" in response.title
+
+
+def test_filtered_reference_query_does_not_return_another_law(client):
+    response = client.post("/chat", json={"query": "Section 64 of BNS", "language": "en", "dataset": "BSA"})
+    assert response.status_code == 200
+    assert response.json()["source_code"] != "BNS"
@@ -0,0 +1,152 @@
+import sys
+import types
+
+import pytest
+
+from translation import (LOCAL_TRANSLATION_MODEL, GoogleBackend, LocalBackend, PassthroughBackend, TranslationCache,
+                         TranslationService, is_in_language_script)
+
+
+class RecordingBackend:
+    name = "recording"
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def translate_batch(self, texts, src, dest):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise ConnectionError("translation service unreachable")
+        return [f"{dest}:{text}" for text in texts]
+
+
+def _service(backend="google", cache=None, fail=False):
+    service = TranslationService(backend, cache or TranslationCache())
+    service._backend = RecordingBackend(fail=fail)
+    return service
+
+
+def _fake_googletrans(monkeypatch):
+    class Translator:
+        def translate(self, texts, src, dest):
+            return [types.SimpleNamespace(text=f"{dest}:{text}") for text in texts]
+
+    monkeypatch.setitem(sys.modules, "googletrans", types.SimpleNamespace(Translator=Translator))
+
+
+def _fake_transformers(monkeypatch, calls):
+    def pipeline(task, model, device):
+        def translate(texts, **kwargs):
+            calls.append((task, model, kwargs))
+            return [{"translation_text": f"{kwargs['tgt_lang']}:{text}"} for text in texts]
+        return translate
+
+    monkeypatch.setitem(sys.modules, "transformers", types.SimpleNamespace(pipeline=pipeline))
+
+
+def test_backend_selection(monkeypatch):
+    assert isinstance(TranslationService("none").load(), PassthroughBackend)
+
+    _fake_googletrans(monkeypatch)
+    google = TranslationService("google")
+    assert isinstance(google.load(), GoogleBackend)
+    assert google.load() is google.load()
+    assert google.translate("हत्या", "hi", "en") == "en:हत्या"
+
+    calls = []
+    _fake_transformers(monkeypatch, calls)
+    local = TranslationService("local")
+    assert isinstance(local.load(), LocalBackend)
+    assert local.translate("murder", "en", "ne") == "npi_Deva:murder"
+    assert calls[0][:2] == ("translation", LOCAL_TRANSLATION_MODEL)
+    assert calls[0][2]["src_lang"] == "eng_Latn"
+
+    with pytest.raises(ValueError):
+        TranslationService("deepl")
+
+
+def test_missing_backend_libraries_raise_on_load(monkeypatch):
+    monkeypatch.setitem(sys.modules, "googletrans", None)
+    monkeypatch.setitem(sys.modules, "transformers", None)
+    with pytest.raises(RuntimeError):
+        TranslationService("google").load()
+    with pytest.raises(RuntimeError):
+        TranslationService("local").load()
+
+
+def test_passthrough_cases_never_reach_a_backend():
+    service = _service("none")
+    assert service.translate_batch(["हत्या"], "hi", "en") == ["हत्या"]
+    service = _service("google")
+    assert service.translate("murder", "en", "en") == "murder"
+    assert service._backend.calls == []
+
+
+def test_cached_translations_are_not_sent_again():
+    service = _service()
+    assert service.translate("हत्या की सजा", "hi", "en") == "en:हत्या की सजा"
+    assert service.translate_batch(["हत्या की सजा", "चोरी", ""], "hi", "en") == ["en:हत्या की सजा", "en:चोरी", ""]
+    # Only the uncached, non-empty text went to the backend, in one batch
+    assert service._backend.calls == [["हत्या की सजा"], ["चोरी"]]
+    assert service.cache.stats()["hits"] == 1
+
+
+def test_cache_keys_separate_directions_and_backends():
+    cache = TranslationCache()
+    google = _service("google", cache)
+    google.translate("दंड", "hi", "en")
+    google.translate("दंड", "ne", "en")
+    assert len(google._backend.calls) == 2
+
+    local = _service("local", cache)
+    local.translate("दंड", "hi", "en")
+    assert local._backend.calls == [["दंड"]]
+
+
+def test_translations_persist_across_restarts(tmp_path):
+    path = tmp_path / "translations.sqlite3"
+    _service(cache=TranslationCache(path=path)).translate("हत्या", "hi", "en")
+
+    restarted = _service(cache=TranslationCache(path=path))
+    assert restarted.translate("हत्या", "hi", "en") == "en:हत्या"
+    assert restarted._backend.calls == []
+
+
+def test_translation_cache_lru_keeps_recent_entries():
+    cache = TranslationCache(max_entries=2)
+    cache.put_many({"a": "1", "b": "2"})
+    assert cache.get("a") == "1"
+    cache.put_many({"c": "3"})
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2}
+
+
+def test_a_failed_translation_is_not_cached():
+    service = _service(fail=True)
+    with pytest.raises(ConnectionError):
+        service.translate("हत्या", "hi", "en")
+    service._backend.fail = False
+    assert service.translate("हत्या", "hi", "en") == "en:हत्या"
+
+
+def test_server_falls_back_to_the_untranslated_text(server, monkeypatch):
+    monkeypatch.setattr(server, "_translation", _service(fail=True))
+    assert server._translate_query_if_needed("हत्या की सजा क्या है?", "hi") == "हत्या की सजा क्या है?"
+    assert server._translate_answer_if_needed("death or imprisonment for life", "hi") == "death or imprisonment for life"
+
+    monkeypatch.setattr(server, "_translation", _service())
+    assert server._translate_query_if_needed("हत्या की सजा क्या है?", "hi") == "en:हत्या की सजा क्या है?"
+    # Answers already in the user's script are never translated
+    assert server._translate_answer_if_needed("मृत्यु दंड", "hi") == "मृत्यु दंड"
+
+
+@pytest.mark.parametrize("text, lang, expected", [
+    ("हत्या की सजा क्या है?", "hi", True),
+    ("What is the punishment for murder?", "hi", False),
+    ("What is the punishment for murder?", "en", True),
+    ("BNS मा हत्याको सजाय?", "ne", True),
+])
+def test_is_in_language_script(text, lang, expected):
+    assert is_in_language_script(text, lang) is expected
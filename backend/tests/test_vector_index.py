@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pytest
+
+import vector_index
+from index_store import l2_normalize
+from vector_index import BruteForceIndex, HNSWIndex, ShardedIndex, load_vector_index
+
+
+def _rows(n, dim=8, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def test_normalized_matrix_covers_every_shard_in_row_order():
+    first, second = _rows(3, seed=1), _rows(2, seed=2)
+    index = ShardedIndex([
+        (3, BruteForceIndex(second), np.full(2, 1, dtype=np.int8)),
+        (0, BruteForceIndex(first), np.full(3, 0, dtype=np.int8)),
+    ])
+    matrix = index.normalized_matrix()
+    assert matrix.shape == (5, 8)
+    np.testing.assert_allclose(matrix, l2_normalize(np.concatenate([first, second])), rtol=1e-6)
+
+
+def test_normalized_matrix_of_one_shard_is_not_copied():
+    brute = BruteForceIndex(_rows(4))
+    assert ShardedIndex([(0, brute, np.zeros(4, dtype=np.int8))]).normalized_matrix() is brute.matrix
+
+
+def test_normalized_matrix_needs_exact_shards():
+    class GraphIndex:
+        name = "hnsw"
+
+    with pytest.raises(ValueError):
+        ShardedIndex([(0, GraphIndex(), np.zeros(4, dtype=np.int8))]).normalized_matrix()
+
+
+def test_sharded_search_filters_by_dataset():
+    rows = _rows(6)
+    dataset_ids = np.array([0, 0, 0, 1, 1, 1], dtype=np.int8)
+    index = ShardedIndex([(0, BruteForceIndex(rows), dataset_ids)])
+    ids, scores = index.search(rows[4], k=3, dataset_id=1)
+    assert ids[0] == 4
+    assert set(ids) <= {3, 4, 5}
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+requires_hnswlib = pytest.mark.skipif(vector_index.hnswlib is None, reason="hnswlib is not installed")
+
+
+class EfRecorder:
+    """Wraps an hnswlib index and records every set_ef call."""
+
+    def __init__(self, index):
+        self._index = index
+        self.ef_calls = []
+
+    def set_ef(self, ef):
+        self.ef_calls.append(ef)
+        self._index.set_ef(ef)
+
+    def __getattr__(self, name):
+        return getattr(self._index, name)
+
+
+@requires_hnswlib
+def test_hnsw_ef_is_set_once_to_cover_the_largest_k():
+    built = HNSWIndex.build(_rows(50), ef_search=8, max_k=20)
+    assert built.params["ef_search"] == 20
+
+    index = HNSWIndex(EfRecorder(built._index), built.params, max_k=20)
+    threads = [threading.Thread(target=index.search, args=(row, 20)) for row in _rows(8, seed=3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Searches never touch ef, however many threads run them
+    assert index._index.ef_calls == [20]
+
+
+@requires_hnswlib
+def test_hnsw_search_above_ef_still_returns_k_rows():
+    rows = _rows(40)
+    index = HNSWIndex.build(rows, ef_search=4)
+    ids, scores = index.search(rows[7], k=10)
+    assert len(ids) == 10
+    assert ids[0] == 7
+    assert index.params["ef_search"] == 4
+
+
+@requires_hnswlib
+def test_hnsw_graph_with_a_different_row_count_is_rebuilt(tmp_path, caplog):
+    rows = _rows(30)
+    HNSWIndex.build(rows[:20], ef_search=16).save(tmp_path)
+    with pytest.raises(ValueError):
+        HNSWIndex.load(tmp_path, dim=8, count=30)
+
+    index = load_vector_index("hnsw", tmp_path, rows, ef_search=16, max_k=20)
+    assert len(index) == 30
+    assert index.params["ef_search"] == 20
+    assert "elements but the index has 30 rows" in caplog.text
+    assert index.search(rows[25], k=1)[0][0] == 25
+
+
+@requires_hnswlib
+def test_hnsw_graph_matching_the_embeddings_is_loaded(tmp_path):
+    rows = _rows(30)
+    HNSWIndex.build(rows, M=8, ef_search=16).save(tmp_path)
+    index = load_vector_index("hnsw", tmp_path, rows, ef_search=32, max_k=20)
+    assert len(index) == 30
+    assert index.params["M"] == 8
+    assert index.params["ef_search"] == 32
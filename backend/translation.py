@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pluggable translation between English and Hindi/Nepali:
+#   "google"  googletrans (network; the original behaviour)
+#   "local"   a CPU seq2seq model through transformers (NLLB-200 distilled by default),
+#             for nodes without internet access
+#   "none"    no translation; text is passed through unchanged
+# Every backend sits behind an in-memory LRU and an optional SQLite cache, so a
+# query or answer is translated once per (backend, model, direction).
+TRANSLATION_BACKENDS = ("google", "local", "none")
+LOCAL_TRANSLATION_MODEL = "facebook/nllb-200-distilled-600M"
+NLLB_LANG_CODES = {"en": "eng_Latn", "hi": "hin_Deva", "ne": "npi_Deva"}
+DEVANAGARI_LANGS = {"hi", "ne"}
+
+
+def devanagari_ratio(text: str) -> float:
+    """Share of letters in ``text`` that are Devanagari."""
+    letters = [ch for ch in text if ch.isalpha() or unicodedata.category(ch) in ("Mn", "Mc")]
+    if not letters:
+        return 0.0
+    return sum(1 for ch in letters if "ऀ" <= ch <= "ॿ") / len(letters)
+
+
+def is_in_language_script(text: str, lang: str) -> bool:
+    """True when ``text`` is already written in the script of ``lang`` (no translation needed)."""
+    ratio = devanagari_ratio(text)
+    return ratio >= 0.5 if lang in DEVANAGARI_LANGS else ratio < 0.5
+
+
+class GoogleBackend:
+    name = "google"
+
+    def __init__(self):
+        try:
+            from googletrans import Translator
+        except ImportError:
+            raise RuntimeError("googletrans is not installed; use another translation backend")
+        self._client = Translator()
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        results = self._client.translate(texts, src=src, dest=dest)
+        return [result.text for result in results]
+
+
+class LocalBackend:
+    """Seq2seq translation model running on CPU; one generate call per batch."""
+
+    name = "local"
+
+    def __init__(self, model_name: str = LOCAL_TRANSLATION_MODEL, max_length: int = 512):
+        try:
+            from transformers import pipeline
+        except ImportError:
+            raise RuntimeError("transformers is not installed; the local translation backend needs it")
+        self.model_name = model_name
+        self.max_length = max_length
+        self._pipeline = pipeline("translation", model=model_name, device="cpu")
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        results = self._pipeline(
+            texts,
+            src_lang=NLLB_LANG_CODES.get(src, src),
+            tgt_lang=NLLB_LANG_CODES.get(dest, dest),
+            max_length=self.max_length,
+            batch_size=len(texts),
+        )
+        return [result["translation_text"] for result in results]
+
+
+class PassthroughBackend:
+    name = "none"
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        return list(texts)
+
+
+class TranslationCache:
+    """LRU in front of an optional SQLite table of translations."""
+
+    def __init__(self, max_entries: int = 2048, path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self.open(path)
+        self.hits = 0
+        self.misses = 0
+
+    def open(self, path: Path):
+        """Back the LRU with the SQLite table at ``path`` (created if missing); a no-op once open."""
+        with self._lock:
+            if self._db is not None:
+                return
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            db.commit()
+            self._db = db
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT text FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put_many(self, items: Dict[str, str]):
+        with self._lock:
+            for key, text in items.items():
+                self._remember(key, text)
+            if self._db is not None and items:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations (key, text, created) VALUES (?, ?, ?)",
+                    [(key, text, now) for key, text in items.items()],
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+
+class TranslationService:
+    """Cached, batched translation through one of TRANSLATION_BACKENDS.
+
+    The backend is created on first use (the local model is large), or
+    eagerly with ``load()``.
+    """
+
+    def __init__(self, backend: str = "google", cache: Optional[TranslationCache] = None,
+                 local_model: str = LOCAL_TRANSLATION_MODEL):
+        if backend not in TRANSLATION_BACKENDS:
+            raise ValueError(f"Unknown translation backend: {backend}")
+        self.backend_name = backend
+        self.local_model = local_model
+        self.cache = cache or TranslationCache()
+        self._backend = None
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        if self._backend is None:
+            with self._load_lock:
+                if self._backend is None:
+                    if self.backend_name == "google":
+                        self._backend = GoogleBackend()
+                    elif self.backend_name == "local":
+                        self._backend = LocalBackend(self.local_model)
+                    else:
+                        self._backend = PassthroughBackend()
+        return self._backend
+
+    def _key(self, text: str, src: str, dest: str) -> str:
+        model = self.local_model if self.backend_name == "local" else self.backend_name
+        normalized = unicodedata.normalize("NFC", text).strip()
+        return hashlib.sha256(f"{model}\0{src}\0{dest}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """Translate ``texts``; cached texts are served from the cache, the rest in one backend call."""
+        if src == dest or self.backend_name == "none":
+            return list(texts)
+
+        keys = [self._key(text, src, dest) for text in texts]
+        results: List[Optional[str]] = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None and texts[i].strip()]
+        if missing:
+            translated = self.load().translate_batch([texts[i] for i in missing], src, dest)
+            self.cache.put_many({keys[i]: text for i, text in zip(missing, translated)})
+            for i, text in zip(missing, translated):
+                results[i] = text
+        return [text if result is None else result for text, result in zip(texts, results)]
@@ -0,0 +1,200 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from index_store import l2_normalize
+from search import DenseSearcher, top_k
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+# Vector index backends:
+#   "brute"  exact search over the normalized matrix (search.DenseSearcher)
+#   "hnsw"   approximate search with hnswlib (pip install hnswlib), persisted as
+#            hnsw.bin + hnsw.json next to the other index files
+VECTOR_BACKENDS = ("brute", "hnsw")
+HNSW_FILE = "hnsw.bin"
+HNSW_PARAMS_FILE = "hnsw.json"
+
+# HNSW knobs: M and ef_construction trade build time/memory for recall,
+# ef_search trades query latency for recall (raised to the largest k served)
+HNSW_DEFAULTS = {"M": 16, "ef_construction": 200, "ef_search": 64}
+
+
+class BruteForceIndex:
+    """Exact inner-product search; supports row masks."""
+
+    name = "brute"
+    supports_mask = True
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False):
+        self._searcher = DenseSearcher(embeddings, normalized=normalized)
+
+    def __len__(self) -> int:
+        return len(self._searcher)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The L2-normalized float32 matrix that is searched."""
+        return self._searcher.matrix
+
+    def search(self, query: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._searcher.search(query, k, mask=mask)
+
+    def save(self, folder: Path):
+        """Nothing to persist: the embedding matrix is the index."""
+
+
+class HNSWIndex:
+    """Approximate search with an hnswlib graph over L2-normalized vectors."""
+
+    name = "hnsw"
+    supports_mask = False
+
+    def __init__(self, index, params: Dict[str, int], max_k: int = 0):
+        self._index = index
+        self.params = dict(params)
+        # ef is set once here: hnswlib's set_ef must not race with searches on other threads
+        self.set_ef(max(self.params["ef_search"], max_k))
+
+    @staticmethod
+    def _require_hnswlib():
+        if hnswlib is None:
+            raise RuntimeError("hnswlib is not installed; run `pip install hnswlib` or use the brute backend")
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, M: int = HNSW_DEFAULTS["M"],
+              ef_construction: int = HNSW_DEFAULTS["ef_construction"],
+              ef_search: int = HNSW_DEFAULTS["ef_search"], threads: int = -1, max_k: int = 0) -> "HNSWIndex":
+        cls._require_hnswlib()
+        data = l2_normalize(embeddings)
+        index = hnswlib.Index(space="ip", dim=data.shape[1])
+        index.init_index(max_elements=max(1, len(data)), M=M, ef_construction=ef_construction)
+        if len(data):
+            index.add_items(data, np.arange(len(data)), num_threads=threads)
+        return cls(index, {"M": M, "ef_construction": ef_construction, "ef_search": ef_search}, max_k)
+
+    @classmethod
+    def load(cls, folder: Path, dim: int, ef_search: Optional[int] = None, max_k: int = 0,
+             count: Optional[int] = None) -> "HNSWIndex":
+        """Load a persisted graph; ``count`` is the row count of the embeddings it must cover."""
+        cls._require_hnswlib()
+        folder = Path(folder)
+        with open(folder / HNSW_PARAMS_FILE, "r", encoding="utf-8") as f:
+            params = {**HNSW_DEFAULTS, **json.load(f)}
+        if ef_search is not None:
+            params["ef_search"] = ef_search
+        index = hnswlib.Index(space="ip", dim=dim)
+        index.load_index(str(folder / HNSW_FILE))
+        if count is not None and index.get_current_count() != count:
+            raise ValueError(f"HNSW graph in {folder} has {index.get_current_count()} elements "
+                             f"but the index has {count} rows")
+        return cls(index, params, max_k)
+
+    def __len__(self) -> int:
+        return self._index.get_current_count()
+
+    def set_ef(self, ef_search: int):
+        """Change ef_search; only while no other thread is searching (e.g. in benchmarks)."""
+        self.params["ef_search"] = ef_search
+        self._index.set_ef(ef_search)
+
+    def search(self, query: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        # A k above ef_search still works (hnswlib searches with max(ef, k)), just with less recall headroom
+        labels, distances = self._index.knn_query(l2_normalize(query).reshape(1, -1), k=k)
+        # hnswlib "ip" distance is 1 - inner product
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
+
+    def save(self, folder: Path):
+        folder = Path(folder)
+        self._index.save_index(str(folder / HNSW_FILE))
+        with open(folder / HNSW_PARAMS_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.params, f)
+
+
+def build_vector_index(backend: str, embeddings: np.ndarray, **params):
+    """Build an index of the given backend over ``embeddings``."""
+    if backend == "brute":
+        return BruteForceIndex(embeddings)
+    if backend == "hnsw":
+        return HNSWIndex.build(embeddings, **params)
+    raise ValueError(f"Unknown vector index backend: {backend}")
+
+
+def load_vector_index(backend: str, folder: Path, embeddings: np.ndarray, **params):
+    """Load a persisted index from ``folder``, building it in memory if it was never persisted."""
+    if backend == "hnsw" and (Path(folder) / HNSW_FILE).exists():
+        try:
+            return HNSWIndex.load(folder, dim=embeddings.shape[1], ef_search=params.get("ef_search"),
+                                  max_k=params.get("max_k", 0), count=len(embeddings))
+        except ValueError as e:
+            # A graph left over from an earlier build would return rows of the wrong chunks
+            logger.warning(f"{e}; building the graph in memory (rerun ingest_data.py --ann hnsw to persist it)")
+    return build_vector_index(backend, embeddings, **params)
+
+
+class ShardedIndex:
+    """Searches several indexes as one, in a shared row space.
+
+    Each shard is (row offset, index, dataset id of each of its rows). The
+    brute backend uses a single shard spanning all datasets and filters by
+    row mask; ANN backends use one shard per dataset and skip shards that a
+    dataset filter excludes.
+    """
+
+    def __init__(self, shards: List[Tuple[int, Any, np.ndarray]]):
+        self.shards = shards
+
+    def normalized_matrix(self) -> np.ndarray:
+        """The normalized rows of every shard as one matrix in the shared row space.
+
+        Only exact (brute) shards hold their matrix; a single shard is returned
+        without copying.
+        """
+        blocks = []
+        for offset, index, _ in sorted(self.shards, key=lambda shard: shard[0]):
+            if not hasattr(index, "matrix"):
+                raise ValueError(f"{index.name} shards don't keep an embedding matrix")
+            if offset != sum(len(block) for block in blocks):
+                raise ValueError(f"Shard at row {offset} leaves a gap in the row space")
+            blocks.append(index.matrix)
+        if not blocks:
+            raise ValueError("Index has no shards")
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def search(self, query: np.ndarray, k: int, threshold: Optional[float] = None,
+               dataset_id: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        all_ids = []
+        all_scores = []
+        for offset, index, row_dataset_ids in self.shards:
+            mask = None
+            if dataset_id is not None:
+                mask = row_dataset_ids == dataset_id
+                if not mask.any():
+                    continue
+                if mask.all():
+                    mask = None
+                elif not index.supports_mask:
+                    raise ValueError(f"{index.name} shards must hold a single dataset to be filtered")
+            ids, scores = index.search(query, k, mask=mask)
+            all_ids.append(ids + offset)
+            all_scores.append(scores)
+
+        if not all_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ids = np.concatenate(all_ids)
+        scores = np.concatenate(all_scores)
+        best = top_k(scores, k)
+        ids, scores = ids[best], scores[best]
+        keep = np.isfinite(scores) if threshold is None else scores >= threshold
+        return ids[keep], scores[keep]
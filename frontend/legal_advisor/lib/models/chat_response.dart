@@ -36,6 +36,25 @@ class ChatResponse {
     );
   }
 
+  ChatResponse copyWith({
+    String? title,
+    String? explanation,
+    List<String>? penalties,
+    List<Reference>? references,
+    String? sourceCode,
+  }) {
+    return ChatResponse(
+      language: language,
+      title: title ?? this.title,
+      explanation: explanation ?? this.explanation,
+      penalties: penalties ?? this.penalties,
+      references: references ?? this.references,
+      disclaimer: disclaimer,
+      sourceCode: sourceCode ?? this.sourceCode,
+      sourceName: sourceName,
+    );
+  }
+
   Map<String, dynamic> toJson() {
     return {
       'language': language,
@@ -387,15 +387,37 @@ class _ChatbotPageNewState extends State<ChatbotPageNew> {
       final currentLanguage = languageProvider.currentLanguage;
 
       final request = ChatRequest(query: query, language: currentLanguage);
-      final response = await _apiService.sendChatQuery(request);
+
+      // Stages are shown as they stream in (references first, then the
+      // answer and the explanation) and replaced by the full response at 'done'
+      _ChatMessage? message;
+      var succeeded = false;
+      await for (final event in _apiService.streamChatQuery(request)) {
+        if (event.isError) break;
+        final updated = _applyStreamEvent(
+            message?.botResponse ?? _emptyResponse(currentLanguage), event);
+        if (updated != null) {
+          setState(() {
+            if (message == null) {
+              message = _ChatMessage(userMessage: query, botResponse: updated);
+              _messages.add(message!);
+            } else {
+              message!.botResponse = updated;
+            }
+          });
+          _scrollToBottom();
+        }
+        if (event.isDone) {
+          succeeded = true;
+          break;
+        }
+      }
 
       setState(() {
         _isLoading = false;
-        if (response != null) {
-          _messages
-              .add(_ChatMessage(userMessage: query, botResponse: response));
-        } else {
-          // Show error message if response is null
+        if (!succeeded) {
+          // Drop the partial answer of a failed stream and show an error message
+          if (message != null) _messages.remove(message);
           final lang = Provider.of<LanguageProvider>(context, listen: false);
           final strings = lang.localizedStrings;
           ScaffoldMessenger.of(context).showSnackBar(
@@ -422,6 +444,48 @@ class _ChatbotPageNewState extends State<ChatbotPageNew> {
       );
     }
 
+    _scrollToBottom();
+  }
+
+  ChatResponse _emptyResponse(String language) {
+    return ChatResponse(
+      language: language,
+      title: '',
+      explanation: '',
+      penalties: [],
+      references: [],
+      disclaimer: '',
+      sourceCode: '',
+      sourceName: '',
+    );
+  }
+
+  // The bot message after one stream event, or null if the event changes
+  // nothing that is displayed (routing, timings)
+  ChatResponse? _applyStreamEvent(ChatResponse current, ChatStreamEvent event) {
+    switch (event.event) {
+      case 'done':
+        return event.response;
+      case 'references':
+        return current.copyWith(references: event.references);
+      case 'answer':
+        return current.copyWith(
+          explanation: event.data['answer'] ?? '',
+          sourceCode: event.data['source_code'] ?? '',
+        );
+      case 'explanation':
+        return current.copyWith(
+          title: event.data['title'] ?? '',
+          explanation: event.data['explanation'] ?? '',
+          penalties: List<String>.from(
+              (event.data['penalties'] ?? []).map((p) => p.toString())),
+        );
+      default:
+        return null;
+    }
+  }
+
+  void _scrollToBottom() {
     WidgetsBinding.instance.addPostFrameCallback((_) {
       if (_scrollController.hasClients) {
         _scrollController.jumpTo(_scrollController.position.maxScrollExtent);
@@ -979,7 +1043,8 @@ class _ChatbotPageNewState extends State<ChatbotPageNew> {
 
 class _ChatMessage {
   final String userMessage;
-  final ChatResponse botResponse;
+  // Replaced as /chat/stream events arrive
+  ChatResponse botResponse;
 
   _ChatMessage({required this.userMessage, required this.botResponse});
 }
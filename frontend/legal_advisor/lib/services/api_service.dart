@@ -55,6 +55,49 @@ class ApiService {
     }
   }
 
+  // Stream a chat query: routing, references, answer and explanation events
+  // arrive as each backend stage finishes; the last event is 'done' (with the
+  // full response in [ChatStreamEvent.response]) or 'error'
+  Stream<ChatStreamEvent> streamChatQuery(ChatRequest request) async* {
+    final client = http.Client();
+    try {
+      final httpRequest = http.Request('POST', Uri.parse('$baseUrl/chat/stream'))
+        ..headers['Content-Type'] = 'application/json'
+        ..headers['Accept'] = 'text/event-stream'
+        ..body = json.encode(request.toJson());
+      final response = await client.send(httpRequest);
+      // Rejected requests (bad language, queue full) still send their 'error'
+      // event, so only a non-200 without an event stream is reported here
+      final contentType = response.headers['content-type'] ?? '';
+      if (response.statusCode != 200 &&
+          !contentType.startsWith('text/event-stream')) {
+        yield ChatStreamEvent('error', {'status_code': response.statusCode});
+        return;
+      }
+
+      String event = 'message';
+      final data = StringBuffer();
+      await for (final line in response.stream
+          .transform(utf8.decoder)
+          .transform(const LineSplitter())) {
+        if (line.startsWith('event:')) {
+          event = line.substring(6).trim();
+        } else if (line.startsWith('data:')) {
+          data.write(line.substring(5).trim());
+        } else if (line.isEmpty && data.isNotEmpty) {
+          yield ChatStreamEvent(event, json.decode(data.toString()));
+          event = 'message';
+          data.clear();
+        }
+      }
+    } catch (e) {
+      print('Stream chat query error: $e');
+      yield ChatStreamEvent('error', {'detail': e.toString()});
+    } finally {
+      client.close();
+    }
+  }
+
   // Notify backend about language change
   Future<void> changeLanguage(String langCode) async {
     try {
@@ -72,3 +115,20 @@ class ApiService {
     }
   }
 }
+
+class ChatStreamEvent {
+  final String event;
+  final dynamic data;
+
+  ChatStreamEvent(this.event, this.data);
+
+  bool get isDone => event == 'done';
+  bool get isError => event == 'error';
+
+  ChatResponse? get response =>
+      isDone ? ChatResponse.fromJson(data as Map<String, dynamic>) : null;
+
+  List<Reference> get references => event == 'references'
+      ? (data as List).map((ref) => Reference.fromJson(ref)).toList()
+      : [];
+}